@@ -0,0 +1,183 @@
+"""
+Async Password Generator Module
+asyncio facade over PasswordGenerator for embedding in async services
+"""
+
+import asyncio
+from functools import partial
+from typing import Dict, List
+
+from password_engine import PasswordGenerator
+
+
+class AsyncPasswordGenerator:
+    """
+    Awaitable wrapper around a PasswordGenerator
+
+    Cheap calls (a single password, one strength check) run inline. Large
+    batches and file I/O run in an executor, with at most max_concurrency
+    of them in flight. History saves go through an asyncio queue that a
+    single writer task drains: every entry queued while a write is running
+    is persisted by the next write, so a burst of saves costs one file
+    rewrite instead of one per entry.
+
+    Cancelling an awaiting caller abandons its result. Executor work that
+    has already started still runs to completion in its thread.
+
+    Args:
+        generator: Wrapped engine (a new PasswordGenerator by default)
+        max_concurrency: Maximum executor jobs in flight
+        executor: concurrent.futures executor (loop default when None)
+        batch_threshold: Batches at least this large go to the executor
+    """
+
+    def __init__(self, generator: PasswordGenerator = None, max_concurrency: int = 4,
+                 executor=None, batch_threshold: int = 1000):
+        self.generator = generator or PasswordGenerator()
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self.batch_threshold = batch_threshold
+        # Created on first use so they bind to the running loop
+        self._semaphore = None
+        self._queue = None
+        self._writer = None
+        self._closed = False
+
+    async def __aenter__(self) -> 'AsyncPasswordGenerator':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _run(self, func, *args, **kwargs):
+        """Run func in the executor under the concurrency limit"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    # Generation
+
+    async def generate_password(self, length: int = 12, **kwargs) -> str:
+        """Generate one password"""
+        return self.generator.generate_password(length, **kwargs)
+
+    async def generate_multiple(self, count: int, length: int = 12, **kwargs) -> List[str]:
+        """Generate count passwords, in the executor for large batches"""
+        if count >= self.batch_threshold:
+            return await self._run(self.generator.generate_multiple, count, length, **kwargs)
+        return self.generator.generate_multiple(count, length, **kwargs)
+
+    async def generate_bulk(self, count: int, length: int = 12, **kwargs):
+        """Fixed-width bulk generation (see PasswordGenerator.generate_bulk)"""
+        return await self._run(self.generator.generate_bulk, count, length, **kwargs)
+
+    async def generate_requests(self, specs: List[Dict]) -> List[Dict]:
+        """Mixed batch of requests (see PasswordGenerator.generate_requests)"""
+        if len(specs) >= self.batch_threshold:
+            return await self._run(self.generator.generate_requests, specs)
+        return self.generator.generate_requests(specs)
+    
+    async def generate_pin(self, length: int = 4, screen: bool = True) -> str:
+        """Generate a numeric PIN"""
+        if screen and length >= 7:
+            # The first long PIN builds or maps a multi-megabyte denylist
+            return await self._run(self.generator.generate_pin, length, screen)
+        return self.generator.generate_pin(length, screen)
+
+    async def generate_passphrase(self, num_words: int = 4, separator: str = '-') -> str:
+        """Generate a passphrase"""
+        return self.generator.generate_passphrase(num_words, separator)
+
+    # Strength checks
+
+    async def check_strength(self, password: str) -> Dict:
+        """Analyze one password"""
+        return self.generator.check_strength(password)
+
+    async def check_strength_many(self, passwords: List[str]) -> List[Dict]:
+        """Analyze many passwords, in the executor for large lists"""
+        if len(passwords) >= self.batch_threshold:
+            return await self._run(lambda: [self.generator.check_strength(p) for p in passwords])
+        return [self.generator.check_strength(p) for p in passwords]
+
+    # History
+
+    async def load_history(self) -> List[Dict]:
+        """Load history from disk without blocking the loop"""
+        entries = await self._run(self.generator.load_history)
+        self.generator.history = entries
+        return entries
+
+    async def save_to_history(self, password: str, description: str = "",
+                              wait: bool = True):
+        """
+        Queue a password for saving to history
+
+        Args:
+            wait: Await until the entry is written to disk (handed to the
+                writer when the generator uses write-behind); otherwise
+                return as soon as it is queued (use flush() to wait later)
+        """
+        if self._closed:
+            raise RuntimeError("AsyncPasswordGenerator is closed")
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._writer = asyncio.ensure_future(self._write_loop())
+
+        done = asyncio.get_running_loop().create_future() if wait else None
+        await self._queue.put((self.generator.make_history_entry(password, description), done))
+        if wait:
+            await asyncio.shield(done)
+
+    async def _write_loop(self):
+        """Drain the save queue, coalescing queued entries into one write"""
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._run(self._save_batch, [entry for entry, _ in batch])
+            except Exception as e:
+                for _, done in batch:
+                    if done is not None and not done.done():
+                        done.set_exception(e)
+            else:
+                for _, done in batch:
+                    if done is not None and not done.done():
+                        done.set_result(None)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _save_batch(self, entries: List[Dict]):
+        """Append entries and save through the generator (executor thread)"""
+        # Only the writer loads history, so concurrent saves never race
+        self.generator.history.extend(entries)
+        self.generator._save_history(durable=True)
+
+    async def flush(self):
+        """Wait until every queued save has been written"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def clear_history(self):
+        """Clear history after pending saves complete"""
+        await self.flush()
+        await self._run(self.generator.clear_history)
+
+    async def aclose(self):
+        """Flush pending saves and stop the writer task"""
+        if self._closed:
+            return
+        self._closed = True
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
@@ -0,0 +1,223 @@
+"""
+Bulk Password Audit Module
+Streams large password files through strength, breach and policy checks
+in parallel and aggregates the results without holding the dataset in memory
+"""
+
+import hashlib
+import mmap
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Dict, Iterator, List
+
+from password_engine import PasswordGenerator
+
+CLASS_NAMES = ('lowercase', 'uppercase', 'digits', 'special')
+
+
+class AuditReport:
+    """Aggregate counters for an audit; reports from chunks merge together"""
+
+    def __init__(self):
+        self.total = 0
+        self.empty = 0
+        self.breached = 0
+        self.policy_failures = 0
+        self.score_histogram = Counter()
+        self.strength = Counter()
+        self.class_coverage = Counter()
+        self.feedback = Counter()
+        self.policy_violations = Counter()
+        self.lengths = Counter()
+
+    def merge(self, other: 'AuditReport') -> 'AuditReport':
+        """Add another report's counts into this one"""
+        self.total += other.total
+        self.empty += other.empty
+        self.breached += other.breached
+        self.policy_failures += other.policy_failures
+        self.score_histogram.update(other.score_histogram)
+        self.strength.update(other.strength)
+        self.class_coverage.update(other.class_coverage)
+        self.feedback.update(other.feedback)
+        self.policy_violations.update(other.policy_violations)
+        self.lengths.update(other.lengths)
+        return self
+
+    def to_dict(self) -> Dict:
+        """JSON-friendly summary of the report"""
+        return {
+            'total': self.total,
+            'empty': self.empty,
+            'breached': self.breached,
+            'policy_failures': self.policy_failures,
+            'score_histogram': {f"{low}-{low + 9}" if low < 100 else "100": count
+                                for low, count in sorted(self.score_histogram.items())},
+            'strength': dict(self.strength.most_common()),
+            'class_coverage': {name: self.class_coverage[name]
+                               for name in CLASS_NAMES + ('all',)},
+            'feedback': dict(self.feedback.most_common()),
+            'policy_violations': dict(self.policy_violations.most_common()),
+            'lengths': dict(sorted(self.lengths.items())),
+        }
+
+
+class BreachList:
+    """
+    Membership test against a sorted file of SHA-1 password hashes
+
+    The file holds one uppercase SHA-1 hex digest per line, optionally
+    followed by ':count' (the Have I Been Pwned download format), sorted
+    by hash. It is memory-mapped and binary searched, so lookups are
+    O(log n) and worker processes share the page cache instead of each
+    loading the list.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.path.getsize(path) else b''
+
+    def _line_at(self, offset: int):
+        """Return (start, hash) of the first line starting at or after offset"""
+        data = self._map
+        if offset:
+            newline = data.find(b'\n', offset - 1)
+            if newline == -1:
+                return len(data), None
+            offset = newline + 1
+        if offset >= len(data):
+            return len(data), None
+        return offset, data[offset:offset + 40]
+
+    def __contains__(self, password: str) -> bool:
+        digest = hashlib.sha1(password.encode('utf-8')).hexdigest().upper().encode('ascii')
+        low, high = 0, len(self._map)
+        # Invariant: the matching line, if any, starts in [low, high)
+        while low < high:
+            middle = (low + high) // 2
+            start, found = self._line_at(middle)
+            if found is None or start >= high:
+                high = middle
+            elif found == digest:
+                return True
+            elif found < digest:
+                low = start + 1
+            else:
+                high = middle
+        return False
+
+    def close(self):
+        """Release the memory map"""
+        if self._map:
+            self._map.close()
+        self._file.close()
+
+
+# Per-process state set up by _init_worker
+_generator = None
+_breaches = None
+_policy = None
+
+
+def _init_worker(breach_path: str = None, policy=None):
+    """Process pool initializer: build the checkers once per worker"""
+    global _generator, _breaches, _policy
+    _generator = PasswordGenerator()
+    _breaches = BreachList(breach_path) if breach_path else None
+    _policy = policy.compile() if policy is not None else None
+
+
+def _close_worker():
+    """Release the state set up by _init_worker in this process"""
+    global _generator, _breaches, _policy
+    if _breaches is not None:
+        _breaches.close()
+    _generator = _breaches = _policy = None
+
+
+def audit_chunk(passwords: List[str]) -> AuditReport:
+    """Audit one chunk of passwords in the current process"""
+    if _generator is None:
+        _init_worker()
+    report = AuditReport()
+    for password in passwords:
+        report.total += 1
+        if not password:
+            report.empty += 1
+            continue
+
+        analysis = _generator.check_strength(password)
+        report.score_histogram[min(analysis['score'] // 10 * 10, 100)] += 1
+        report.strength[analysis['strength']] += 1
+        report.lengths[min(analysis['length'], 64)] += 1
+        classes = [name for name in CLASS_NAMES if analysis['has_' + name]]
+        report.class_coverage.update(classes)
+        if len(classes) == len(CLASS_NAMES):
+            report.class_coverage['all'] += 1
+        report.feedback.update(analysis['feedback'])
+
+        if _breaches is not None and password in _breaches:
+            report.breached += 1
+        if _policy is not None:
+            violations = _policy.violations(password)
+            if violations:
+                report.policy_failures += 1
+                report.policy_violations.update(violations)
+    return report
+
+
+def read_chunks(path: str, chunk_size: int = 10000) -> Iterator[List[str]]:
+    """Yield lists of up to chunk_size passwords, one per line"""
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        lines = (line.rstrip('\r\n') for line in f)
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def audit_file(path: str, breach_path: str = None, policy=None,
+               workers: int = None, chunk_size: int = 10000) -> AuditReport:
+    """
+    Audit every password in a file (one per line)
+
+    Args:
+        path: Password file to audit
+        breach_path: Optional sorted SHA-1 breach list (see BreachList)
+        policy: Optional PasswordPolicy to check each password against
+        workers: Worker processes (None = CPU count, 0 = audit in this process)
+        chunk_size: Passwords per chunk sent to a worker
+
+    Returns:
+        Aggregated AuditReport
+    """
+    report = AuditReport()
+    if workers == 0:
+        _init_worker(breach_path, policy)
+        try:
+            for chunk in read_chunks(path, chunk_size):
+                report.merge(audit_chunk(chunk))
+        finally:
+            _close_worker()
+        return report
+
+    workers = workers or os.cpu_count() or 1
+    # Bound in-flight chunks so reading never runs far ahead of the pool
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(breach_path, policy)) as pool:
+        pending = set()
+        for chunk in read_chunks(path, chunk_size):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.merge(future.result())
+            pending.add(pool.submit(audit_chunk, chunk))
+        for future in pending:
+            report.merge(future.result())
+    return report
@@ -0,0 +1,156 @@
+"""
+Batch Request Module
+Runs a mixed list of generation requests grouped by normalised options,
+so each group goes through its bulk path in one call
+"""
+
+from typing import Dict, List, Tuple
+
+# Required option marker
+_REQUIRED = object()
+
+# kind -> (runner, option defaults); options outside the defaults are errors
+KINDS = {
+    'password': ('password', {
+        'length': 12, 'use_uppercase': True, 'use_lowercase': True, 'use_digits': True,
+        'use_special': True, 'exclude_ambiguous': False, 'custom_chars': '', 'debias': False,
+    }),
+    'pin': ('pin', {'length': 4, 'screen': True}),
+    'passphrase': ('passphrase', {'num_words': 4, 'separator': '-'}),
+    'template': ('template', {'template': _REQUIRED, 'exclude_ambiguous': False}),
+    'policy': ('policy', {'policy': _REQUIRED}),
+    'pronounceable': ('pronounceable', {'length': 16}),
+}
+
+# Preset kinds: (options callers may set, options fixed as in the matching
+# engine method); everything else takes the 'password' defaults
+PRESETS = {
+    'easy': ({'length': 12}, {'use_uppercase': False, 'use_lowercase': True, 'use_digits': True,
+                              'use_special': False, 'exclude_ambiguous': True}),
+    'medium': ({'length': 12}, {'use_uppercase': True, 'use_lowercase': True, 'use_digits': True,
+                                'use_special': False, 'exclude_ambiguous': False}),
+    'strong': ({'length': 16}, {'use_uppercase': True, 'use_lowercase': True, 'use_digits': True,
+                                'use_special': True, 'exclude_ambiguous': False}),
+}
+
+# Engine method names accepted as kinds
+ALIASES = {
+    'generate_password': 'password',
+    'generate_easy_password': 'easy',
+    'generate_medium_password': 'medium',
+    'generate_strong_password': 'strong',
+    'generate_pin': 'pin',
+    'generate_passphrase': 'passphrase',
+    'generate_from_template': 'template',
+    'generate_with_policy': 'policy',
+    'generate_pronounceable': 'pronounceable',
+}
+
+
+def normalize(spec: Dict) -> Tuple[str, tuple]:
+    """
+    Reduce a request to (runner, sorted option items)
+
+    Requests that normalise to the same key are generated together, e.g.
+    {'kind': 'strong'} and {'kind': 'password', 'length': 16} share a group.
+
+    Raises:
+        ValueError: Unknown kind, unknown option or missing option
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("Request must be a dict")
+    options = dict(spec)
+    kind = options.pop('kind', None)
+    kind = ALIASES.get(kind, kind)
+
+    if kind in PRESETS:
+        allowed, fixed = PRESETS[kind]
+        runner, defaults = KINDS['password']
+        defaults = {**defaults, **allowed}
+    elif kind in KINDS:
+        runner, defaults = KINDS[kind]
+        allowed, fixed = defaults, {}
+    else:
+        raise ValueError(f"Unknown kind '{kind}'")
+
+    unknown = set(options) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unexpected option(s) for '{kind}': {', '.join(sorted(unknown))}")
+    merged = {**defaults, **options, **fixed}
+    missing = [name for name, value in merged.items() if value is _REQUIRED]
+    if missing:
+        raise ValueError(f"Missing option(s) for '{kind}': {', '.join(missing)}")
+    if runner == 'policy' and isinstance(merged['policy'], dict):
+        from password_policy import PasswordPolicy
+        merged['policy'] = PasswordPolicy(**merged['policy'])
+    return runner, tuple(sorted(merged.items()))
+
+
+def _run_password(generator, count: int, options: Dict) -> List[str]:
+    if options['custom_chars'] or options['debias']:
+        return [generator.generate_password(**options) for _ in range(count)]
+    flags = {name: options[name] for name in ('use_uppercase', 'use_lowercase', 'use_digits',
+                                               'use_special', 'exclude_ambiguous')}
+    return generator.generate_bulk(count, options['length'], separator=b'', **flags).passwords()
+
+
+def _run_pronounceable(generator, count: int, options: Dict) -> List[str]:
+    return [password for password, _ in generator.generate_pronounceable_many(count, options['length'])]
+
+
+def _run_policy(generator, count: int, options: Dict) -> List[str]:
+    from password_policy import compile_policy
+    return compile_policy(options['policy']).generate_many(count, generator.rng)
+
+
+# runner -> callable(generator, count, options) returning count passwords
+RUNNERS = {
+    'password': _run_password,
+    'pin': lambda g, count, o: g.generate_pins(count, o['length'], o['screen']),
+    'passphrase': lambda g, count, o: [g.generate_passphrase(o['num_words'], o['separator'])
+                                       for _ in range(count)],
+    'template': lambda g, count, o: g.generate_many_from_template(o['template'], count,
+                                                                  o['exclude_ambiguous']),
+    'policy': _run_policy,
+    'pronounceable': _run_pronounceable,
+}
+
+
+def _message(error: Exception) -> str:
+    """Error text for a result; unexpected exception types are named"""
+    if isinstance(error, (ValueError, TypeError)):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def run_requests(generator, specs: List[Dict]) -> List[Dict]:
+    """
+    Generate one password per request, grouped for bulk generation
+
+    Returns:
+        One {'password': str, 'error': None} or {'password': None,
+        'error': message} per request, in request order. A request that
+        fails validation, or a group whose generation fails, reports the
+        error only for its own items, whatever the exception.
+    """
+    results: List[Dict] = [None] * len(specs)
+    groups: Dict[Tuple[str, tuple], List[int]] = {}
+    for index, spec in enumerate(specs):
+        try:
+            key = normalize(spec)
+            hash(key)
+        except Exception as e:
+            results[index] = {'password': None, 'error': _message(e)}
+            continue
+        groups.setdefault(key, []).append(index)
+
+    for (runner, items), indices in groups.items():
+        try:
+            passwords = RUNNERS[runner](generator, len(indices), dict(items))
+        except Exception as e:
+            for index in indices:
+                results[index] = {'password': None, 'error': _message(e)}
+            continue
+        for index, password in zip(indices, passwords):
+            results[index] = {'password': password, 'error': None}
+    return results
@@ -0,0 +1,211 @@
+"""
+Bulk Password Buffer Module
+High-volume generation of same-length passwords as fixed-width ASCII
+records written straight into a preallocated buffer
+
+Random bytes are mapped onto the pool with bytes.translate: bytes below
+the largest multiple of the pool size map to pool[b % n] and the rest
+are deleted in the same C call, which gives an unbiased mapping without
+a per-character Python loop.
+"""
+
+import mmap
+import os
+from typing import List, Sequence, Tuple
+
+from password_random import secure_random
+
+
+class PasswordBuffer:
+    """
+    Fixed-width password records in one contiguous buffer
+
+    Record i occupies bytes [i * record_size, i * record_size + length),
+    followed by the separator. ``view`` exposes the whole buffer for
+    zero-copy writes to files, sockets and pipes.
+    """
+
+    def __init__(self, buffer, count: int, length: int, separator: bytes = b'\n'):
+        self.count = count
+        self.length = length
+        self.separator = separator
+        self.record_size = length + len(separator)
+        self.view = memoryview(buffer)
+        if self.view.nbytes < count * self.record_size:
+            raise ValueError("Buffer is too small for the requested records")
+        self.view = self.view[:count * self.record_size]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> memoryview:
+        """Record index as a memoryview (no copy)"""
+        if not -self.count <= index < self.count:
+            raise IndexError("Record index out of range")
+        start = (index % self.count) * self.record_size
+        return self.view[start:start + self.length]
+
+    def password(self, index: int) -> str:
+        """Record index decoded as a str"""
+        return self[index].tobytes().decode('ascii')
+
+    def passwords(self) -> List[str]:
+        """All records as str (copies; for convenience, not throughput)"""
+        return [self.password(i) for i in range(self.count)]
+
+    def write_to(self, fileobj) -> int:
+        """Write the buffer to a binary file object without copying"""
+        return fileobj.write(self.view)
+
+    def write_fd(self, fd: int) -> int:
+        """Write the whole buffer to a file descriptor (e.g. a pipe)"""
+        written = 0
+        while written < self.view.nbytes:
+            written += os.write(fd, self.view[written:])
+        return written
+
+    def release(self):
+        """Release the memoryview so the underlying buffer can be resized or closed"""
+        self.view.release()
+
+
+def count_valid_passwords(class_sizes: Sequence[int], length: int, extra: int = 0) -> int:
+    """
+    Number of distinct passwords the bulk path can produce
+
+    Counts strings of the given length over a pool made of disjoint
+    classes (plus extra unclassified characters) that contain every
+    class at least once, by inclusion-exclusion. Since records are
+    uniform over exactly this set, log2 of the count is their entropy.
+    """
+    pool = sum(class_sizes) + extra
+    k = len(class_sizes)
+    total = 0
+    for mask in range(1 << k):
+        excluded = 0
+        bits = 0
+        for i in range(k):
+            if mask >> i & 1:
+                excluded += class_sizes[i]
+                bits += 1
+        total += (-1) ** bits * (pool - excluded) ** length
+    return total
+
+
+def build_translation(pool: str) -> Tuple[bytes, bytes, int]:
+    """
+    Build the byte translation for a pool of ASCII characters
+
+    Returns:
+        (table, delete, limit): bytes.translate arguments and the number
+        of byte values that are kept
+    """
+    chars = pool.encode('ascii')
+    n = len(chars)
+    if not 0 < n <= 256 or len(set(chars)) != n:
+        raise ValueError("Pool must hold 1-256 distinct ASCII characters")
+    limit = 256 - 256 % n
+    table = bytes(chars[b % n] if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256)), limit
+
+
+def _fill(view: memoryview, start: int, size: int, translation, rng):
+    """Fill view[start:start + size] with unbiased pool characters"""
+    table, delete, limit = translation
+    end = start + size
+    pos = start
+    while pos < end:
+        need = end - pos
+        # Draw enough that one round almost always suffices
+        chars = rng.randbytes(need * 256 // limit + 16).translate(table, delete)[:need]
+        view[pos:pos + len(chars)] = chars
+        pos += len(chars)
+
+
+def fill_records(buffer: PasswordBuffer, pool: str, required: Sequence[str] = (),
+                 rng=None, start: int = None):
+    """
+    Fill every record of buffer with random characters from pool
+
+    Args:
+        buffer: Target PasswordBuffer
+        pool: Characters to draw from (distinct ASCII)
+        required: Character classes each record must contain at least once;
+            records missing one are redrawn, so results stay uniform over
+            all valid passwords
+        start: Index of the first record. With a deterministic test RNG
+            record i is drawn from rng.substream(start + i), so any split of
+            a run into slices reproduces the same records; when None the
+            records continue after those of earlier bulk calls
+    """
+    rng = rng or secure_random
+    translation = build_translation(pool)
+    view, length, size = buffer.view, buffer.length, buffer.record_size
+    count = buffer.count
+    if required and length < len(required):
+        raise ValueError("Length is shorter than the number of required classes")
+
+    if rng.deterministic:
+        start = rng.claim(count, start)
+        streams = [rng.substream(start + i) for i in range(count)]
+        for i, stream in enumerate(streams):
+            _fill(view, i * size, length, translation, stream)
+    else:
+        streams = None
+        _fill(view, 0, count * size, translation, rng)
+    for j, byte in enumerate(buffer.separator):
+        view[length + j::size] = bytes([byte]) * count
+
+    if required:
+        # Deleting a class from a record shortens it only if the class is present
+        classes = [chars.encode('ascii') for chars in required]
+        for i, offset in enumerate(range(0, count * size, size)):
+            while True:
+                record = view[offset:offset + length].tobytes()
+                if all(len(record.translate(None, chars)) < length for chars in classes):
+                    break
+                _fill(view, offset, length, translation, streams[i] if streams else rng)
+
+
+def generate_buffer(count: int, length: int, pool: str, required: Sequence[str] = (),
+                    separator: bytes = b'\n', buffer=None, rng=None,
+                    start: int = None) -> PasswordBuffer:
+    """
+    Generate count fixed-width passwords into a buffer
+
+    Args:
+        buffer: Optional preallocated bytearray / memoryview / mmap; a new
+            bytearray is allocated when omitted
+
+    Returns:
+        PasswordBuffer over the filled records
+    """
+    if count < 0:
+        raise ValueError("Count must not be negative")
+    if buffer is None:
+        buffer = bytearray(count * (length + len(separator)))
+    records = PasswordBuffer(buffer, count, length, separator)
+    fill_records(records, pool, required, rng, start)
+    return records
+
+
+def generate_to_file(path: str, count: int, length: int, pool: str,
+                     required: Sequence[str] = (), separator: bytes = b'\n',
+                     rng=None, start: int = None) -> int:
+    """
+    Generate count passwords directly into a memory-mapped output file
+
+    Returns:
+        Size of the written file in bytes
+    """
+    size = count * (length + len(separator))
+    with open(path, 'w+b') as f:
+        f.truncate(size)
+        if size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), size) as mapped:
+            records = generate_buffer(count, length, pool, required, separator,
+                                      mapped, rng, start)
+            records.release()
+            mapped.flush()
+    return size
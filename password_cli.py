@@ -14,6 +14,7 @@ class PasswordGeneratorCLI:
     def __init__(self):
         self.generator = PasswordGenerator()
         self.running = True
+        self.menu = self.menu_items()
     
     def display_banner(self):
         """Display application banner"""
@@ -22,40 +23,50 @@ class PasswordGeneratorCLI:
         print("         Generate Strong & Secure Passwords")
         print("="*60)
     
+    def menu_items(self):
+        """
+        (label, handler) pairs of the main menu: the registered generation
+        strategies (see password_strategies), with the custom generator
+        after the basic ones, followed by the fixed tools
+        """
+        from password_strategies import strategies
+        generate = [(strategy.label, lambda strategy=strategy: self.run_strategy(strategy))
+                    for strategy in strategies()]
+        basic = len(strategies('basic'))
+        return (generate[:basic]
+                + [("Custom Password Generator", self.custom_generate)]
+                + generate[basic:]
+                + [("Generate Multiple Passwords", self.generate_multiple),
+                   ("Check Password Strength", self.check_strength),
+                   ("View Password History", self.view_history),
+                   ("Search Password History", self.search_history),
+                   ("Clear Password History", self.clear_history)])
+    
     def display_menu(self):
         """Display main menu"""
         print("\n" + "-"*60)
         print("MAIN MENU:")
         print("-"*60)
-        print("1.  Quick Generate (Default Settings)")
-        print("2.  Custom Password Generator")
-        print("3.  Generate Easy Password (Easy to type)")
-        print("4.  Generate Medium Password")
-        print("5.  Generate Strong Password")
-        print("6.  Generate PIN (Numeric only)")
-        print("7.  Generate Passphrase (Memorable)")
-        print("8.  Generate Multiple Passwords")
-        print("9.  Check Password Strength")
-        print("10. View Password History")
-        print("11. Clear Password History")
+        for number, (label, _) in enumerate(self.menu, 1):
+            print(f"{str(number) + '.':<4}{label}")
         print("0.  Exit")
         print("-"*60)
     
-    def quick_generate(self):
-        """Quick password generation with default settings"""
-        print("\n--- Quick Password Generator ---")
+    def run_strategy(self, strategy):
+        """Generate with a registered strategy, asking for its options"""
+        print(f"\n--- {strategy.label} ---")
+        if strategy.description:
+            print(strategy.description)
+        
         try:
-            length = input("Enter password length (default: 12): ").strip()
-            length = int(length) if length else 12
+            options = {}
+            for option in strategy.options:
+                text = input(f"Enter {option.prompt} (default: {option.default}): ")
+                options[option.name] = option.parse(text)
             
-            if length < 4:
-                print("❌ Password length must be at least 4 characters!")
-                return
-            
-            password = self.generator.generate_password(length=length)
+            password = strategy.generate(self.generator, **options)
             self.display_password(password)
             
-            # Save to history
             save = input("\nSave to history? (y/n): ").lower()
             if save == 'y':
                 desc = input("Enter description (optional): ").strip()
@@ -108,116 +119,6 @@ class PasswordGeneratorCLI:
         except ValueError as e:
             print(f"❌ Error: {e}")
     
-    def generate_easy(self):
-        """Generate easy-to-type password"""
-        print("\n--- Easy Password Generator ---")
-        print("(Lowercase letters + digits only)")
-        
-        try:
-            length = input("Enter password length (default: 12): ").strip()
-            length = int(length) if length else 12
-            
-            password = self.generator.generate_easy_password(length)
-            self.display_password(password)
-            
-            save = input("\nSave to history? (y/n): ").lower()
-            if save == 'y':
-                desc = input("Enter description (optional): ").strip()
-                self.generator.save_to_history(password, desc)
-                print("✅ Password saved to history!")
-        
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
-    def generate_medium(self):
-        """Generate medium-strength password"""
-        print("\n--- Medium Password Generator ---")
-        print("(Letters + digits)")
-        
-        try:
-            length = input("Enter password length (default: 12): ").strip()
-            length = int(length) if length else 12
-            
-            password = self.generator.generate_medium_password(length)
-            self.display_password(password)
-            
-            save = input("\nSave to history? (y/n): ").lower()
-            if save == 'y':
-                desc = input("Enter description (optional): ").strip()
-                self.generator.save_to_history(password, desc)
-                print("✅ Password saved to history!")
-        
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
-    def generate_strong(self):
-        """Generate strong password"""
-        print("\n--- Strong Password Generator ---")
-        print("(All character types)")
-        
-        try:
-            length = input("Enter password length (default: 16): ").strip()
-            length = int(length) if length else 16
-            
-            password = self.generator.generate_strong_password(length)
-            self.display_password(password)
-            
-            save = input("\nSave to history? (y/n): ").lower()
-            if save == 'y':
-                desc = input("Enter description (optional): ").strip()
-                self.generator.save_to_history(password, desc)
-                print("✅ Password saved to history!")
-        
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
-    def generate_pin(self):
-        """Generate numeric PIN"""
-        print("\n--- PIN Generator ---")
-        
-        try:
-            length = input("Enter PIN length (default: 4): ").strip()
-            length = int(length) if length else 4
-            
-            pin = self.generator.generate_pin(length)
-            print("\n" + "="*60)
-            print(f"Generated PIN: {pin}")
-            print("="*60)
-            
-            save = input("\nSave to history? (y/n): ").lower()
-            if save == 'y':
-                desc = input("Enter description (optional): ").strip()
-                self.generator.save_to_history(pin, desc)
-                print("✅ PIN saved to history!")
-        
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
-    def generate_passphrase(self):
-        """Generate memorable passphrase"""
-        print("\n--- Passphrase Generator ---")
-        
-        try:
-            num_words = input("Enter number of words (default: 4): ").strip()
-            num_words = int(num_words) if num_words else 4
-            
-            separator = input("Enter separator character (default: -): ").strip() or '-'
-            
-            passphrase = self.generator.generate_passphrase(num_words, separator)
-            print("\n" + "="*60)
-            print(f"Generated Passphrase: {passphrase}")
-            print("="*60)
-            print("\nPassphrases are easier to remember!")
-            
-            save = input("\nSave to history? (y/n): ").lower()
-            if save == 'y':
-                desc = input("Enter description (optional): ").strip()
-                self.generator.save_to_history(passphrase, desc)
-                print("✅ Passphrase saved to history!")
-        
-        except ValueError as e:
-            print(f"❌ Error: {e}")
-    
     def generate_multiple(self):
         """Generate multiple passwords"""
         print("\n--- Multiple Password Generator ---")
@@ -296,6 +197,30 @@ class PasswordGeneratorCLI:
         
         print("="*60)
     
+    def search_history(self):
+        """Search password history by description"""
+        print("\n--- Search Password History ---")
+        
+        query = input("Search descriptions for: ").strip()
+        if not query:
+            print("ℹ️  Cancelled.")
+            return
+        prefix = input("Match word starts only? (y/n): ").lower() == 'y'
+        
+        results = self.generator.search_history(query, prefix=prefix)
+        if not results:
+            print("No matching passwords.")
+            return
+        
+        print(f"\nMatches: {len(results)} (newest first)")
+        print("="*60)
+        for i, entry in enumerate(results, 1):
+            print(f"\n{i}. Password: {entry['password']}")
+            print(f"   Description: {entry['description']}")
+            print(f"   Strength: {entry['strength']}")
+            print(f"   Created: {entry['created_at']}")
+        print("="*60)
+    
     def clear_history(self):
         """Clear password history"""
         print("\n--- Clear Password History ---")
@@ -325,11 +250,16 @@ class PasswordGeneratorCLI:
         print(f"\nStrength: {analysis['strength']} ({analysis['score']}/100)")
         print(f"Length: {analysis['length']} characters")
         
-        # Try to copy to clipboard
-        if self.generator.copy_to_clipboard(password):
-            print("\n✅ Password copied to clipboard!")
+        # Try to copy to clipboard; the shared timer clears it later
+        from password_clipboard import default_manager
+        clipboard = default_manager()
+        if clipboard.copy(password):
+            if clipboard.clear_after:
+                print(f"\n✅ Password copied to clipboard! (cleared in {clipboard.clear_after:g}s)")
+            else:
+                print("\n✅ Password copied to clipboard!")
         else:
-            print("\n💡 Tip: Install 'pyperclip' for clipboard support")
+            print("\n💡 Tip: Install 'pyperclip' (or xclip / wl-clipboard) for clipboard support")
             print("   Run: pip install pyperclip")
     
     def run(self):
@@ -340,28 +270,8 @@ class PasswordGeneratorCLI:
             self.display_menu()
             choice = input("\nEnter your choice: ").strip()
             
-            if choice == '1':
-                self.quick_generate()
-            elif choice == '2':
-                self.custom_generate()
-            elif choice == '3':
-                self.generate_easy()
-            elif choice == '4':
-                self.generate_medium()
-            elif choice == '5':
-                self.generate_strong()
-            elif choice == '6':
-                self.generate_pin()
-            elif choice == '7':
-                self.generate_passphrase()
-            elif choice == '8':
-                self.generate_multiple()
-            elif choice == '9':
-                self.check_strength()
-            elif choice == '10':
-                self.view_history()
-            elif choice == '11':
-                self.clear_history()
+            if choice.isdigit() and 1 <= int(choice) <= len(self.menu):
+                self.menu[int(choice) - 1][1]()
             elif choice == '0':
                 print("\n👋 Thank you for using Password Generator!")
                 print("Stay secure! 🔐")
@@ -373,8 +283,225 @@ class PasswordGeneratorCLI:
                 input("\nPress Enter to continue...")
 
 
-def main():
+def quick_command(args):
+    """
+    One-shot generation: print password(s) and exit without the menu
+
+    Usage: password_cli.py generate [LENGTH] [COUNT]
+    """
+    try:
+        length = int(args[0]) if len(args) > 0 else 12
+        count = int(args[1]) if len(args) > 1 else 1
+        generator = PasswordGenerator()
+        for _ in range(count):
+            print(generator.generate_password(length=length))
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def audit_command(args):
+    """
+    Audit a password file (one password per line) and print a report
+
+    Usage: password_cli.py audit FILE [--breach FILE] [--policy FILE]
+                                      [--workers N] [--chunk-size N] [--json]
+
+    The policy file is JSON in the PasswordPolicy.to_dict() shape; keys
+    left out take the PasswordPolicy defaults.
+    """
+    import argparse
+    from password_audit import audit_file
+    
+    parser = argparse.ArgumentParser(prog='password_cli.py audit',
+                                     description='Audit a password file')
+    parser.add_argument('file', help='password file, one password per line')
+    parser.add_argument('--breach', help='sorted SHA-1 breach list (HIBP format)')
+    parser.add_argument('--policy', help='JSON password policy (PasswordPolicy.to_dict() fields)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: CPU count, 0: no pool)')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    options = parser.parse_args(args)
+    
+    import json
+    try:
+        policy = None
+        if options.policy:
+            from password_policy import PasswordPolicy
+            with open(options.policy, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"{options.policy} must hold a JSON object")
+            try:
+                policy = PasswordPolicy(**data)
+            except TypeError as e:
+                raise ValueError(f"Invalid policy in {options.policy}: {e}") from None
+            # Reject impossible policies before starting the workers
+            policy.compile()
+        report = audit_file(options.file, breach_path=options.breach, policy=policy,
+                            workers=options.workers, chunk_size=options.chunk_size)
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    
+    summary = report.to_dict()
+    if options.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    
+    print("="*60)
+    print("PASSWORD AUDIT REPORT")
+    print("="*60)
+    print(f"Passwords audited: {summary['total']}  (empty: {summary['empty']})")
+    if options.breach:
+        print(f"Found in breach list: {summary['breached']}")
+    print("\nScore histogram:")
+    for bucket, count in summary['score_histogram'].items():
+        print(f"  {bucket:>7}: {count}")
+    print("\nStrength:")
+    for strength, count in summary['strength'].items():
+        print(f"  {strength:<12} {count}")
+    print("\nCharacter class coverage:")
+    for name, count in summary['class_coverage'].items():
+        print(f"  {name:<10} {count}")
+    print("\nFeedback:")
+    for feedback, count in summary['feedback'].items():
+        print(f"  {count:>8}  {feedback}")
+    if policy is not None:
+        print(f"\nPolicy failures: {summary['policy_failures']}")
+        for violation, count in summary['policy_violations'].items():
+            print(f"  {count:>8}  {violation}")
+    print("="*60)
+    return 0
+
+
+def compact_command(args):
+    """
+    Rewrite the history file without records expired by a retention policy
+
+    Usage: password_cli.py compact [--file FILE] [--sharded] [--max-entries N]
+                                   [--max-age-days D] [--strength-max-age NAME=D ...]
+    """
+    import argparse
+    from password_history import (HistoryStore, RetentionPolicy, ShardedHistoryStore,
+                                  compact_history)
+    
+    parser = argparse.ArgumentParser(prog='password_cli.py compact',
+                                     description='Apply a retention policy to the history file')
+    parser.add_argument('--file', default='password_history.json', help='history file')
+    parser.add_argument('--sharded', action='store_true',
+                        help='the history uses monthly segments (FILE.d/)')
+    parser.add_argument('--max-entries', type=int, default=None,
+                        help='keep only the newest N entries')
+    parser.add_argument('--max-age-days', type=float, default=None,
+                        help='drop entries older than D days')
+    parser.add_argument('--strength-max-age', action='append', default=[], metavar='NAME=D',
+                        help="maximum age in days for one strength, e.g. 'Weak=7'")
+    options = parser.parse_args(args)
+    
+    try:
+        strength_ages = {}
+        for rule in options.strength_max_age:
+            name, sep, days = rule.partition('=')
+            if not sep:
+                raise ValueError(f"Expected NAME=DAYS, got '{rule}'")
+            strength_ages[name] = float(days)
+        retention = RetentionPolicy(options.max_entries, options.max_age_days, strength_ages)
+        store_class = ShardedHistoryStore if options.sharded else HistoryStore
+        before, after = compact_history(store_class(options.file), retention)
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"Compacted {options.file}: {before} -> {after} entries ({before - after} removed)")
+    return 0
+
+
+def _history_parser(prog: str, description: str):
+    """Argument parser with the options shared by the history commands"""
+    import argparse
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument('--history', default='password_history.json', help='history file')
+    parser.add_argument('--sharded', action='store_true',
+                        help='the history uses monthly segments (HISTORY.d/)')
+    parser.add_argument('--format', choices=('csv', 'csv.gz', 'ndjson', 'ndjson.gz'),
+                        help='file format (default: from the file name)')
+    return parser
+
+
+def _history_generator(options) -> PasswordGenerator:
+    generator = PasswordGenerator(sharded=options.sharded)
+    generator.history_file = options.history
+    return generator
+
+
+def export_command(args):
+    """
+    Export history to CSV or NDJSON (optionally gzip-compressed)
+
+    Usage: password_cli.py export FILE [--format F] [--history FILE] [--sharded]
+    """
+    parser = _history_parser('password_cli.py export', 'Export password history')
+    parser.add_argument('file', help='output file (.csv, .ndjson, .jsonl, optionally .gz)')
+    options = parser.parse_args(args)
+    
+    try:
+        count = _history_generator(options).export_history(options.file, options.format)
+    except (ValueError, OSError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {count} entries to {options.file}")
+    return 0
+
+
+def import_command(args):
+    """
+    Merge exported history files into the history, skipping duplicates
+
+    Usage: password_cli.py import FILE [FILE ...] [--format F] [--history FILE] [--sharded]
+    """
+    parser = _history_parser('password_cli.py import', 'Import password history')
+    parser.add_argument('files', nargs='+', help='exported history files')
+    options = parser.parse_args(args)
+    
+    generator = _history_generator(options)
+    status = 0
+    for path in options.files:
+        try:
+            counts = generator.import_history(path, options.format)
+        except (ValueError, OSError) as e:
+            print(f"❌ Error: {path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{path}: {counts['read']} read, {counts['added']} added, "
+              f"{counts['duplicates']} duplicates")
+    generator.close()
+    return status
+
+
+# Non-interactive commands: name -> handler(args) returning an exit code
+COMMANDS = {
+    'generate': quick_command,
+    'audit': audit_command,
+    'compact': compact_command,
+    'export': export_command,
+    'import': import_command,
+}
+
+
+def main(argv=None):
     """Entry point for CLI application"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        command = COMMANDS.get(argv[0])
+        if command is None:
+            print(f"Unknown command: {argv[0]}", file=sys.stderr)
+            print(f"Available commands: {', '.join(sorted(COMMANDS))}", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(command(argv[1:]))
+    
     try:
         app = PasswordGeneratorCLI()
         app.run()
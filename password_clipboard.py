@@ -0,0 +1,453 @@
+"""
+Clipboard Module
+Copies passwords to the system clipboard through a backend detected once
+per process, and clears them again after a timeout
+
+Backends are tried in order: pyperclip, the caller's Tk root (the GUI),
+then the wl-copy, xclip, xsel and pbcopy command-line tools. Tk is only
+used with a root the caller owns and runs: its clipboard is served by
+that root and is lost when it is destroyed, so a hidden root created
+just for copying would not outlive the copy.
+
+Pending clears of every ClipboardManager share one daemon timer thread,
+so neither the CLI input loop nor the Tk event loop ever waits on them.
+A clear only empties the clipboard if it still holds the copied secret.
+
+Usage: python password_clipboard.py   (checks the auto-clear timer
+                                       against the in-memory FakeBackend)
+"""
+
+import abc
+import atexit
+import heapq
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+# Seconds a copied password stays on the clipboard by default
+DEFAULT_CLEAR_AFTER = 30.0
+
+# Environment variable overriding the default (0 disables clearing)
+CLEAR_AFTER_ENV = 'PASSWORD_CLIPBOARD_CLEAR'
+
+# Seconds allowed for a clipboard command to finish
+_COMMAND_TIMEOUT = 5
+
+# Errors a backend may raise; pyperclip's PyperclipException is a RuntimeError
+BACKEND_ERRORS = (OSError, RuntimeError, subprocess.SubprocessError)
+
+
+class ClipboardBackend(abc.ABC):
+    """Interface of clipboard backends"""
+
+    name = 'none'
+
+    @abc.abstractmethod
+    def copy(self, text: str):
+        """Put text on the clipboard"""
+
+    def paste(self) -> Optional[str]:
+        """Current clipboard text, or None if the backend cannot read it"""
+        return None
+
+    def clear(self):
+        self.copy('')
+
+
+class PyperclipBackend(ClipboardBackend):
+    """pyperclip, which wraps the platform's own clipboard mechanism"""
+
+    name = 'pyperclip'
+
+    def __init__(self, module):
+        self.module = module
+
+    def copy(self, text: str):
+        self.module.copy(text)
+
+    def paste(self) -> Optional[str]:
+        return self.module.paste()
+
+
+class TkBackend(ClipboardBackend):
+    """
+    Clipboard of a running Tk root
+
+    Calls made from other threads (the clear timer) are handed to the Tk
+    event loop with after(), since Tk must only be used from its own thread.
+    """
+
+    name = 'tk'
+
+    def __init__(self, root):
+        self.root = root
+        self._thread = threading.get_ident()
+
+    def _call(self, func, *args):
+        if threading.get_ident() == self._thread:
+            return func(*args)
+        self.root.after(0, func, *args)
+        return None
+
+    def _copy(self, text: str):
+        self.root.clipboard_clear()
+        if text:
+            self.root.clipboard_append(text)
+
+    def _clear_if(self, text: str):
+        if self.paste() == text:
+            self._copy('')
+
+    def copy(self, text: str):
+        self._call(self._copy, text)
+
+    def paste(self) -> Optional[str]:
+        if threading.get_ident() != self._thread:
+            return None
+        try:
+            return self.root.clipboard_get()
+        except Exception:
+            # tkinter.TclError: the clipboard is empty or not text
+            return ''
+
+    def clear_if(self, text: str):
+        """Clear only if the clipboard still holds text (checked on the Tk thread)"""
+        self._call(self._clear_if, text)
+
+
+class CommandBackend(ClipboardBackend):
+    """Clipboard through command-line tools (wl-copy, xclip, xsel, pbcopy)"""
+
+    def __init__(self, name: str, copy_command: List[str], paste_command: List[str] = None,
+                 clear_command: List[str] = None):
+        self.name = name
+        self.copy_command = copy_command
+        self.paste_command = paste_command
+        self.clear_command = clear_command
+
+    def copy(self, text: str):
+        # No output pipes: xclip and wl-copy leave a child serving the selection
+        subprocess.run(self.copy_command, input=text.encode('utf-8'), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       timeout=_COMMAND_TIMEOUT)
+
+    def paste(self) -> Optional[str]:
+        if not self.paste_command:
+            return None
+        result = subprocess.run(self.paste_command, capture_output=True,
+                                timeout=_COMMAND_TIMEOUT)
+        return result.stdout.decode('utf-8', 'replace') if result.returncode == 0 else ''
+
+    def clear(self):
+        if self.clear_command:
+            subprocess.run(self.clear_command, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=_COMMAND_TIMEOUT)
+        else:
+            self.copy('')
+
+
+class FakeBackend(ClipboardBackend):
+    """In-memory clipboard for tests, recording every copy and clear"""
+
+    name = 'fake'
+
+    def __init__(self):
+        self.text = ''
+        self.copies: List[str] = []
+        self.clears = 0
+
+    def copy(self, text: str):
+        self.text = text
+        self.copies.append(text)
+
+    def paste(self) -> Optional[str]:
+        return self.text
+
+    def clear(self):
+        self.text = ''
+        self.clears += 1
+
+
+def _command_backends():
+    """Command-line backends usable in this session, best first"""
+    if os.environ.get('WAYLAND_DISPLAY') and shutil.which('wl-copy'):
+        yield CommandBackend('wl-copy', ['wl-copy'], ['wl-paste', '--no-newline'],
+                             ['wl-copy', '--clear'])
+    if os.environ.get('DISPLAY'):
+        if shutil.which('xclip'):
+            yield CommandBackend('xclip', ['xclip', '-selection', 'clipboard'],
+                                 ['xclip', '-selection', 'clipboard', '-o'])
+        if shutil.which('xsel'):
+            yield CommandBackend('xsel', ['xsel', '--clipboard', '--input'],
+                                 ['xsel', '--clipboard', '--output'],
+                                 ['xsel', '--clipboard', '--clear'])
+    if sys.platform == 'darwin' and shutil.which('pbcopy'):
+        yield CommandBackend('pbcopy', ['pbcopy'], ['pbpaste'])
+
+
+def detect_backend(tk_root=None) -> Optional[ClipboardBackend]:
+    """
+    First available backend: pyperclip, Tk (with a root), then commands
+
+    Returns:
+        The backend, or None when no clipboard is reachable
+    """
+    try:
+        import pyperclip
+        return PyperclipBackend(pyperclip)
+    except ImportError:
+        pass
+    if tk_root is not None:
+        return TkBackend(tk_root)
+    return next(_command_backends(), None)
+
+
+_default_backend = None
+_default_backend_detected = False
+_default_lock = threading.Lock()
+
+
+def default_backend() -> Optional[ClipboardBackend]:
+    """Backend for code without a Tk root, detected on first use and cached"""
+    global _default_backend, _default_backend_detected
+    with _default_lock:
+        if not _default_backend_detected:
+            _default_backend = detect_backend()
+            _default_backend_detected = True
+        return _default_backend
+
+
+class _ClearTimer:
+    """
+    One daemon thread running every scheduled clear at its deadline
+
+    Deadlines sit in a heap; the thread sleeps until the earliest one or
+    until a new, earlier deadline is scheduled.
+    """
+
+    def __init__(self):
+        self._queue = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def schedule(self, delay: float, callback):
+        with self._condition:
+            heapq.heappush(self._queue, (time.monotonic() + delay, next(self._order), callback))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='clipboard-clear',
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                deadline, _, callback = self._queue[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._queue)
+            try:
+                callback()
+            except Exception:
+                # A failing clear (e.g. a destroyed Tk root) must not stop
+                # the clears queued behind it
+                pass
+
+
+_timer = _ClearTimer()
+
+
+class ClipboardManager:
+    """
+    Copies text and clears it from the clipboard after a timeout
+
+    Each copy supersedes the previous one: only the clear scheduled by the
+    latest copy runs, and it leaves the clipboard alone if something else
+    has been copied since. Call close() when done with a manager; the
+    default_manager() is closed at interpreter exit.
+
+    Args:
+        backend: ClipboardBackend to use; detected (and cached for the
+            process) on first copy when None
+        clear_after: Seconds before a copied text is cleared; 0 or None
+            keeps it
+    """
+
+    def __init__(self, backend: ClipboardBackend = None,
+                 clear_after: Optional[float] = DEFAULT_CLEAR_AFTER):
+        self._backend = backend
+        self.clear_after = clear_after
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = None
+
+    @property
+    def backend(self) -> Optional[ClipboardBackend]:
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+
+    @property
+    def available(self) -> bool:
+        """True if a clipboard backend was found"""
+        return self.backend is not None
+
+    @property
+    def pending(self) -> bool:
+        """True while a copied text is waiting to be cleared"""
+        return self._pending is not None
+
+    def copy(self, text: str, clear_after: Optional[float] = None) -> bool:
+        """
+        Copy text and schedule its clear
+
+        Args:
+            clear_after: Overrides the manager's timeout for this copy
+
+        Returns:
+            True if the text reached the clipboard
+        """
+        backend = self.backend
+        if backend is None:
+            return False
+        try:
+            backend.copy(text)
+        except BACKEND_ERRORS:
+            return False
+        delay = self.clear_after if clear_after is None else clear_after
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending = text if delay else None
+        if delay:
+            _timer.schedule(delay, lambda: self._expire(generation))
+        return True
+
+    def _expire(self, generation: int):
+        with self._lock:
+            if generation != self._generation or self._pending is None:
+                return
+            text, self._pending = self._pending, None
+        self._clear(text)
+
+    def _clear(self, text: str):
+        backend = self.backend
+        try:
+            if isinstance(backend, TkBackend):
+                backend.clear_if(text)
+                return
+            current = backend.paste()
+            if current is None or current == text:
+                backend.clear()
+        except BACKEND_ERRORS:
+            pass
+
+    def clear_now(self):
+        """Clear a pending copy immediately instead of at its deadline"""
+        with self._lock:
+            text, self._pending = self._pending, None
+            self._generation += 1
+        if text is not None:
+            self._clear(text)
+
+    def close(self):
+        """Clear any pending copy"""
+        self.clear_now()
+
+
+_default_manager = None
+
+
+def default_manager() -> ClipboardManager:
+    """
+    Process-wide manager on the default backend; its timeout comes from
+    PASSWORD_CLIPBOARD_CLEAR (seconds, 0 disables) when set, and its
+    pending copy is cleared at interpreter exit
+    """
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            clear_after = DEFAULT_CLEAR_AFTER
+            value = os.environ.get(CLEAR_AFTER_ENV)
+            if value:
+                try:
+                    clear_after = float(value)
+                except ValueError:
+                    pass
+            _default_manager = ClipboardManager(clear_after=clear_after)
+            atexit.register(_default_manager.close)
+        return _default_manager
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def check_auto_clear(delay: float = 0.05) -> List[str]:
+    """
+    Exercise ClipboardManager's timer on a FakeBackend
+
+    Returns:
+        Problems found (empty when the timer behaves)
+    """
+    problems = []
+    backend = FakeBackend()
+    manager = ClipboardManager(backend, clear_after=delay)
+    try:
+        if not manager.copy('secret-1') or backend.text != 'secret-1' or not manager.pending:
+            problems.append("copy() did not put the text on the clipboard")
+        if not _wait_for(lambda: backend.text == '' and not manager.pending):
+            problems.append(f"copied text was not cleared after {delay}s")
+        elif backend.clears != 1:
+            problems.append(f"expected one clear, saw {backend.clears}")
+
+        # A newer copy supersedes the older copy's clear
+        manager.copy('secret-2')
+        manager.copy('secret-3', clear_after=delay * 20)
+        time.sleep(delay * 4)
+        if backend.text != 'secret-3':
+            problems.append("an older copy's clear wiped a newer copy")
+
+        # Text copied by something else since is left alone
+        manager.copy('secret-4')
+        backend.text = 'copied elsewhere'
+        time.sleep(delay * 4)
+        if backend.text != 'copied elsewhere':
+            problems.append("a clear wiped text the manager did not copy")
+
+        manager.copy('secret-5', clear_after=60)
+        manager.close()
+        if backend.text != '' or manager.pending:
+            problems.append("close() did not clear the pending copy")
+    finally:
+        manager.close()
+    return problems
+
+
+def main(argv=None) -> int:
+    """Entry point: exit code 0 when the auto-clear timer behaves"""
+    problems = check_auto_clear()
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ Clipboard auto-clear works")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,34 +3,120 @@ Password Generator Engine Module
 Handles password generation with various complexity levels and options
 """
 
-import random
-import string
-import secrets
-import json
+from __future__ import annotations
+
 import os
-from typing import List, Dict, Tuple
+import time
+
+from password_random import secure_random
+
+# Imported only by type checkers; keeps typing out of CLI cold start
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Dict, Optional, Tuple
 
 
 class PasswordGenerator:
     """Core password generation engine with multiple complexity levels"""
     
-    # Character sets
-    LOWERCASE = string.ascii_lowercase
-    UPPERCASE = string.ascii_uppercase
-    DIGITS = string.digits
-    SPECIAL = string.punctuation
+    # Character sets (same as string.ascii_lowercase etc., spelled out so
+    # that importing the engine does not pull in string -> re)
+    LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+    UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    DIGITS = '0123456789'
+    SPECIAL = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
     
     # Ambiguous characters that can be confused
     AMBIGUOUS = 'il1Lo0O'
     
-    def __init__(self):
+    # Passphrases end with a number below this
+    PASSPHRASE_SUFFIXES = 100
+    
+    # Common word list for passphrases
+    WORDS = (
+        'apple', 'banana', 'cherry', 'dragon', 'elephant', 'forest', 'garden',
+        'happy', 'island', 'jungle', 'kitten', 'lemon', 'mountain', 'ninja',
+        'ocean', 'panda', 'queen', 'rabbit', 'sunset', 'tiger', 'umbrella',
+        'valley', 'wizard', 'yellow', 'zebra', 'anchor', 'bridge', 'castle',
+        'diamond', 'eagle', 'flame', 'galaxy', 'hammer', 'igloo', 'jasper',
+        'knight', 'lantern', 'marble', 'nectar', 'oasis', 'puzzle', 'quartz',
+        'rocket', 'shadow', 'thunder', 'universe', 'victory', 'wonder', 'xenon'
+    )
+    
+    def __init__(self, rng=None, retention=None, sharded: bool = False):
         self.history_file = "password_history.json"
-        self.history = self.load_history()
+        # Store history as monthly segments (password_history.ShardedHistoryStore)
+        self.sharded = sharded
+        # Random source; secure by default, see for_testing()
+        self.rng = rng or secure_random
+        # Optional password_history.RetentionPolicy bounding the history
+        self.retention = retention
+        self._store = None
+        self._history = None
+        self._writer = None
+        self._search_index = None
+        # Optional password_profiling.Profiler (enable_profiling() or PASSWORD_PROFILE)
+        self._profiler = None
+        if os.environ.get('PASSWORD_PROFILE'):
+            from password_profiling import profiler_from_env
+            self._profiler = profiler_from_env(self)
+    
+    @classmethod
+    def for_testing(cls, seed) -> 'PasswordGenerator':
+        """
+        INSECURE: generator drawing from a seeded deterministic DRBG
+        
+        For reproducible load and regression tests only. The same seed
+        gives byte-identical output on every run. Sequential APIs consume
+        one stream in call order, so a bulk call such as generate_multiple
+        matches the equivalent loop of single calls. The fixed-width
+        generate_bulk/generate_batch paths derive record i from its own
+        substream, so every backend, and any split into parallel slices
+        via start=, yields the same records; calls without start= take the
+        record indices after the previous call's, so they never repeat.
+        """
+        import warnings
+        from password_random import DeterministicRandom
+        warnings.warn("PasswordGenerator.for_testing() produces reproducible, "
+                      "insecure passwords; never use them for real accounts",
+                      RuntimeWarning, stacklevel=2)
+        return cls(rng=DeterministicRandom(seed))
+    
+    @property
+    def deterministic(self) -> bool:
+        """True when running in the insecure reproducible test mode"""
+        return self.rng.deterministic
+    
+    @property
+    def history(self) -> List[Dict]:
+        """Saved passwords, loaded from disk on first access"""
+        if self._history is None:
+            self._history = self.load_history()
+        return self._history
+    
+    @property
+    def history_loaded(self) -> bool:
+        """True once history has been read from disk (or assigned)"""
+        return self._history is not None
+    
+    @history.setter
+    def history(self, entries: List[Dict]):
+        from password_history import HistoryLog
+        self._history = HistoryLog(entries, self.retention)
+    
+    @property
+    def store(self):
+        """History storage backend, imported on first use"""
+        if self._store is None:
+            from password_history import HistoryStore, ShardedHistoryStore
+            store_class = ShardedHistoryStore if self.sharded else HistoryStore
+            self._store = store_class(self.history_file)
+        return self._store
     
     def generate_password(self, length: int = 12, use_uppercase: bool = True,
                          use_lowercase: bool = True, use_digits: bool = True,
                          use_special: bool = True, exclude_ambiguous: bool = False,
-                         custom_chars: str = "") -> str:
+                         custom_chars: str = "", debias: bool = False) -> str:
         """
         Generate a password with specified criteria
         
@@ -42,6 +128,8 @@ class PasswordGenerator:
             use_special: Include special characters
             exclude_ambiguous: Exclude ambiguous characters (il1Lo0O)
             custom_chars: Additional custom characters to include
+            debias: Drop duplicate characters from the pool (repeated or
+                overlapping custom_chars) so every character is equally likely
         
         Returns:
             Generated password string
@@ -50,37 +138,17 @@ class PasswordGenerator:
             raise ValueError("Password length must be at least 4 characters")
         
         # Build character pool
-        char_pool = ""
-        required_chars = []
-        
-        if use_lowercase:
-            chars = self.LOWERCASE
-            if exclude_ambiguous:
-                chars = ''.join(c for c in chars if c not in self.AMBIGUOUS)
-            char_pool += chars
-            required_chars.append(secrets.choice(chars))
-        
-        if use_uppercase:
-            chars = self.UPPERCASE
-            if exclude_ambiguous:
-                chars = ''.join(c for c in chars if c not in self.AMBIGUOUS)
-            char_pool += chars
-            required_chars.append(secrets.choice(chars))
-        
-        if use_digits:
-            chars = self.DIGITS
-            if exclude_ambiguous:
-                chars = ''.join(c for c in chars if c not in self.AMBIGUOUS)
-            char_pool += chars
-            required_chars.append(secrets.choice(chars))
-        
-        if use_special:
-            char_pool += self.SPECIAL
-            required_chars.append(secrets.choice(self.SPECIAL))
+        classes = self._character_classes(use_uppercase, use_lowercase, use_digits,
+                                          use_special, exclude_ambiguous)
+        char_pool = ''.join(classes)
+        required_chars = [self.rng.choice(chars) for chars in classes]
         
         if custom_chars:
             char_pool += custom_chars
         
+        if debias:
+            char_pool = ''.join(dict.fromkeys(char_pool))
+        
         if not char_pool:
             raise ValueError("At least one character type must be selected")
         
@@ -89,14 +157,30 @@ class PasswordGenerator:
         remaining_length = length - len(required_chars)
         
         for _ in range(remaining_length):
-            password_chars.append(secrets.choice(char_pool))
+            password_chars.append(self.rng.choice(char_pool))
         
         # Shuffle to avoid predictable patterns
-        secrets.SystemRandom().shuffle(password_chars)
+        self.rng.shuffle(password_chars)
         
         password = ''.join(password_chars)
         return password
     
+    def _character_classes(self, use_uppercase: bool, use_lowercase: bool,
+                           use_digits: bool, use_special: bool,
+                           exclude_ambiguous: bool) -> List[str]:
+        """Return the enabled character classes, in pool order"""
+        classes = []
+        for enabled, chars in ((use_lowercase, self.LOWERCASE),
+                               (use_uppercase, self.UPPERCASE),
+                               (use_digits, self.DIGITS)):
+            if enabled:
+                if exclude_ambiguous:
+                    chars = ''.join(c for c in chars if c not in self.AMBIGUOUS)
+                classes.append(chars)
+        if use_special:
+            classes.append(self.SPECIAL)
+        return classes
+    
     def generate_easy_password(self, length: int = 12) -> str:
         """Generate an easy-to-type password (lowercase + digits only)"""
         return self.generate_password(
@@ -130,37 +214,216 @@ class PasswordGenerator:
             exclude_ambiguous=False
         )
     
-    def generate_pin(self, length: int = 4) -> str:
-        """Generate a numeric PIN"""
+    def generate_pin(self, length: int = 4, screen: bool = True) -> str:
+        """
+        Generate a numeric PIN
+        
+        Args:
+            screen: Never return common, repeated, sequential or date-shaped
+                PINs (see password_pins); the result is uniform over the
+                remaining PINs
+        """
         if length < 4:
             raise ValueError("PIN length must be at least 4 digits")
-        return ''.join(secrets.choice(self.DIGITS) for _ in range(length))
+        if screen:
+            from password_pins import generate_pin
+            return generate_pin(length, self.rng)
+        return ''.join(self.rng.choice(self.DIGITS) for _ in range(length))
+    
+    def generate_pins(self, count: int, length: int = 4, screen: bool = True) -> List[str]:
+        """Generate count PINs (bulk path of generate_pin)"""
+        if length < 4:
+            raise ValueError("PIN length must be at least 4 digits")
+        if screen:
+            from password_pins import generate_pins
+            return generate_pins(count, length, self.rng)
+        return [self.generate_pin(length, screen=False) for _ in range(count)]
     
     def generate_passphrase(self, num_words: int = 4, separator: str = '-') -> str:
         """Generate a memorable passphrase using common words"""
-        # Common word list for passphrases
-        words = [
-            'apple', 'banana', 'cherry', 'dragon', 'elephant', 'forest', 'garden',
-            'happy', 'island', 'jungle', 'kitten', 'lemon', 'mountain', 'ninja',
-            'ocean', 'panda', 'queen', 'rabbit', 'sunset', 'tiger', 'umbrella',
-            'valley', 'wizard', 'yellow', 'zebra', 'anchor', 'bridge', 'castle',
-            'diamond', 'eagle', 'flame', 'galaxy', 'hammer', 'igloo', 'jasper',
-            'knight', 'lantern', 'marble', 'nectar', 'oasis', 'puzzle', 'quartz',
-            'rocket', 'shadow', 'thunder', 'universe', 'victory', 'wonder', 'xenon'
-        ]
-        
-        selected_words = [secrets.choice(words) for _ in range(num_words)]
+        selected_words = [self.rng.choice(self.WORDS) for _ in range(num_words)]
         # Capitalize first letter of each word for better security
         selected_words = [word.capitalize() for word in selected_words]
         # Add a random number at the end
-        selected_words.append(str(secrets.randbelow(100)))
+        selected_words.append(str(self.rng.randbelow(self.PASSPHRASE_SUFFIXES)))
         
         return separator.join(selected_words)
     
+    def generate_pronounceable(self, length: int = 16) -> str:
+        """Generate a pronounceable password from the Markov model"""
+        return self.generate_pronounceable_with_entropy(length)[0]
+    
+    def generate_pronounceable_with_entropy(self, length: int = 16) -> Tuple[str, float]:
+        """Generate a pronounceable password and an upper bound on its entropy in bits"""
+        from password_markov import default_model
+        return default_model().generate_with_entropy(length, self.rng)
+    
+    def generate_pronounceable_many(self, count: int, length: int = 16) -> List[Tuple[str, float]]:
+        """Generate many pronounceable passwords with their entropy"""
+        from password_markov import default_model
+        return default_model().generate_many(count, length, self.rng)
+    
+    def generate_with_policy(self, policy) -> str:
+        """
+        Generate a password meeting a declarative PasswordPolicy
+        
+        Args:
+            policy: password_policy.PasswordPolicy instance
+        
+        Returns:
+            Generated password string
+        """
+        from password_policy import compile_policy
+        return compile_policy(policy).generate(self.rng)
+    
+    def generate_from_template(self, template: str, exclude_ambiguous: bool = False) -> str:
+        """Generate a password following a mask template such as 'Ulll-dddd-ssss'"""
+        from password_template import compile_template
+        return compile_template(template, exclude_ambiguous).generate(self.rng)
+    
+    def generate_many_from_template(self, template: str, count: int,
+                                    exclude_ambiguous: bool = False) -> List[str]:
+        """Generate many passwords from one template, compiling it only once"""
+        from password_template import compile_template
+        return compile_template(template, exclude_ambiguous).generate_many(count, self.rng)
+    
+    def generate_bulk(self, count: int, length: int = 12, use_uppercase: bool = True,
+                      use_lowercase: bool = True, use_digits: bool = True,
+                      use_special: bool = True, exclude_ambiguous: bool = False,
+                      separator: bytes = b'\n', buffer=None, start: int = None):
+        """
+        Generate many same-length passwords as fixed-width ASCII records
+        
+        Every record contains each selected character type at least once.
+        
+        Args:
+            count: Number of passwords
+            separator: Bytes written after each record
+            buffer: Optional preallocated bytearray / memoryview / mmap
+            start: Index of the first record (only affects deterministic
+                test mode, where it lets workers produce slices of one run;
+                by default each call continues after the previous one)
+        
+        Returns:
+            password_bulk.PasswordBuffer exposing the records zero-copy
+        """
+        from password_bulk import generate_buffer
+        pool, classes = self._bulk_pool(length, use_uppercase, use_lowercase,
+                                        use_digits, use_special, exclude_ambiguous)
+        return generate_buffer(count, length, pool, classes, separator, buffer,
+                               self.rng, start)
+    
+    def generate_bulk_to_file(self, path: str, count: int, length: int = 12,
+                              use_uppercase: bool = True, use_lowercase: bool = True,
+                              use_digits: bool = True, use_special: bool = True,
+                              exclude_ambiguous: bool = False,
+                              separator: bytes = b'\n', start: int = None) -> int:
+        """Generate passwords straight into a memory-mapped file; returns its size"""
+        from password_bulk import generate_to_file
+        pool, classes = self._bulk_pool(length, use_uppercase, use_lowercase,
+                                        use_digits, use_special, exclude_ambiguous)
+        return generate_to_file(path, count, length, pool, classes, separator,
+                                self.rng, start)
+    
+    def generate_batch(self, count: int, length: int = 12, use_uppercase: bool = True,
+                       use_lowercase: bool = True, use_digits: bool = True,
+                       use_special: bool = True, exclude_ambiguous: bool = False,
+                       backend: str = 'auto', start: int = None):
+        """
+        Generate a batch of same-length passwords as a 2D byte array
+        
+        Uses the vectorized NumPy backend when NumPy is installed and the
+        pure Python bulk path otherwise (see password_numpy.generate_batch).
+        password_numpy.to_strings() decodes either result.
+        """
+        from password_numpy import generate_batch
+        pool, classes = self._bulk_pool(length, use_uppercase, use_lowercase,
+                                        use_digits, use_special, exclude_ambiguous)
+        return generate_batch(count, length, pool, classes, backend, self.rng, start)
+    
+    def _bulk_pool(self, length: int, use_uppercase: bool, use_lowercase: bool,
+                   use_digits: bool, use_special: bool,
+                   exclude_ambiguous: bool) -> Tuple[str, List[str]]:
+        """Validate bulk options and return (pool, required classes)"""
+        if length < 4:
+            raise ValueError("Password length must be at least 4 characters")
+        classes = self._character_classes(use_uppercase, use_lowercase, use_digits,
+                                          use_special, exclude_ambiguous)
+        if not classes:
+            raise ValueError("At least one character type must be selected")
+        return ''.join(classes), classes
+    
     def generate_multiple(self, count: int, length: int = 12, **kwargs) -> List[str]:
         """Generate multiple passwords at once"""
         return [self.generate_password(length, **kwargs) for _ in range(count)]
     
+    def generate_requests(self, specs: List[Dict]) -> List[Dict]:
+        """
+        Generate passwords for a mixed batch of requests
+        
+        Each request is a dict with a 'kind' ('password', 'easy', 'medium',
+        'strong', 'pin', 'passphrase', 'template', 'policy', 'pronounceable'
+        or the matching engine method name) and that method's options,
+        e.g. {'kind': 'pin', 'length': 6}. Requests with the same
+        normalised options are generated together through their bulk path
+        (see password_batch).
+        
+        Returns:
+            {'password': ..., 'error': ...} per request, in request order
+        """
+        from password_batch import run_requests
+        return run_requests(self, specs)
+    
+    def generate_with_strategy(self, name: str, **options) -> str:
+        """
+        Generate with a registered strategy such as 'pin' or 'template'
+        (see password_strategies); options not given take their defaults
+        """
+        from password_strategies import get
+        return get(name).generate(self, **options)
+    
+    def generate_for_entropy(self, bits: float, style: str = 'strong') -> Tuple[str, float]:
+        """
+        Generate the shortest password of a style that meets an entropy target
+        
+        Args:
+            bits: Minimum entropy in bits
+            style: 'easy', 'medium' or 'strong' (character pools of the
+                matching presets), 'passphrase' (word count) or 'pin'
+                (screened PIN digits)
+        
+        Returns:
+            (password, exact entropy in bits), the entropy being at least bits
+        """
+        return self.generate_many_for_entropy(1, bits, style)[0]
+    
+    def generate_many_for_entropy(self, count: int, bits: float,
+                                  style: str = 'strong') -> List[Tuple[str, float]]:
+        """
+        Generate count passwords meeting an entropy target (see
+        generate_for_entropy); the length is chosen once for the batch
+        """
+        import password_entropy as entropy_tables
+        if style in entropy_tables.POOL_STYLES:
+            flags = entropy_tables.POOL_STYLES[style]
+            classes = self._character_classes(**flags)
+            table = entropy_tables.pool_table(tuple(len(chars) for chars in classes))
+            length, entropy = entropy_tables.minimal_length(table, bits)
+            # The bulk path is uniform over the set the table counts
+            passwords = self.generate_bulk(count, length, separator=b'', **flags).passwords()
+        elif style == 'passphrase':
+            table = entropy_tables.passphrase_table(len(set(self.WORDS)),
+                                                     self.PASSPHRASE_SUFFIXES)
+            num_words, entropy = entropy_tables.minimal_length(table, bits)
+            passwords = [self.generate_passphrase(num_words) for _ in range(count)]
+        elif style == 'pin':
+            length, entropy = entropy_tables.minimal_pin_length(bits)
+            passwords = self.generate_pins(count, length)
+        else:
+            raise ValueError(f"Unknown style '{style}' "
+                             f"(expected one of: {', '.join(entropy_tables.STYLES)})")
+        return [(password, entropy) for password in passwords]
+    
     def check_strength(self, password: str) -> Dict:
         """
         Analyze password strength
@@ -199,6 +462,11 @@ class PasswordGenerator:
         if has_lowercase and has_uppercase and has_digits and has_special:
             score += 10
         
+        # Penalty for keyboard walks, sequences and repeats
+        from password_patterns import find_patterns, pattern_penalty
+        patterns = find_patterns(password)
+        score = max(0, score - pattern_penalty(password, patterns))
+        
         # Determine strength level
         if score >= 80:
             strength = "Very Strong"
@@ -225,15 +493,24 @@ class PasswordGenerator:
             'has_uppercase': has_uppercase,
             'has_digits': has_digits,
             'has_special': has_special,
+            'patterns': [match.to_dict() for match in patterns],
             'feedback': self._get_strength_feedback(score, length, has_lowercase, 
-                                                    has_uppercase, has_digits, has_special)
+                                                    has_uppercase, has_digits, has_special,
+                                                    patterns)
         }
     
     def _get_strength_feedback(self, score: int, length: int, has_lower: bool,
-                               has_upper: bool, has_digits: bool, has_special: bool) -> List[str]:
+                               has_upper: bool, has_digits: bool, has_special: bool,
+                               patterns=()) -> List[str]:
         """Generate feedback for password strength"""
         feedback = []
         
+        # One hint per kind of pattern found (password_patterns.FEEDBACK)
+        if patterns:
+            from password_patterns import FEEDBACK
+            for kind in dict.fromkeys(match.kind for match in patterns):
+                feedback.append(FEEDBACK[kind])
+        
         if length < 12:
             feedback.append("Consider using at least 12 characters")
         if not has_lower:
@@ -252,55 +529,229 @@ class PasswordGenerator:
     
     def save_to_history(self, password: str, description: str = ""):
         """Save password to history"""
-        entry = {
+        self.history.append(self.make_history_entry(password, description))
+        self._save_history()
+    
+    def make_history_entry(self, password: str, description: str = "") -> Dict:
+        """Build a history entry without storing it"""
+        return {
             'password': password,
             'description': description,
             'created_at': self._get_timestamp(),
             'strength': self.check_strength(password)['strength']
         }
-        self.history.append(entry)
-        self._save_history()
     
     def load_history(self) -> List[Dict]:
         """Load password history from file"""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return []
-        return []
-    
-    def _save_history(self):
-        """Save history to file"""
-        try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=2)
-        except IOError:
-            pass
-    
-    def clear_history(self):
-        """Clear password history"""
+        from password_history import HistoryLog
+        return HistoryLog(self.store.load(), self.retention)
+    
+    def _save_history(self, durable: bool = False):
+        """
+        Save history to file
+        
+        Args:
+            durable: fsync the write and raise OSError if it fails (with
+                write-behind the writer handles failures and retries)
+        """
+        if self._writer is not None:
+            self._writer.notify()
+        else:
+            self.store.save(self.history, durable)
+    
+    def enable_write_behind(self, flush_size: int = 100, flush_interval: float = 1.0):
+        """
+        Batch history writes on a background thread
+        
+        save_to_history() then returns without touching disk; saves are
+        written together once flush_size are pending or after
+        flush_interval seconds, and always by flush_history(), close()
+        or interpreter exit.
+        
+        Returns:
+            password_history.WriteBehindWriter
+        """
+        if self._writer is None:
+            from password_history import WriteBehindWriter
+            self._writer = WriteBehindWriter(self.store, lambda: self.history.snapshot(),
+                                             flush_size, flush_interval)
+        return self._writer
+    
+    def flush_history(self):
+        """Write any saves still buffered by write-behind mode"""
+        if self._writer is not None:
+            self._writer.flush()
+    
+    def enable_profiling(self, mode: str = 'cprofile', output: str = None,
+                         calls: int = None, methods: List[str] = None):
+        """
+        Profile calls to this generator's methods without editing them
+        
+        Args:
+            mode: 'cprofile' (pstats output) or 'sample' (collapsed stacks
+                for flamegraphs)
+            output: Output file written when profiling stops
+            calls: Stop after this many outermost calls (None = until
+                disable_profiling(), close() or interpreter exit)
+            methods: Method names to profile (default: the public methods
+                and _save_history)
+        
+        Returns:
+            password_profiling.Profiler
+        """
+        if self._profiler is None or self._profiler.stopped:
+            from password_profiling import Profiler
+            self._profiler = Profiler(self, mode, output, calls, methods)
+        return self._profiler
+    
+    def disable_profiling(self) -> Optional[str]:
+        """Stop profiling and write its output; returns the output path"""
+        if self._profiler is None:
+            return None
+        profiler, self._profiler = self._profiler, None
+        return profiler.stop()
+    
+    def close(self):
+        """Flush buffered history and stop the write-behind thread and profiling"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self.disable_profiling()
+    
+    def __enter__(self) -> 'PasswordGenerator':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def history_range(self, start=None, end=None) -> List[Dict]:
+        """
+        Entries created in [start, end), oldest first
+        
+        Bounds are 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' strings (None for
+        open ends). With sharded storage and history not yet loaded, only
+        the monthly segments overlapping the range are read.
+        """
+        from password_history import parse_bound
+        if self._history is None and self.sharded:
+            return self.store.load_range(start, end)
+        return self.history.between(parse_bound(start), parse_bound(end))
+    
+    def recent_history(self, count: int = 10) -> List[Dict]:
+        """The newest count entries, oldest first"""
+        if self._history is None and self.sharded:
+            return self.store.recent(count)
+        return self.history[-count:] if count else []
+    
+    def clear_history(self, start=None, end=None):
+        """
+        Clear password history
+        
+        Args:
+            start, end: Only delete entries created in [start, end), as in
+                history_range(); the whole history when both are None
+        """
+        if start is not None or end is not None:
+            from password_history import parse_bound
+            start, end = parse_bound(start), parse_bound(end)
+            if self._history is None and self.sharded and self._writer is None:
+                self.store.clear_range(start, end)
+            else:
+                self.history.remove_between(start, end)
+                self._save_history()
+            return
+        
+        if self._writer is not None:
+            self._writer.discard()
         self.history = []
-        if os.path.exists(self.history_file):
-            os.remove(self.history_file)
+        self.store.clear()
+        self._search_index = None
+        from password_search import index_path
+        if os.path.exists(index_path(self.history_file)):
+            os.remove(index_path(self.history_file))
+    
+    def search_history(self, query: str, prefix: bool = False, limit: int = None) -> List[Dict]:
+        """
+        Find saved passwords by description
+        
+        Uses a trigram index kept beside the history file (see
+        password_search); only entries saved since the last search are
+        indexed on each call.
+        
+        Args:
+            query: Case-insensitive text to look for
+            prefix: Match only at the start of a word
+            limit: Maximum number of results
+        
+        Returns:
+            Matching history entries, newest first
+        """
+        from password_search import SearchIndex, index_path
+        path = index_path(self.history_file)
+        if self._search_index is None:
+            self._search_index = SearchIndex.load(path)
+        index = self._search_index
+        index.sync(self.history)
+        if index.dirty:
+            index.save(path)
+        return index.search(self.history, query, prefix=prefix, limit=limit)
+    
+    def export_history(self, path: str, fmt: str = None) -> int:
+        """
+        Stream history to a CSV or NDJSON file (gzip when fmt or the file
+        name ends in .gz); see password_transfer.FORMATS
+        
+        Returns:
+            Number of entries written
+        """
+        from password_transfer import write_entries
+        if self._history is None and self.sharded:
+            entries = self.store.iter_entries()
+        else:
+            entries = self.history
+        return write_entries(entries, path, fmt)
+    
+    def import_history(self, path: str, fmt: str = None) -> Dict:
+        """
+        Merge an exported history file into this history
+        
+        Records already present (same password and created_at, or the same
+        password for records without a timestamp) are skipped, so several
+        workstations' exports can be consolidated into one store. Missing
+        timestamps default to now and missing strengths are recomputed.
+        The merged history is written once at the end.
+        
+        Returns:
+            {'read': n, 'added': n, 'duplicates': n}
+        """
+        from password_transfer import merge_entries, read_entries
+        
+        def complete(entry: Dict) -> Dict:
+            if not entry['created_at']:
+                entry['created_at'] = self._get_timestamp()
+            if not entry['strength']:
+                entry['strength'] = self.check_strength(entry['password'])['strength']
+            return entry
+        
+        counts = merge_entries(self.history, read_entries(path, fmt), complete)
+        if counts['added']:
+            self._save_history()
+        return counts
     
     def _get_timestamp(self) -> str:
         """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return time.strftime("%Y-%m-%d %H:%M:%S")
     
     @staticmethod
-    def copy_to_clipboard(text: str) -> bool:
+    def copy_to_clipboard(text: str, clear_after: float = None) -> bool:
         """
         Attempt to copy text to clipboard
+        
+        The backend is detected once per process and the text is cleared
+        again after clear_after seconds (default: the shared manager's
+        timeout, see password_clipboard.default_manager).
+        
         Returns True if successful, False otherwise
         """
-        try:
-            # Try using pyperclip if available
-            import pyperclip
-            pyperclip.copy(text)
-            return True
-        except ImportError:
-            # pyperclip not available
-            return False
+        from password_clipboard import default_manager
+        return default_manager().copy(text, clear_after)
@@ -0,0 +1,116 @@
+"""
+Entropy Target Module
+Exact entropy tables for the generator's output styles, used to pick the
+shortest password, passphrase or PIN that meets an entropy target
+
+Each table maps a length (characters, words or digits) to the exact
+entropy in bits of that style at that length, i.e. log2 of the number of
+equally likely outputs. Tables are computed once per pool or wordlist and
+cached; the minimal length for a target is a binary search.
+"""
+
+import math
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Tuple
+
+# Longest password (characters) or passphrase (words) considered
+MAX_LENGTH = 256
+
+# Shortest length each style accepts
+MIN_PASSWORD_LENGTH = 4
+MIN_PIN_LENGTH = 4
+MIN_WORDS = 1
+
+# Longest screened PIN with a known allowed count (password_pins bitsets)
+MAX_SCREENED_PIN_LENGTH = 8
+
+# style -> generate_password character flags (same as the engine presets)
+POOL_STYLES = {
+    'easy': {'use_uppercase': False, 'use_lowercase': True, 'use_digits': True,
+             'use_special': False, 'exclude_ambiguous': True},
+    'medium': {'use_uppercase': True, 'use_lowercase': True, 'use_digits': True,
+               'use_special': False, 'exclude_ambiguous': False},
+    'strong': {'use_uppercase': True, 'use_lowercase': True, 'use_digits': True,
+               'use_special': True, 'exclude_ambiguous': False},
+}
+
+STYLES = tuple(POOL_STYLES) + ('passphrase', 'pin')
+
+
+@lru_cache(maxsize=None)
+def pool_table(class_sizes: Tuple[int, ...]) -> Tuple[float, ...]:
+    """
+    table[n]: entropy of an n-character password over disjoint classes
+    of these sizes containing every class (the bulk path's output set);
+    0 below MIN_PASSWORD_LENGTH
+    """
+    from password_bulk import count_valid_passwords
+    table = [0.0] * MIN_PASSWORD_LENGTH
+    for length in range(MIN_PASSWORD_LENGTH, MAX_LENGTH + 1):
+        table.append(math.log2(count_valid_passwords(class_sizes, length)))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def passphrase_table(words: int, suffixes: int) -> Tuple[float, ...]:
+    """
+    table[n]: entropy of n words drawn with replacement from a list of
+    distinct words, plus a number below suffixes; 0 below MIN_WORDS
+    """
+    per_word = math.log2(words)
+    suffix = math.log2(suffixes)
+    return tuple(0.0 if n < MIN_WORDS else n * per_word + suffix
+                 for n in range(MAX_LENGTH + 1))
+
+
+@lru_cache(maxsize=None)
+def pin_entropy(length: int, screen: bool = True) -> float:
+    """Entropy of a PIN of length digits, uniform over the allowed PINs"""
+    if not screen:
+        return length * math.log2(10)
+    if length > MAX_SCREENED_PIN_LENGTH:
+        raise ValueError(f"Exact entropy of screened PINs is known up to "
+                         f"{MAX_SCREENED_PIN_LENGTH} digits")
+    from password_pins import denylist
+    return math.log2(denylist(length).allowed)
+
+
+def minimal_length(table: Tuple[float, ...], bits: float) -> Tuple[int, float]:
+    """
+    Shortest length whose entropy in table meets bits
+
+    Returns:
+        (length, exact entropy at that length)
+
+    Raises:
+        ValueError: No length in the table reaches the target
+    """
+    if not bits > 0:
+        raise ValueError("Entropy target must be a positive number of bits")
+    length = bisect_left(table, bits)
+    if length >= len(table):
+        raise ValueError(f"Entropy target of {bits} bits is above the "
+                         f"{table[-1]:.1f} bits of the longest supported length")
+    return length, table[length]
+
+
+def minimal_pin_length(bits: float, screen: bool = True) -> Tuple[int, float]:
+    """
+    Shortest PIN meeting bits, as (length, exact entropy)
+
+    Screening only removes PINs, so ceil(bits / log2(10)) digits is a
+    lower bound and the search starts there; the bitsets of longer PINs
+    are never built for a small target.
+    """
+    if not bits > 0:
+        raise ValueError("Entropy target must be a positive number of bits")
+    length = max(MIN_PIN_LENGTH, math.ceil(bits / math.log2(10)))
+    while True:
+        if screen and length > MAX_SCREENED_PIN_LENGTH:
+            raise ValueError(f"Entropy target of {bits} bits needs a screened PIN longer "
+                             f"than {MAX_SCREENED_PIN_LENGTH} digits; use a password style")
+        entropy = pin_entropy(length, screen)
+        if entropy >= bits:
+            return length, entropy
+        length += 1
@@ -5,8 +5,10 @@ Modern GUI for generating secure passwords
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, simpledialog
+from password_clipboard import ClipboardManager, detect_backend
 from password_engine import PasswordGenerator
+from password_strategies import strategies
 
 
 class PasswordGeneratorGUI:
@@ -20,6 +22,10 @@ class PasswordGeneratorGUI:
         
         self.generator = PasswordGenerator()
         
+        # Clipboard with auto-clear; the Tk root is a fallback backend
+        self.clipboard = ClipboardManager(detect_backend(self.root))
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+        
         # Color scheme
         self.colors = {
             'primary': '#2C3E50',
@@ -189,18 +195,14 @@ class PasswordGeneratorGUI:
         preset_frame = tk.Frame(options_frame, bg=self.colors['card'])
         preset_frame.pack(fill='x', padx=20, pady=(0, 20))
         
-        presets = [
-            ("Easy", self.generate_easy, self.colors['secondary']),
-            ("Medium", self.generate_medium, self.colors['warning']),
-            ("Strong", self.generate_strong, self.colors['danger']),
-        ]
-        
-        for text, command, color in presets:
+        # One button per registered preset strategy, using the length slider
+        colors = (self.colors['secondary'], self.colors['warning'], self.colors['danger'])
+        for i, strategy in enumerate(strategies('preset')):
             btn = tk.Button(
                 preset_frame,
-                text=text,
-                command=command,
-                bg=color,
+                text=strategy.button,
+                command=lambda strategy=strategy: self.generate_preset(strategy),
+                bg=colors[i % len(colors)],
                 fg='white',
                 font=('Arial', 10, 'bold'),
                 cursor='hand2',
@@ -328,47 +330,27 @@ class PasswordGeneratorGUI:
         tools_frame = tk.Frame(output_frame, bg=self.colors['card'])
         tools_frame.pack(fill='x', padx=20, pady=(0, 10))
         
-        pin_btn = tk.Button(
-            tools_frame,
-            text="🔢 Generate PIN",
-            command=self.generate_pin,
-            bg=self.colors['primary'],
-            fg='white',
-            font=('Arial', 10),
-            cursor='hand2',
-            relief='flat',
-            padx=10,
-            pady=8
-        )
-        pin_btn.pack(side='left', expand=True, fill='x', padx=(0, 5))
-        
-        passphrase_btn = tk.Button(
-            tools_frame,
-            text="📝 Passphrase",
-            command=self.generate_passphrase,
-            bg=self.colors['primary'],
-            fg='white',
-            font=('Arial', 10),
-            cursor='hand2',
-            relief='flat',
-            padx=10,
-            pady=8
-        )
-        passphrase_btn.pack(side='left', expand=True, fill='x', padx=5)
-        
-        multiple_btn = tk.Button(
-            tools_frame,
-            text="🔄 Multiple",
-            command=self.generate_multiple,
-            bg=self.colors['primary'],
-            fg='white',
-            font=('Arial', 10),
-            cursor='hand2',
-            relief='flat',
-            padx=10,
-            pady=8
-        )
-        multiple_btn.pack(side='left', expand=True, fill='x', padx=(5, 0))
+        # Registered tool strategies, then the multiple-password window,
+        # three buttons per row
+        tools = [(strategy.button, lambda strategy=strategy: self.generate_tool(strategy))
+                 for strategy in strategies('tool')]
+        tools.append(("🔄 Multiple", self.generate_multiple))
+        for i, (text, command) in enumerate(tools):
+            btn = tk.Button(
+                tools_frame,
+                text=text,
+                command=command,
+                bg=self.colors['primary'],
+                fg='white',
+                font=('Arial', 10),
+                cursor='hand2',
+                relief='flat',
+                padx=10,
+                pady=8
+            )
+            btn.grid(row=i // 3, column=i % 3, sticky='ew', padx=2, pady=2)
+        for column in range(3):
+            tools_frame.columnconfigure(column, weight=1)
     
     def create_history_panel(self):
         """Create history panel at bottom"""
@@ -400,6 +382,17 @@ class PasswordGeneratorGUI:
         )
         clear_btn.pack(side='right')
         
+        # Search box: filters the panel by description as you type
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(header, textvariable=self.search_var, font=('Arial', 9), width=24)
+        search_entry.pack(side='right', padx=(0, 10))
+        search_entry.bind('<KeyRelease>', lambda event: self.update_history_display())
+        tk.Label(
+            header,
+            text="🔍",
+            bg=self.colors['card']
+        ).pack(side='right')
+        
         # History text area
         self.history_text = scrolledtext.ScrolledText(
             history_frame,
@@ -432,34 +425,38 @@ class PasswordGeneratorGUI:
         except ValueError as e:
             messagebox.showerror("Error", str(e))
     
-    def generate_easy(self):
-        """Generate easy password"""
-        password = self.generator.generate_easy_password(self.length_var.get())
-        self.display_password(password)
-    
-    def generate_medium(self):
-        """Generate medium password"""
-        password = self.generator.generate_medium_password(self.length_var.get())
-        self.display_password(password)
-    
-    def generate_strong(self):
-        """Generate strong password"""
-        password = self.generator.generate_strong_password(max(16, self.length_var.get()))
-        self.display_password(password)
-    
-    def generate_pin(self):
-        """Generate PIN"""
-        length = tk.simpledialog.askinteger("PIN Length", "Enter PIN length:", initialvalue=4, minvalue=4, maxvalue=16)
-        if length:
-            pin = self.generator.generate_pin(length)
-            self.display_password(pin)
+    def generate_preset(self, strategy):
+        """Generate with a preset strategy at the slider length (at least its minimum)"""
+        length = self.length_var.get()
+        for option in strategy.options:
+            if option.name == 'length' and option.minimum is not None:
+                length = max(length, option.minimum)
+        try:
+            password = strategy.generate(self.generator, length=length)
+            self.display_password(password)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
     
-    def generate_passphrase(self):
-        """Generate passphrase"""
-        num_words = tk.simpledialog.askinteger("Passphrase", "Number of words:", initialvalue=4, minvalue=2, maxvalue=8)
-        if num_words:
-            passphrase = self.generator.generate_passphrase(num_words)
-            self.display_password(passphrase)
+    def generate_tool(self, strategy):
+        """Generate with a tool strategy, asking for its options"""
+        options = {}
+        for option in strategy.options:
+            if not option.ask_gui:
+                continue
+            prompt = f"Enter {option.prompt}:"
+            if isinstance(option.default, int):
+                value = tk.simpledialog.askinteger(strategy.button, prompt, initialvalue=option.default,
+                                                   minvalue=option.minimum, maxvalue=option.maximum)
+            else:
+                value = tk.simpledialog.askstring(strategy.button, prompt, initialvalue=option.default)
+            if value is None:
+                return
+            options[option.name] = value
+        try:
+            password = strategy.generate(self.generator, **options)
+            self.display_password(password)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
     
     def generate_multiple(self):
         """Generate multiple passwords"""
@@ -523,9 +520,13 @@ class PasswordGeneratorGUI:
         self.password_text.config(state='disabled')
         
         if password and password != 'Your password will appear here...':
-            self.root.clipboard_clear()
-            self.root.clipboard_append(password)
-            messagebox.showinfo("Success", "Password copied to clipboard!")
+            if not self.clipboard.copy(password):
+                messagebox.showerror("Error", "Could not copy to the clipboard.")
+            elif self.clipboard.clear_after:
+                messagebox.showinfo("Success", "Password copied to clipboard!\n"
+                                    f"It will be cleared in {self.clipboard.clear_after:g} seconds.")
+            else:
+                messagebox.showinfo("Success", "Password copied to clipboard!")
         else:
             messagebox.showwarning("Warning", "No password to copy!")
     
@@ -577,12 +578,19 @@ Recommendations:
         """Update history display"""
         self.history_text.delete('1.0', 'end')
         
-        if self.generator.history:
-            for i, entry in enumerate(reversed(self.generator.history[-10:]), 1):
-                desc = f" - {entry['description']}" if entry['description'] else ""
-                self.history_text.insert('end', f"{entry['created_at']} | {entry['password']} | {entry['strength']}{desc}\n")
+        query = self.search_var.get().strip()
+        if query:
+            entries = self.generator.search_history(query, limit=50)
+            if not entries:
+                self.history_text.insert('end', "No matching passwords...")
         else:
-            self.history_text.insert('end', "No passwords saved yet...")
+            entries = list(reversed(self.generator.recent_history(10)))
+            if not entries:
+                self.history_text.insert('end', "No passwords saved yet...")
+        
+        for entry in entries:
+            desc = f" - {entry['description']}" if entry['description'] else ""
+            self.history_text.insert('end', f"{entry['created_at']} | {entry['password']} | {entry['strength']}{desc}\n")
     
     def clear_history(self):
         """Clear password history"""
@@ -593,6 +601,11 @@ Recommendations:
                 messagebox.showinfo("Success", "History cleared!")
         else:
             messagebox.showinfo("Info", "History is already empty.")
+    
+    def on_close(self):
+        """Clear a copied password that is still pending, then quit"""
+        self.clipboard.close()
+        self.root.destroy()
 
 
 def main():
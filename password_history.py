@@ -0,0 +1,901 @@
+"""
+Password History Storage Module
+Persists saved passwords locally in JSON format
+"""
+
+import atexit
+import calendar
+import heapq
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+
+
+class HistoryStore:
+    """JSON file backed storage for password history"""
+
+    def __init__(self, path: str = "password_history.json"):
+        self.path = path
+
+    def load(self) -> List[Dict]:
+        """Load history entries from file"""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, IOError):
+                return []
+        return []
+
+    def save(self, entries: List[Dict], durable: bool = False):
+        """
+        Write all history entries to file
+
+        Args:
+            durable: Write to a temporary file, fsync it and atomically
+                replace the history file, so a crash never leaves a
+                truncated file
+
+        Raises:
+            OSError: A durable write failed (other write failures are ignored)
+        """
+        try:
+            if not durable:
+                with open(self.path, 'w') as f:
+                    json.dump(list(entries), f, indent=2)
+                return
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(list(entries), f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except IOError:
+            if durable:
+                raise
+
+    def clear(self):
+        """Delete the history file"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Format of the 'created_at' history field
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Strength labels produced by PasswordGenerator.check_strength
+STRENGTHS = ('Very Weak', 'Weak', 'Medium', 'Strong', 'Very Strong')
+_STRENGTH_CODES = {label: code for code, label in enumerate(STRENGTHS)}
+
+# Keys of a history entry that fits the compact columns ('id' optional)
+_ENTRY_KEYS = frozenset(('password', 'description', 'created_at', 'strength'))
+_ENTRY_KEYS_WITH_ID = _ENTRY_KEYS | {'id'}
+
+# created value of entries without a valid timestamp
+UNDATED = -(1 << 62)
+
+# Day string <-> day number caches for timestamp conversion
+_DAY_NUMBERS: Dict[str, int] = {}
+_DAY_STRINGS: Dict[int, str] = {}
+
+
+def local_now() -> int:
+    """Current local wall-clock time as seconds in the timestamp scale"""
+    return calendar.timegm(time.localtime())
+
+
+def parse_timestamp(created_at: str):
+    """
+    Convert a 'created_at' string to integer seconds (None if malformed)
+
+    The stored strings are local wall-clock time, so they are counted as
+    if they were UTC: conversion is exact in both directions and never
+    hits DST gaps. Compare the result with local_now(), not time.time().
+    """
+    try:
+        if len(created_at) != 19 or created_at[10] != ' ':
+            return None
+        day = created_at[:10]
+        number = _DAY_NUMBERS.get(day)
+        if number is None:
+            number = calendar.timegm(time.strptime(day, '%Y-%m-%d')) // 86400
+            _DAY_NUMBERS[day] = number
+        hours, minutes, seconds = int(created_at[11:13]), int(created_at[14:16]), int(created_at[17:19])
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if created_at[13] != ':' or created_at[16] != ':' or hours > 23 or minutes > 59 or seconds > 59:
+        return None
+    return number * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+def format_timestamp(seconds: int) -> str:
+    """Inverse of parse_timestamp"""
+    number, rest = divmod(seconds, 86400)
+    day = _DAY_STRINGS.get(number)
+    if day is None:
+        day = _DAY_STRINGS[number] = time.strftime('%Y-%m-%d', time.gmtime(number * 86400))
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{day} {hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def segment_key(seconds: int) -> str:
+    """Monthly segment holding a timestamp: 'YYYY-MM' or 'undated'"""
+    return 'undated' if seconds == UNDATED else format_timestamp(seconds - seconds % 86400)[:7]
+
+
+def parse_bound(value) -> int:
+    """Range bound from 'YYYY-MM-DD', a full timestamp, seconds or None"""
+    if value is None or isinstance(value, int):
+        return value
+    seconds = parse_timestamp(value if len(value) != 10 else value + ' 00:00:00')
+    if seconds is None:
+        raise ValueError(f"Invalid date '{value}' (expected YYYY-MM-DD[ HH:MM:SS])")
+    return seconds
+
+
+class RetentionPolicy:
+    """
+    Rules bounding how much history is kept
+
+    Args:
+        max_entries: Keep at most this many entries (oldest dropped first)
+        max_age_days: Drop entries older than this
+        strength_max_age_days: Per-strength maximum age, e.g. {'Weak': 7}
+    """
+
+    def __init__(self, max_entries: int = None, max_age_days: float = None,
+                 strength_max_age_days: Dict[str, float] = None):
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400 if max_age_days is not None else None
+        self.strength_max_age = {strength: days * 86400 for strength, days
+                                 in (strength_max_age_days or {}).items()}
+
+    def expired_at(self, strength: str, created, now: int) -> bool:
+        """True if an entry of this strength created at created is too old"""
+        limit = self.strength_max_age.get(strength, self.max_age)
+        return limit is not None and created is not None and now - created > limit
+
+    def expired(self, entry: Dict, now: int) -> bool:
+        """True if an entry is past its maximum age"""
+        return self.expired_at(entry.get('strength'), parse_timestamp(entry.get('created_at')), now)
+
+    def apply(self, entries: List[Dict], now: int = None) -> List[Dict]:
+        """Return the entries this policy keeps"""
+        now = local_now() if now is None else now
+        kept = [entry for entry in entries if not self.expired(entry, now)]
+        if self.max_entries is not None and len(kept) > self.max_entries:
+            kept = kept[len(kept) - self.max_entries:]
+        return kept
+
+
+class HistoryLog:
+    """
+    Compact list-like history that enforces a RetentionPolicy on append
+
+    Entries are stored column-wise: password and description strings in
+    lists, created_at as integer seconds in an array('q') and strength as
+    a one-byte code into STRENGTHS. Indexing and iteration build the
+    familiar entry dicts on the fly, so callers see the same view as
+    before; mutating a returned dict does not change the log. Entries
+    that do not fit the columns (extra keys, unknown strength, malformed
+    timestamp) are kept verbatim in an overflow column.
+
+    Every entry carries an integer 'id', unique and ascending in log
+    order. Loaded ids are kept; new entries, and entries whose id would
+    break the order, get the next free one. Ids stay stable while older
+    entries are dropped, so indexes such as password_search can refer to
+    entries by id.
+
+    Entries are kept oldest first. Dropping from the front only advances a
+    head offset; the columns are compacted once the dead prefix outgrows
+    the live part, so max_entries behaves as a ring buffer with O(1)
+    amortized appends. Age rules on the oldest entry are checked on every
+    append. Rules that can expire entries in the middle (per-strength
+    ages) are enforced by a sweep after every len/2 appends, which is also
+    O(1) amortized.
+
+    Mutations and snapshot() hold the log's lock, so a background writer
+    can copy the entries while another thread appends and compacts.
+    """
+
+    # Smallest dead prefix worth compacting
+    _COMPACT_MIN = 64
+
+    def __init__(self, entries=(), retention: RetentionPolicy = None):
+        self.retention = retention
+        self._ids = array('q')
+        self._next_id = 0
+        self._passwords: List[str] = []
+        self._descriptions: List[str] = []
+        self._created = array('q')
+        self._strengths = array('B')
+        # Original dict for entries that do not fit the columns, else None
+        self._overflow: List = []
+        self._start = 0
+        self._since_sweep = 0
+        self._lock = threading.Lock()
+        for entry in entries:
+            self._append(entry)
+        if retention is not None:
+            self._sweep(local_now())
+
+    def __len__(self):
+        return len(self._passwords) - self._start
+
+    def __iter__(self):
+        return map(self._row, range(self._start, len(self._passwords)))
+
+    def __reversed__(self):
+        return map(self._row, range(len(self._passwords) - 1, self._start - 1, -1))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(self._start + i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("History index out of range")
+        return self._row(self._start + index)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"HistoryLog({len(self)} entries)"
+
+    def _row(self, i: int) -> Dict:
+        """Entry dict for absolute row i"""
+        overflow = self._overflow[i]
+        if overflow is not None:
+            row = dict(overflow)
+            row['id'] = self._ids[i]
+            return row
+        return {
+            'id': self._ids[i],
+            'password': self._passwords[i],
+            'description': self._descriptions[i],
+            'created_at': format_timestamp(self._created[i]),
+            'strength': STRENGTHS[self._strengths[i]],
+        }
+
+    def _append(self, entry: Dict):
+        """Add one entry to the columns without enforcing retention"""
+        entry_id = entry.get('id')
+        if type(entry_id) is not int or entry_id < self._next_id:
+            entry_id = self._next_id
+        self._next_id = entry_id + 1
+
+        created = parse_timestamp(entry.get('created_at'))
+        code = _STRENGTH_CODES.get(entry.get('strength'))
+        keys = entry.keys()
+        fits = (created is not None and code is not None
+                and (keys == _ENTRY_KEYS or keys == _ENTRY_KEYS_WITH_ID)
+                and type(entry['password']) is str and type(entry['description']) is str)
+        self._ids.append(entry_id)
+        self._passwords.append(entry.get('password'))
+        self._descriptions.append(entry.get('description'))
+        self._created.append(UNDATED if created is None else created)
+        self._strengths.append(code if fits else 0)
+        if fits:
+            self._overflow.append(None)
+        else:
+            overflow = dict(entry)
+            overflow.pop('id', None)
+            self._overflow.append(overflow)
+
+    @property
+    def last_id(self) -> int:
+        """Id of the newest entry (-1 when empty)"""
+        return self._ids[-1] if len(self) else -1
+
+    def _row_of(self, entry_id: int):
+        """Absolute row holding entry_id, or None"""
+        i = bisect_left(self._ids, entry_id, self._start)
+        if i < len(self._ids) and self._ids[i] == entry_id:
+            return i
+        return None
+
+    def get(self, entry_id: int):
+        """Entry dict with the given id, or None if it is not in the log"""
+        i = self._row_of(entry_id)
+        return None if i is None else self._row(i)
+
+    def count_after(self, entry_id: int) -> int:
+        """Number of entries newer than entry_id"""
+        return len(self._ids) - bisect_right(self._ids, entry_id, self._start)
+
+    def _live_rows(self):
+        return range(self._start, len(self._ids))
+
+    def rows_between(self, start: int = None, end: int = None) -> List[int]:
+        """Absolute rows created in [start, end) (seconds, None = open)"""
+        created = self._created
+        return [i for i in self._live_rows() if created[i] != UNDATED
+                and (start is None or created[i] >= start) and (end is None or created[i] < end)]
+
+    def between(self, start: int = None, end: int = None) -> List[Dict]:
+        """Entries created in [start, end), oldest first"""
+        return [self._row(i) for i in self.rows_between(start, end)]
+
+    def remove_between(self, start: int = None, end: int = None) -> int:
+        """Delete entries created in [start, end); returns how many"""
+        with self._lock:
+            doomed = set(self.rows_between(start, end))
+            if doomed:
+                self._keep(i for i in self._live_rows() if i not in doomed)
+        return len(doomed)
+
+    def dedupe_keys(self) -> set:
+        """{(password, created seconds)} of every entry, for merging imports"""
+        rows = self._live_rows()
+        return {(self._passwords[i], self._created[i]) for i in rows}
+
+    def month_groups(self) -> Dict[str, List[int]]:
+        """Absolute rows grouped by segment key (see segment_key)"""
+        groups: Dict[str, List[int]] = {}
+        keys: Dict[int, str] = {}
+        created = self._created
+        for i in self._live_rows():
+            day = created[i] // 86400
+            key = keys.get(day)
+            if key is None:
+                key = keys[day] = segment_key(created[i])
+            groups.setdefault(key, []).append(i)
+        return groups
+
+    def rows(self, rows: List[int]) -> List[Dict]:
+        """Entry dicts for absolute rows"""
+        return [self._row(i) for i in rows]
+
+    def descriptions_after(self, entry_id: int):
+        """Yield (id, description) for every entry newer than entry_id"""
+        for i in range(bisect_right(self._ids, entry_id, self._start), len(self._ids)):
+            description = self._descriptions[i]
+            if self._overflow[i] is not None:
+                description = self._overflow[i].get('description')
+            yield self._ids[i], description if isinstance(description, str) else ''
+
+    def _expired(self, i: int, now: int) -> bool:
+        overflow = self._overflow[i]
+        if overflow is not None:
+            return self.retention.expired(overflow, now)
+        return self.retention.expired_at(STRENGTHS[self._strengths[i]], self._created[i], now)
+
+    def snapshot(self) -> List[Dict]:
+        """Consistent copy of every entry, safe against concurrent mutation"""
+        with self._lock:
+            return list(self)
+
+    def append(self, entry: Dict):
+        """Add an entry and enforce the retention policy"""
+        with self._lock:
+            self._append(entry)
+            if self.retention is not None:
+                self._enforce()
+
+    def extend(self, entries):
+        """Add several entries"""
+        for entry in entries:
+            self.append(entry)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._keep(range(0))
+            self._since_sweep = 0
+
+    def _keep(self, rows):
+        """Rebuild the columns from the given absolute rows"""
+        rows = list(rows)
+        self._ids = array('q', (self._ids[i] for i in rows))
+        self._passwords = [self._passwords[i] for i in rows]
+        self._descriptions = [self._descriptions[i] for i in rows]
+        self._created = array('q', (self._created[i] for i in rows))
+        self._strengths = array('B', (self._strengths[i] for i in rows))
+        self._overflow = [self._overflow[i] for i in rows]
+        self._start = 0
+
+    def _drop_oldest(self):
+        start = self._start
+        self._passwords[start] = self._descriptions[start] = self._overflow[start] = None
+        self._start = start = start + 1
+        if start >= self._COMPACT_MIN and start * 2 >= len(self._passwords):
+            for column in (self._ids, self._passwords, self._descriptions, self._created,
+                           self._strengths, self._overflow):
+                del column[:start]
+            self._start = 0
+
+    def _sweep(self, now: int):
+        """Apply every retention rule to the whole log"""
+        rows = [i for i in range(self._start, len(self._passwords)) if not self._expired(i, now)]
+        max_entries = self.retention.max_entries
+        if max_entries is not None and len(rows) > max_entries:
+            rows = rows[len(rows) - max_entries:]
+        if len(rows) != len(self):
+            self._keep(rows)
+        self._since_sweep = 0
+
+    def _enforce(self):
+        retention = self.retention
+        if retention.max_entries is not None:
+            while len(self) > retention.max_entries:
+                self._drop_oldest()
+
+        if retention.max_age is not None or retention.strength_max_age:
+            now = local_now()
+            while len(self) and self._expired(self._start, now):
+                self._drop_oldest()
+
+        if retention.strength_max_age:
+            self._since_sweep += 1
+            if self._since_sweep * 2 >= max(len(self), self._COMPACT_MIN):
+                self._sweep(now)
+
+
+class ShardedHistoryStore:
+    """
+    History split into one JSON segment per month plus a small manifest
+
+    Layout, beside the single-file history path:
+        password_history.json.d/manifest.json
+        password_history.json.d/2026-10.json
+        password_history.json.d/archive/2026-01.json.gz
+
+    The manifest lists each segment with its entry count and id range, so
+    save() rewrites only the segments whose contents changed (normally
+    just the current month), and range queries open only the segments
+    overlapping the range. Old months can be archived or dropped whole.
+    A single-file history at path is migrated into segments on first
+    use and then deleted; if the directory cannot be written, every
+    operation works on the single file instead.
+    """
+
+    def __init__(self, path: str = "password_history.json"):
+        self.path = path
+        self.directory = path + '.d'
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self._manifest = None
+
+    # Manifest
+
+    @property
+    def manifest(self) -> Dict:
+        """{'version': 1, 'segments': {key: {'file', 'count', 'first_id', 'last_id'}}}"""
+        if self._manifest is None:
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                self._manifest = {'version': 1, 'segments': {}}
+        return self._manifest
+
+    def _write_json(self, path: str, data, durable: bool):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _save_manifest(self, durable: bool = False):
+        self._write_json(self.manifest_path, self.manifest, durable)
+
+    def segments(self) -> List[str]:
+        """Segment keys in chronological order ('undated' first)"""
+        return sorted(self.manifest['segments'], key=lambda k: (k != 'undated', k))
+
+    def _segment_path(self, key: str) -> str:
+        return os.path.join(self.directory, self.manifest['segments'][key]['file'])
+
+    def load_segment(self, key: str) -> List[Dict]:
+        """Entries of one segment"""
+        try:
+            with open(self._segment_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _unmigrated(self) -> Optional[List[Dict]]:
+        """
+        Migrate a single-file history into segments on first use
+
+        Returns:
+            None once the history is sharded (or there is none), else the
+            single-file entries, when the segments could not be written
+
+        Raises:
+            ValueError: The single file does not parse; it is kept as is
+        """
+        if os.path.exists(self.manifest_path) or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"Cannot migrate {self.path}, it was left in place: {e}") from None
+        if not isinstance(entries, list):
+            raise ValueError(f"Cannot migrate {self.path}, it was left in place: not a list of entries")
+        # save() deletes the single file once the manifest is written
+        try:
+            self.save(HistoryLog(entries), durable=True)
+        except OSError:
+            pass
+        if os.path.exists(self.manifest_path):
+            return None
+        return entries
+
+    # HistoryStore interface
+
+    def load(self) -> List[Dict]:
+        """All entries, in id order"""
+        legacy = self._unmigrated()
+        if legacy is not None:
+            return legacy
+        return self._merge(self.segments())
+
+    def _merge(self, keys: List[str]) -> List[Dict]:
+        # Each segment is in id order; months need not be
+        segments = [self.load_segment(key) for key in keys]
+        return list(heapq.merge(*segments, key=lambda e: e.get('id', -1)))
+
+    def save(self, entries, durable: bool = False):
+        """
+        Write entries, rewriting only the segments that changed
+
+        Args:
+            entries: HistoryLog (grouped from its columns without building
+                every entry dict) or a list of entry dicts
+            durable: fsync every file written
+
+        Raises:
+            OSError: A durable write failed (other write failures are ignored)
+        """
+        if isinstance(entries, HistoryLog):
+            groups = entries.month_groups()
+            ids = entries._ids
+            signature = lambda rows: [len(rows), ids[rows[0]], ids[rows[-1]]]
+            materialize = entries.rows
+        else:
+            groups = {}
+            for entry in entries:
+                seconds = parse_timestamp(entry.get('created_at'))
+                groups.setdefault(segment_key(UNDATED if seconds is None else seconds), []).append(entry)
+            signature = lambda rows: [len(rows), rows[0].get('id'), rows[-1].get('id')]
+            materialize = list
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            manifest = self.manifest['segments']
+            changed = False
+            for key, rows in groups.items():
+                count, first_id, last_id = signature(rows)
+                meta = {'file': key + '.json', 'count': count, 'first_id': first_id, 'last_id': last_id}
+                if manifest.get(key) != meta or not os.path.exists(os.path.join(self.directory, meta['file'])):
+                    self._write_json(os.path.join(self.directory, meta['file']), materialize(rows), durable)
+                    manifest[key] = meta
+                    changed = True
+            for key in [k for k in manifest if k not in groups]:
+                self._remove(key)
+                changed = True
+            if changed or not os.path.exists(self.manifest_path):
+                self._save_manifest(durable)
+        except IOError:
+            if durable:
+                raise
+            return
+        # Every segment and the manifest were written, and entries is the
+        # whole history, so a single file is superseded
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def clear(self):
+        """Delete every active segment and any single-file history (archives are kept)"""
+        for key in list(self.manifest['segments']):
+            self._remove(key)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        self._manifest = None
+        HistoryStore(self.path).clear()
+
+    # Segment operations
+
+    def _remove(self, key: str):
+        path = self._segment_path(key)
+        if os.path.exists(path):
+            os.remove(path)
+        del self.manifest['segments'][key]
+
+    def _range_keys(self, start: int = None, end: int = None) -> List[str]:
+        """Dated segments that may hold entries created in [start, end)"""
+        first = segment_key(start) if start is not None else None
+        last = segment_key(end - 1) if end is not None else None
+        return [key for key in self.segments() if key != 'undated'
+                and (first is None or key >= first) and (last is None or key <= last)]
+
+    def load_range(self, start=None, end=None) -> List[Dict]:
+        """Entries created in [start, end), opening only overlapping segments"""
+        start, end = parse_bound(start), parse_bound(end)
+        legacy = self._unmigrated()
+        if legacy is not None:
+            return HistoryLog(legacy).between(start, end)
+        log = HistoryLog(self._merge(self._range_keys(start, end)))
+        return log.between(start, end)
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Every entry, one segment in memory at a time (months in order)"""
+        legacy = self._unmigrated()
+        if legacy is not None:
+            yield from legacy
+            return
+        for key in self.segments():
+            yield from self.load_segment(key)
+
+    def recent(self, count: int) -> List[Dict]:
+        """The newest count entries, opening segments newest first"""
+        legacy = self._unmigrated()
+        if legacy is not None:
+            return HistoryLog(legacy)[-count:] if count else []
+        entries: List[Dict] = []
+        for key in reversed(self.segments()):
+            if len(entries) >= count:
+                break
+            entries.extend(self.load_segment(key))
+        entries.sort(key=lambda e: e.get('id', -1))
+        return entries[len(entries) - count:] if count else []
+
+    def clear_range(self, start=None, end=None) -> int:
+        """
+        Delete entries created in [start, end)
+
+        Segments entirely inside the range are removed without reading
+        them; only the months at the edges are rewritten.
+
+        Returns:
+            Number of entries deleted
+        """
+        start, end = parse_bound(start), parse_bound(end)
+        legacy = self._unmigrated()
+        if legacy is not None:
+            log = HistoryLog(legacy)
+            removed = log.remove_between(start, end)
+            if removed:
+                HistoryStore(self.path).save(list(log), durable=True)
+            return removed
+        removed = 0
+        for key in self._range_keys(start, end):
+            log = HistoryLog(self.load_segment(key))
+            count = log.remove_between(start, end)
+            removed += count
+            if not len(log):
+                self._remove(key)
+            elif count:
+                self._write_json(self._segment_path(key), list(log), False)
+                self.manifest['segments'][key].update(
+                    count=len(log), first_id=log[0]['id'], last_id=log.last_id)
+        if removed:
+            self._save_manifest()
+        return removed
+
+    def drop_segment(self, key: str):
+        """Delete a whole month"""
+        self._unmigrated()
+        if key not in self.manifest['segments']:
+            raise ValueError(f"No history segment '{key}'")
+        self._remove(key)
+        self._save_manifest()
+
+    def archive_segment(self, key: str) -> str:
+        """
+        Move a month out of the active history into a gzip archive
+
+        Returns:
+            Path of the archive file
+        """
+        import gzip
+        self._unmigrated()
+        if key not in self.manifest['segments']:
+            raise ValueError(f"No history segment '{key}'")
+        archive_dir = os.path.join(self.directory, 'archive')
+        os.makedirs(archive_dir, exist_ok=True)
+        target = os.path.join(archive_dir, key + '.json.gz')
+        suffix = 1
+        while os.path.exists(target):
+            suffix += 1
+            target = os.path.join(archive_dir, f"{key}.{suffix}.json.gz")
+        with open(self._segment_path(key), 'rb') as src, gzip.open(target, 'wb') as dst:
+            dst.write(src.read())
+        self._remove(key)
+        self._save_manifest()
+        return target
+
+
+def compact_history(store: HistoryStore, retention: RetentionPolicy) -> Tuple[int, int]:
+    """
+    Offline compaction: rewrite the store without expired records
+
+    Returns:
+        (entries before, entries after)
+    """
+    entries = store.load()
+    kept = retention.apply(entries)
+    if len(kept) != len(entries):
+        store.save(kept, durable=True)
+    return len(entries), len(kept)
+
+
+class WriteBehindWriter:
+    """
+    Background writer that batches history saves
+
+    Saves only mark the history dirty. A daemon thread writes a snapshot
+    once flush_size saves are pending or flush_interval seconds have
+    passed since the first pending save, using one durable (fsync'd)
+    write per flush. Pending saves are flushed by flush(), close(),
+    leaving a with-block, and at interpreter exit. A failed flush keeps
+    its saves pending and records the error in last_error; the thread
+    warns and retries after flush_interval, flush() re-raises.
+
+    Args:
+        store: HistoryStore to write to
+        snapshot: Callable returning the entries to persist
+        flush_size: Pending saves that trigger an immediate flush
+        flush_interval: Maximum seconds a save waits before being written
+    """
+
+    def __init__(self, store: HistoryStore, snapshot: Callable[[], List[Dict]],
+                 flush_size: int = 100, flush_interval: float = 1.0):
+        self.store = store
+        self.snapshot = snapshot
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        self.last_error = None
+
+        self._pending = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        # Serialises writes between the thread and explicit flush() calls
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> 'WriteBehindWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Saves not yet written to disk"""
+        return self._pending
+
+    def notify(self):
+        """Record one save; wakes the writer when the batch is full"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("History writer is closed")
+            self._pending += 1
+            if self._pending == 1 or self._pending >= self.flush_size:
+                self._condition.notify()
+
+    def discard(self):
+        """Forget pending saves (the history was cleared)"""
+        with self._write_lock, self._condition:
+            self._pending = 0
+
+    def flush(self):
+        """Write pending saves now and wait for the write to finish"""
+        with self._write_lock:
+            with self._condition:
+                pending, self._pending = self._pending, 0
+            if not pending:
+                return
+            try:
+                self.store.save(self.snapshot(), durable=True)
+            except BaseException as e:
+                with self._condition:
+                    self._pending += pending
+                self.last_error = e
+                raise
+            self.flushes += 1
+
+    def close(self):
+        """Flush pending saves and stop the background thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Give the batch until the interval elapses to fill up
+                if self._pending < self.flush_size:
+                    self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                import warnings
+                warnings.warn(f"History write-behind flush failed, retrying: {e!r}", RuntimeWarning)
+                with self._condition:
+                    if not self._closed:
+                        self._condition.wait(self.flush_interval)
+
+
+def check_write_behind(interval: float = 0.05) -> List[str]:
+    """
+    Exercise WriteBehindWriter against a store whose writes fail
+
+    Returns:
+        Problems found (empty when failed saves stay pending)
+    """
+    import tempfile
+    import warnings
+    problems = []
+    with tempfile.TemporaryDirectory() as directory, warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        # The parent directory does not exist yet, so every write fails
+        parent = os.path.join(directory, 'missing')
+        store = HistoryStore(os.path.join(parent, 'history.json'))
+        entries = [{'password': 'secret', 'description': '', 'created_at': '', 'strength': 'Weak'}]
+        writer = WriteBehindWriter(store, lambda: entries, flush_size=1, flush_interval=interval)
+        try:
+            writer.notify()
+            time.sleep(interval * 4)
+            if writer.pending != 1 or writer.flushes:
+                problems.append(f"failed background flush dropped its save "
+                                f"(pending {writer.pending}, flushes {writer.flushes})")
+            if not isinstance(writer.last_error, OSError):
+                problems.append(f"last_error is {writer.last_error!r}, expected an OSError")
+            try:
+                writer.flush()
+                problems.append("flush() returned although the write failed")
+            except OSError:
+                pass
+            if writer.pending != 1:
+                problems.append("failed flush() did not keep its save pending")
+
+            # Once writes succeed again the pending save reaches the disk
+            os.mkdir(parent)
+            writer.flush()
+            if writer.pending or store.load() != entries:
+                problems.append("pending save was not written after the store recovered")
+        finally:
+            writer.discard()
+            writer.close()
+    return problems
+
+
+def main(argv=None) -> int:
+    """Entry point: exit code 0 when write-behind keeps failed saves"""
+    problems = check_write_behind()
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ History write-behind keeps failed saves pending")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
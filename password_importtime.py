@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Import-Time Regression Check
+Runs the CLI cold start under ``python -X importtime`` and fails if heavy
+modules sneak back into the one-shot generation path
+
+Usage: python password_importtime.py [--budget-ms N]
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules that a one-shot ``password_cli.py generate`` must never import
+FORBIDDEN_MODULES = (
+    'json', 'typing', 'tkinter', 'secrets', 'hashlib', 'string', 're',
+    'datetime', 'argparse', 'password_history',
+)
+
+# Cumulative import time allowed for password_cli (microseconds)
+DEFAULT_BUDGET_US = 25000
+
+# Python snippet executed in the child: exactly what the entry point does
+COLD_START_SNIPPET = (
+    "import password_cli, password_engine;"
+    "password_engine.PasswordGenerator().generate_password()"
+)
+
+
+def measure_imports(snippet: str = COLD_START_SNIPPET) -> Dict[str, Tuple[int, int]]:
+    """
+    Run snippet in a fresh interpreter with -X importtime
+
+    Returns:
+        Mapping of module name to (self_us, cumulative_us)
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', snippet],
+        cwd=here, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        modules[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return modules
+
+
+def check_cold_start(budget_us: int = DEFAULT_BUDGET_US) -> List[str]:
+    """Return a list of problems found in the CLI cold start (empty if clean)"""
+    modules = measure_imports()
+    problems = [f"forbidden module imported: {name}"
+                for name in FORBIDDEN_MODULES if name in modules]
+
+    cumulative = modules.get('password_cli', (0, 0))[1]
+    if cumulative > budget_us:
+        problems.append(f"password_cli import took {cumulative} us (budget {budget_us} us)")
+    return problems
+
+
+def main(argv=None) -> int:
+    """Entry point: exit code 0 when cold start is within limits"""
+    argv = sys.argv[1:] if argv is None else argv
+    budget_us = DEFAULT_BUDGET_US
+    if len(argv) == 2 and argv[0] == '--budget-ms':
+        budget_us = int(float(argv[1]) * 1000)
+
+    # Warm the bytecode cache so compilation is not counted
+    measure_imports()
+    problems = check_cold_start(budget_us)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ CLI cold start imports are minimal")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
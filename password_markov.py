@@ -0,0 +1,326 @@
+"""
+Pronounceable Password Module
+Character n-gram Markov model trained once on a wordlist and sampled
+with a secure RNG
+
+The model is a flat array of cumulative transition counts, one row of
+27 entries (word end + 26 letters) per context of ``order`` symbols.
+It can be saved to disk and memory-mapped back without parsing.
+
+The default model is trained on a real dictionary (PASSWORD_MARKOV_WORDLIST
+or the system word list), saved to the cache directory and memory-mapped
+from there on later runs; PASSWORD_MARKOV_MODEL points at a prebuilt model
+instead. A tiny wordlist makes the letters predictable, so lists under
+MIN_WORDLIST_WORDS are refused, and every password must reach
+MIN_ENTROPY_BITS under the model or it is drawn again.
+
+Build a model file: python password_markov.py WORDLIST [OUTPUT] [--order N]
+"""
+
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from password_random import secure_random
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# Symbol 0 marks the start/end of a word, letters are 1..26
+_BOUNDARY = 0
+_SYMBOLS = len(ALPHABET) + 1
+_SYMBOL_OF = {c: i + 1 for i, c in enumerate(ALPHABET)}
+
+# File header: magic, format version, order
+_MAGIC = b'PWMK'
+_VERSION = 1
+_HEADER = struct.Struct('<4sII')
+
+# Letters per password by default; with an order-2 model of an English
+# dictionary (about 3.3 bits per letter) this stays clear of the floor
+DEFAULT_LENGTH = 16
+
+# Passwords less surprising than this under the model are redrawn
+MIN_ENTROPY_BITS = 40.0
+
+# Draws allowed per password before the length is declared too short
+MAX_ATTEMPTS = 1000
+
+# Fewest distinct words the default model may be trained on
+MIN_WORDLIST_WORDS = 5000
+
+DEFAULT_ORDER = 2
+
+MODEL_ENV = 'PASSWORD_MARKOV_MODEL'
+WORDLIST_ENV = 'PASSWORD_MARKOV_WORDLIST'
+
+# System dictionaries tried when PASSWORD_MARKOV_WORDLIST is unset
+SYSTEM_WORDLISTS = ('/usr/share/dict/words', '/usr/dict/words')
+
+
+class MarkovModel:
+    """
+    Order-n character Markov model over lowercase letters
+
+    Args:
+        order: Number of preceding letters each transition depends on
+        table: Cumulative counts, _SYMBOLS entries per context
+    """
+
+    def __init__(self, order: int, table):
+        if order < 1:
+            raise ValueError("Model order must be at least 1")
+        if len(table) != _SYMBOLS ** order * _SYMBOLS:
+            raise ValueError("Transition table size does not match model order")
+        self.order = order
+        self.table = table
+        self._contexts = _SYMBOLS ** order
+        self._mmap = None
+        self._view = None
+
+    @classmethod
+    def train(cls, words: Iterable[str], order: int = 2) -> 'MarkovModel':
+        """Build a model from a wordlist (non-letters are ignored)"""
+        contexts = _SYMBOLS ** order
+        counts = array('I', bytes(4 * contexts * _SYMBOLS))
+        trained = 0
+        for word in words:
+            symbols = [_SYMBOL_OF[c] for c in word.lower() if c in _SYMBOL_OF]
+            if not symbols:
+                continue
+            trained += 1
+            context = 0
+            for symbol in symbols + [_BOUNDARY]:
+                counts[context * _SYMBOLS + symbol] += 1
+                context = (context * _SYMBOLS + symbol) % contexts
+        if not trained:
+            raise ValueError("Wordlist contains no usable words")
+
+        # Convert each row to cumulative counts for bisect sampling
+        for row in range(0, len(counts), _SYMBOLS):
+            running = 0
+            for i in range(row, row + _SYMBOLS):
+                running += counts[i]
+                counts[i] = running
+        return cls(order, counts)
+
+    def save(self, path: str):
+        """Write the model in its array form (little-endian uint32)"""
+        table = array('I', self.table)
+        if sys.byteorder != 'little':
+            table.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.order))
+            table.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> 'MarkovModel':
+        """Memory-map a saved model; the table is used in place"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, order = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or version != _VERSION:
+            mapped.close()
+            raise ValueError(f"{path} is not a Markov model file")
+
+        view = memoryview(mapped)[_HEADER.size:]
+        if sys.byteorder == 'little':
+            table = view.cast('I')
+            try:
+                model = cls(order, table)
+            except ValueError:
+                table.release()
+                view.release()
+                mapped.close()
+                raise
+            model._mmap = mapped
+            model._view = view
+            return model
+
+        table = array('I', view.tobytes())
+        table.byteswap()
+        view.release()
+        mapped.close()
+        return cls(order, table)
+
+    def _next(self, context: int, rng) -> Tuple[int, float]:
+        """Sample the next letter (never the word end) and its surprisal in bits"""
+        table = self.table
+        row = context * _SYMBOLS
+        ends = table[row]
+        total = table[row + _SYMBOLS - 1] - ends
+        r = ends + rng.randbelow(total)
+        symbol = bisect_right(table, r, row, row + _SYMBOLS) - row
+        count = table[row + symbol] - table[row + symbol - 1]
+        return symbol, math.log2(total / count)
+
+    def _sample(self, length: int, rng) -> Tuple[str, float]:
+        contexts = self._contexts
+        context = 0
+        letters = []
+        bits = 0.0
+        table = self.table
+        for _ in range(length):
+            row = context * _SYMBOLS
+            if table[row + _SYMBOLS - 1] == table[row]:
+                # Dead end (this context only ever ended words): start a new
+                # word. The choice is deterministic, so entropy stays exact
+                context = 0
+            symbol, surprisal = self._next(context, rng)
+            letters.append(ALPHABET[symbol - 1])
+            bits += surprisal
+            context = (context * _SYMBOLS + symbol) % contexts
+        return ''.join(letters), bits
+
+    def generate_with_entropy(self, length: int = DEFAULT_LENGTH, rng=None,
+                              min_entropy: float = MIN_ENTROPY_BITS) -> Tuple[str, float]:
+        """
+        Generate a pronounceable password of exactly length letters
+
+        Draws whose entropy falls under min_entropy are discarded and
+        drawn again, so no password is likelier than 2^-min_entropy
+        under the model.
+
+        Returns:
+            (password, entropy) where entropy is -log2 of the probability
+            of the unconditioned model producing exactly this password.
+            Rejection raises every accepted password's probability by
+            1 / P(accept), so this is an upper bound that overstates the
+            true figure by log2(1 / P(accept)); the bound is tight when
+            lengths are long enough that draws are rarely rejected.
+        """
+        if length < 4:
+            raise ValueError("Password length must be at least 4 characters")
+        rng = rng or secure_random
+        for _ in range(MAX_ATTEMPTS):
+            password, bits = self._sample(length, rng)
+            if bits >= min_entropy:
+                return password, bits
+        raise ValueError(f"{length} letters cannot reliably reach {min_entropy:g} bits "
+                         "with this model; use a longer length")
+
+    def generate(self, length: int = DEFAULT_LENGTH, rng=None) -> str:
+        """Generate a pronounceable password of exactly length letters"""
+        return self.generate_with_entropy(length, rng)[0]
+
+    def generate_many(self, count: int, length: int = DEFAULT_LENGTH, rng=None,
+                      min_entropy: float = MIN_ENTROPY_BITS) -> List[Tuple[str, float]]:
+        """Generate count (password, entropy) pairs"""
+        rng = rng or secure_random
+        generate = self.generate_with_entropy
+        return [generate(length, rng, min_entropy) for _ in range(count)]
+
+    def close(self):
+        """Release the memory map of a loaded model"""
+        if self._mmap is not None:
+            self.table.release()
+            self._view.release()
+            self._mmap.close()
+            self._mmap = self._view = None
+
+
+def _default_cache_dir() -> str:
+    return os.path.join(os.path.expanduser('~'), '.cache', 'password-generator')
+
+
+def read_wordlist(path: str) -> List[str]:
+    """Distinct lowercase words of a one-word-per-line file"""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return sorted({line.strip().lower() for line in f if line.strip()})
+
+
+def default_wordlist() -> str:
+    """Path of the wordlist the default model is trained on"""
+    path = os.environ.get(WORDLIST_ENV)
+    if path:
+        return path
+    for path in SYSTEM_WORDLISTS:
+        if os.path.isfile(path):
+            return path
+    raise ValueError(f"No wordlist for pronounceable passwords: set {WORDLIST_ENV} "
+                     f"to a dictionary file or {MODEL_ENV} to a built model")
+
+
+def train_wordlist(wordlist: str, order: int = DEFAULT_ORDER) -> MarkovModel:
+    """Model of a wordlist file, refusing lists too small to be unpredictable"""
+    words = read_wordlist(wordlist)
+    if len(words) < MIN_WORDLIST_WORDS:
+        raise ValueError(f"{wordlist} has {len(words)} words; at least "
+                         f"{MIN_WORDLIST_WORDS} are needed for unpredictable passwords")
+    return MarkovModel.train(words, order)
+
+
+def build_model(wordlist: str, output: str, order: int = DEFAULT_ORDER) -> MarkovModel:
+    """Train on a wordlist file and save the model to output"""
+    model = train_wordlist(wordlist, order)
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    model.save(tmp_path)
+    os.replace(tmp_path, output)
+    return model
+
+
+@lru_cache(maxsize=1)
+def default_model() -> MarkovModel:
+    """
+    Shared model: PASSWORD_MARKOV_MODEL if set, else the cached model of
+    the default wordlist (trained and written to the cache on first use)
+    """
+    path = os.environ.get(MODEL_ENV)
+    if path:
+        return MarkovModel.load(path)
+
+    import hashlib
+    wordlist = default_wordlist()
+    stat = os.stat(wordlist)
+    key = f"{os.path.abspath(wordlist)}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+    cache_dir = _default_cache_dir()
+    path = os.path.join(cache_dir, f"markov-v{_VERSION}-o{DEFAULT_ORDER}-{digest}.bin")
+    try:
+        return MarkovModel.load(path)
+    except (OSError, ValueError, TypeError, struct.error):
+        # Missing or unreadable cache: rebuild it
+        pass
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        build_model(wordlist, path)
+        return MarkovModel.load(path)
+    except OSError:
+        # Read-only cache: keep the model in memory for this process
+        return train_wordlist(wordlist)
+
+
+def main(argv=None) -> int:
+    """Entry point: build a model file from a wordlist"""
+    argv = sys.argv[1:] if argv is None else argv
+    order = DEFAULT_ORDER
+    paths = []
+    args = iter(argv)
+    try:
+        for arg in args:
+            if arg == '--order':
+                order = int(next(args))
+            else:
+                paths.append(arg)
+        if len(paths) not in (1, 2):
+            print("Usage: python password_markov.py WORDLIST [OUTPUT] [--order N]", file=sys.stderr)
+            return 2
+        output = paths[1] if len(paths) == 2 else 'password_markov.bin'
+        model = build_model(paths[0], output, order)
+    except (StopIteration, ValueError, OSError) as e:
+        print(f"❌ {e or 'missing value'}", file=sys.stderr)
+        return 1
+    sample, bits = model.generate_with_entropy()
+    model.close()
+    print(f"✅ Wrote {output} (order {order}); sample: {sample} ({bits:.1f} bits)")
+    print(f"   Use it with {MODEL_ENV}={os.path.abspath(output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Memory Scaling Harness
+Runs the main engine workloads at increasing scales under tracemalloc
+and reports peak and retained memory and allocation hotspots as JSON
+
+For every workload and scale, inputs are prepared first (untraced), then
+the workload runs with tracing on:
+
+- peak_bytes: highest traced memory while it ran
+- retained_bytes: traced memory still held right after it returned,
+  with its result (e.g. the loaded history) kept alive
+- leaked_bytes: traced memory still held once the result is dropped and
+  garbage collected (caches, module state)
+- hotspots: source lines holding the most retained memory
+
+With --baseline, a previous report is compared against and the exit code
+is non-zero when peak or retained memory grew past the tolerance, so the
+harness can gate CI.
+
+Usage: python password_memory.py [--scales N,N,...] [--workloads A,B,...]
+                                 [--top K] [--output FILE]
+                                 [--baseline FILE] [--tolerance T] [--quick]
+"""
+
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from password_engine import PasswordGenerator
+
+DEFAULT_SCALES = (1000, 10000, 100000)
+QUICK_SCALES = (1000, 10000)
+
+# Allocation hotspots reported per run
+DEFAULT_TOP = 5
+
+# Frames recorded per allocation (1 is enough for line hotspots)
+TRACE_FRAMES = 1
+
+# Relative growth over the baseline reported as a regression, plus an
+# absolute slack so tiny runs do not fail on allocator noise
+DEFAULT_TOLERANCE = 0.2
+_SLACK_BYTES = 64 * 1024
+
+# Untraced run before measuring, so imports and one-time caches are not
+# charged to the first scale
+WARMUP_SCALE = 100
+
+PASSWORD_LENGTH = 16
+
+
+def _history_entries(scale: int) -> List[Dict]:
+    """scale history entries spread over the last few years, oldest first"""
+    from password_history import format_timestamp, local_now
+    generator = PasswordGenerator()
+    passwords = generator.generate_bulk(scale, PASSWORD_LENGTH, separator=b'').passwords()
+    now = local_now()
+    step = max(1, 3 * 365 * 86400 // max(scale, 1))
+    return [{'password': password, 'description': f"account {i}",
+             'created_at': format_timestamp(now - (scale - i) * step), 'strength': 'Very Strong'}
+            for i, password in enumerate(passwords)]
+
+
+def _generator(workdir: str, sharded: bool = False) -> PasswordGenerator:
+    generator = PasswordGenerator(sharded=sharded)
+    generator.history_file = os.path.join(workdir, 'password_history.json')
+    return generator
+
+
+# Workloads: setup(scale, workdir) prepares inputs and returns the callable
+# measured; whatever that callable returns is kept alive for retained_bytes
+
+def setup_history_load(scale: int, workdir: str) -> Callable:
+    """Load a history file of scale entries into a generator"""
+    _generator(workdir).store.save(_history_entries(scale))
+
+    def run():
+        generator = _generator(workdir)
+        generator.history
+        return generator
+    return run
+
+
+def setup_history_save(scale: int, workdir: str) -> Callable:
+    """Save a loaded history of scale entries"""
+    generator = _generator(workdir)
+    generator.history = _history_entries(scale)
+
+    def run():
+        generator._save_history()
+    return run
+
+
+def setup_history_save_sharded(scale: int, workdir: str) -> Callable:
+    """Save one new entry on top of a sharded history of scale entries"""
+    generator = _generator(workdir, sharded=True)
+    generator.history = _history_entries(scale)
+    generator._save_history()
+
+    def run():
+        generator.save_to_history('Qz7!memory-check', 'memory harness')
+    return run
+
+
+def setup_bulk_generate(scale: int, workdir: str) -> Callable:
+    """Generate scale fixed-width passwords into one buffer"""
+    generator = PasswordGenerator()
+
+    def run():
+        return generator.generate_bulk(scale, PASSWORD_LENGTH)
+    return run
+
+
+def setup_audit(scale: int, workdir: str) -> Callable:
+    """Audit a file of scale passwords in this process"""
+    from password_audit import audit_file
+    path = os.path.join(workdir, 'passwords.txt')
+    PasswordGenerator().generate_bulk_to_file(path, scale, PASSWORD_LENGTH)
+
+    def run():
+        return audit_file(path, workers=0)
+    return run
+
+
+# name -> setup
+WORKLOADS = {
+    'history_load': setup_history_load,
+    'history_save': setup_history_save,
+    'history_save_sharded': setup_history_save_sharded,
+    'bulk_generate': setup_bulk_generate,
+    'audit': setup_audit,
+}
+
+# Allocations made by the tracing machinery itself
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _hotspots(snapshot, top: int) -> List[Dict]:
+    stats = snapshot.filter_traces(_IGNORED).statistics('lineno')
+    return [{'file': os.path.basename(stat.traceback[0].filename),
+             'line': stat.traceback[0].lineno,
+             'size_bytes': stat.size, 'count': stat.count}
+            for stat in stats[:top]]
+
+
+def warm_up(setup: Callable, scale: int = WARMUP_SCALE):
+    """Run a workload once without tracing"""
+    workdir = tempfile.mkdtemp(prefix='password-memory-')
+    try:
+        setup(scale, workdir)()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def measure(setup: Callable, scale: int, top: int = DEFAULT_TOP) -> Dict:
+    """Run one workload at one scale and return its memory figures"""
+    workdir = tempfile.mkdtemp(prefix='password-memory-')
+    try:
+        run = setup(scale, workdir)
+        gc.collect()
+        tracemalloc.start(TRACE_FRAMES)
+        try:
+            start = time.perf_counter()
+            result = run()
+            seconds = time.perf_counter() - start
+            retained, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            del result
+            gc.collect()
+            leaked = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del run
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'scale': scale,
+        'seconds': round(seconds, 4),
+        'peak_bytes': peak,
+        'retained_bytes': retained,
+        'leaked_bytes': leaked,
+        'retained_per_item': round(retained / scale, 1) if scale else None,
+        'hotspots': _hotspots(snapshot, top),
+    }
+
+
+def run_harness(scales=DEFAULT_SCALES, workloads=None, top: int = DEFAULT_TOP) -> Dict:
+    """Measure every selected workload at every scale"""
+    names = list(workloads or WORKLOADS)
+    unknown = [name for name in names if name not in WORKLOADS]
+    if unknown:
+        raise ValueError(f"Unknown workload(s): {', '.join(unknown)} "
+                         f"(expected: {', '.join(WORKLOADS)})")
+    report = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'scales': list(scales),
+        'workloads': {},
+    }
+    for name in names:
+        warm_up(WORKLOADS[name])
+        runs = [measure(WORKLOADS[name], scale, top) for scale in scales]
+        first, last = runs[0], runs[-1]
+        growth = None
+        if last['scale'] != first['scale']:
+            growth = round((last['retained_bytes'] - first['retained_bytes'])
+                           / (last['scale'] - first['scale']), 1)
+        report['workloads'][name] = {
+            'description': WORKLOADS[name].__doc__,
+            'retained_bytes_per_item': growth,
+            'runs': runs,
+        }
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Regressions of report against baseline (same workload and scale)"""
+    problems = []
+    for name, workload in report['workloads'].items():
+        old_runs = {run['scale']: run for run in
+                    baseline.get('workloads', {}).get(name, {}).get('runs', [])}
+        for run in workload['runs']:
+            old = old_runs.get(run['scale'])
+            if old is None:
+                continue
+            for key in ('peak_bytes', 'retained_bytes'):
+                limit = old[key] * (1 + tolerance) + _SLACK_BYTES
+                if run[key] > limit:
+                    problems.append(f"{name} at {run['scale']}: {key} {run[key]} "
+                                    f"> {old[key]} (+{tolerance:.0%})")
+    return problems
+
+
+def main(argv=None) -> int:
+    """Entry point: print or write the JSON report; exit 1 on regressions"""
+    argv = sys.argv[1:] if argv is None else argv
+    scales, workloads, top = DEFAULT_SCALES, None, DEFAULT_TOP
+    output = baseline_path = None
+    tolerance = DEFAULT_TOLERANCE
+    args = iter(argv)
+    try:
+        for arg in args:
+            if arg == '--scales':
+                scales = tuple(int(n) for n in next(args).split(','))
+            elif arg == '--workloads':
+                workloads = next(args).split(',')
+            elif arg == '--top':
+                top = int(next(args))
+            elif arg == '--output':
+                output = next(args)
+            elif arg == '--baseline':
+                baseline_path = next(args)
+            elif arg == '--tolerance':
+                tolerance = float(next(args))
+            elif arg == '--quick':
+                scales = QUICK_SCALES
+            else:
+                print(f"Unknown argument: {arg}", file=sys.stderr)
+                return 2
+        report = run_harness(scales, workloads, top)
+    except (StopIteration, ValueError) as e:
+        print(f"Invalid arguments: {e or 'missing value'}", file=sys.stderr)
+        return 2
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            problems = compare(report, json.load(f), tolerance)
+        for problem in problems:
+            print(f"❌ {problem}", file=sys.stderr)
+        if problems:
+            return 1
+        print("✅ No memory regressions against the baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+NumPy Generation Backend
+Vectorized batch generation of same-length passwords as a 2D byte array
+
+NumPy is optional. When it is not installed every function here falls
+back to the pure Python bulk path in password_bulk.
+"""
+
+from typing import List, Sequence
+
+from password_random import secure_random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+
+def _draw_indices(lookup, limit: int, size: int, rng):
+    """Return size unbiased pool bytes using vectorized rejection sampling"""
+    out = np.empty(size, dtype=np.uint8)
+    filled = 0
+    while filled < size:
+        need = size - filled
+        raw = np.frombuffer(rng.randbytes(need * 256 // limit + 64), dtype=np.uint8)
+        raw = raw[raw < limit]
+        take = min(raw.size, need)
+        out[filled:filled + take] = lookup[raw[:take]]
+        filled += take
+    return out
+
+
+def generate_batch_numpy(count: int, length: int, pool: str,
+                         required: Sequence[str] = (), rng=None):
+    """
+    Generate a batch with NumPy
+
+    Returns:
+        uint8 array of shape (count, length), one ASCII password per row.
+        Rows missing a required class are redrawn, so every row is uniform
+        over the passwords that contain each required class.
+    """
+    if not HAVE_NUMPY:
+        raise ImportError("NumPy is not installed")
+    rng = rng or secure_random
+
+    chars = np.frombuffer(pool.encode('ascii'), dtype=np.uint8)
+    n = chars.size
+    if not 0 < n <= 256 or np.unique(chars).size != n:
+        raise ValueError("Pool must hold 1-256 distinct ASCII characters")
+    if length < len(required):
+        raise ValueError("Length is shorter than the number of required classes")
+
+    # Byte value -> pool character for every accepted value
+    limit = 256 - 256 % n
+    lookup = np.zeros(256, dtype=np.uint8)
+    lookup[:limit] = chars[np.arange(limit) % n]
+
+    batch = _draw_indices(lookup, limit, count * length, rng).reshape(count, length)
+    if not required or count == 0:
+        return batch
+
+    masks = []
+    for class_chars in required:
+        mask = np.zeros(256, dtype=bool)
+        mask[np.frombuffer(class_chars.encode('ascii'), dtype=np.uint8)] = True
+        masks.append(mask)
+
+    rows = np.arange(count)
+    while rows.size:
+        subset = batch[rows]
+        valid = np.ones(rows.size, dtype=bool)
+        for mask in masks:
+            valid &= mask[subset].any(axis=1)
+        rows = rows[~valid]
+        if rows.size:
+            batch[rows] = _draw_indices(lookup, limit, rows.size * length, rng).reshape(-1, length)
+    return batch
+
+
+def generate_batch(count: int, length: int, pool: str, required: Sequence[str] = (),
+                   backend: str = 'auto', rng=None, start: int = None):
+    """
+    Generate a batch with the fastest available backend
+
+    Args:
+        backend: 'numpy', 'python' or 'auto' (NumPy when installed)
+        start: Index of the first record, for slices of a deterministic run
+
+    With a deterministic test RNG the records always come from the per
+    record substreams of the Python path, so every backend returns the
+    same bytes for the same seed.
+
+    Returns:
+        NumPy uint8 array (count, length), or with the Python backend a
+        password_bulk.PasswordBuffer of unseparated fixed-width records
+    """
+    if backend not in ('auto', 'numpy', 'python'):
+        raise ValueError(f"Unknown backend '{backend}'")
+    use_numpy = backend == 'numpy' or (backend == 'auto' and HAVE_NUMPY)
+    if use_numpy and not (rng and rng.deterministic):
+        return generate_batch_numpy(count, length, pool, required, rng)
+    if use_numpy and not HAVE_NUMPY:
+        raise ImportError("NumPy is not installed")
+
+    from password_bulk import generate_buffer
+    records = generate_buffer(count, length, pool, required, separator=b'', rng=rng, start=start)
+    if use_numpy:
+        return np.frombuffer(records.view, dtype=np.uint8).reshape(count, length).copy()
+    return records
+
+
+def to_strings(batch) -> List[str]:
+    """Decode a batch from either backend into a list of str"""
+    if HAVE_NUMPY and isinstance(batch, np.ndarray):
+        length = batch.shape[1] if batch.ndim == 2 else 0
+        data = np.ascontiguousarray(batch).tobytes().decode('ascii')
+        return [data[i:i + length] for i in range(0, len(data), length)] if length else []
+    return batch.passwords()
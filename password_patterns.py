@@ -0,0 +1,198 @@
+"""
+Password Pattern Detection Module
+Finds keyboard walks (QWERTY, AZERTY, numeric keypad), alphabetic and
+numeric sequences, and repeats in linear time
+
+Keyboard adjacency graphs are precomputed when the module is imported.
+Each key gets half-unit coordinates: keys in a row are 2 apart and every
+row is shifted by its stagger, so on staggered keyboards two keys are
+adjacent when they are neighbours in a row or 1 apart in neighbouring
+rows, and on the keypad grid the diagonals count too. Shifted characters
+map to their base key, so 'QWE' and '!@#' are walks as well.
+"""
+
+from typing import Dict, List
+
+# Shortest sequence or repeat reported as a pattern
+MIN_LENGTH = 3
+# Shortest keyboard walk reported: with three layouts, random strong
+# passwords contain 3-key walks far too often for them to mean anything
+MIN_WALK_LENGTH = 4
+
+# Maximum strength score penalty, reached when patterns cover the password
+MAX_PENALTY = 50
+
+# name -> (staggered, rows); each row is (x offset, unshifted keys, shifted keys)
+LAYOUTS = {
+    'qwerty': (True, (
+        (0, "`1234567890-=", "~!@#$%^&*()_+"),
+        (3, "qwertyuiop[]\\", "QWERTYUIOP{}|"),
+        (4, "asdfghjkl;'", 'ASDFGHJKL:"'),
+        (5, "zxcvbnm,./", "ZXCVBNM<>?"),
+    )),
+    'azerty': (True, (
+        (0, "²&é\"'(-è_çà)=", "³1234567890°+"),
+        (3, "azertyuiop^$", "AZERTYUIOP¨£"),
+        (4, "qsdfghjklmù*", "QSDFGHJKLM%µ"),
+        (3, "<wxcvbn,;:!", ">WXCVBN?./§"),
+    )),
+    'keypad': (False, (
+        (0, "/*-", ""),
+        (0, "789", ""),
+        (0, "456", ""),
+        (0, "123", ""),
+        (0, "0.", ""),
+    )),
+}
+
+
+def _build_graph(staggered: bool, rows) -> Dict[str, frozenset]:
+    """Character -> characters on adjacent keys (shifted or not)"""
+    keys = {}
+    for r, (offset, plain, shifted) in enumerate(rows):
+        for i, char in enumerate(plain):
+            position = (r, offset + 2 * i)
+            keys.setdefault(char, position)
+            if i < len(shifted):
+                keys.setdefault(shifted[i], position)
+
+    reach = 1 if staggered else 2
+    by_position: Dict[tuple, List[str]] = {}
+    for char, position in keys.items():
+        by_position.setdefault(position, []).append(char)
+
+    graph = {}
+    for char, (r, x) in keys.items():
+        neighbours = []
+        for (r2, x2), chars in by_position.items():
+            same_row = r2 == r and abs(x2 - x) == 2
+            next_row = abs(r2 - r) == 1 and abs(x2 - x) <= reach
+            if same_row or next_row:
+                neighbours.extend(chars)
+        graph[char] = frozenset(neighbours)
+    return graph
+
+
+# Precomputed adjacency graphs
+GRAPHS = {name: _build_graph(staggered, rows) for name, (staggered, rows) in LAYOUTS.items()}
+# Every adjacent two-key string per layout, for set-membership scans
+PAIRS = {name: frozenset(a + b for a, near in graph.items() for b in near)
+         for name, graph in GRAPHS.items()}
+_ANY_PAIR = frozenset().union(*PAIRS.values())
+
+# Sequence alphabets: 1 for digits, 2 for (lower-cased) ASCII letters
+_ALPHABET = dict.fromkeys('0123456789', 1)
+_ALPHABET.update(dict.fromkeys('abcdefghijklmnopqrstuvwxyz', 2))
+
+# Feedback shown for each kind of pattern
+FEEDBACK = {
+    'keyboard': "Avoid keyboard patterns like 'qwerty' or '1qaz'",
+    'sequence': "Avoid sequences like 'abc' or '123'",
+    'repeat': "Avoid repeated characters or chunks like 'aaa' or 'abab'",
+}
+
+
+class PatternMatch:
+    """One detected pattern: password[start:end]"""
+
+    __slots__ = ('kind', 'start', 'end', 'token', 'detail')
+
+    def __init__(self, kind: str, start: int, end: int, token: str, detail: str = ''):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.token = token
+        self.detail = detail
+
+    def __repr__(self):
+        detail = f", {self.detail}" if self.detail else ''
+        return f"PatternMatch({self.kind}, {self.token!r}{detail})"
+
+    def to_dict(self) -> Dict:
+        return {'kind': self.kind, 'token': self.token, 'start': self.start,
+                'end': self.end, 'detail': self.detail}
+
+
+def _runs(links: List[bool], min_length: int = MIN_LENGTH):
+    """(start, end) of maximal runs of characters joined by links[i] (i -> i+1)"""
+    start = 0
+    for i, linked in enumerate(links):
+        if not linked:
+            if i + 1 - start >= min_length:
+                yield start, i + 1
+            start = i + 1
+    if len(links) + 1 - start >= min_length:
+        yield start, len(links) + 1
+
+
+def keyboard_walks(password: str) -> List[PatternMatch]:
+    """Runs of characters on adjacent keys of any layout"""
+    pairs = [password[i:i + 2] for i in range(len(password) - 1)]
+    # Any walk needs MIN_WALK_LENGTH - 1 consecutive adjacent pairs in some layout
+    links = [pair in _ANY_PAIR for pair in pairs]
+    if not any(True for _ in _runs(links, MIN_WALK_LENGTH)):
+        return []
+    matches = []
+    for name, layout_pairs in PAIRS.items():
+        links = [pair in layout_pairs for pair in pairs]
+        for start, end in _runs(links, MIN_WALK_LENGTH):
+            matches.append(PatternMatch('keyboard', start, end, password[start:end], name))
+    return matches
+
+
+def sequences(password: str) -> List[PatternMatch]:
+    """Ascending or descending alphabetic and numeric runs (abc, 987)"""
+    lowered = password.lower()
+    kinds = [_ALPHABET.get(c, 0) for c in lowered]
+    codes = [ord(c) for c in lowered]
+    matches = []
+    for direction, name in ((1, 'ascending'), (-1, 'descending')):
+        links = [kinds[i] and kinds[i] == kinds[i + 1] and codes[i + 1] - codes[i] == direction
+                 for i in range(len(password) - 1)]
+        if links.count(True) < MIN_LENGTH - 1:
+            continue
+        for start, end in _runs(links):
+            matches.append(PatternMatch('sequence', start, end, password[start:end], name))
+    return matches
+
+
+def repeats(password: str, max_unit: int = 3) -> List[PatternMatch]:
+    """Runs of one character (aaa) or of a short repeated chunk (abab)"""
+    matches = []
+    for unit in range(1, max_unit + 1):
+        # same[i]: password[i] repeats unit characters later
+        same = [password[i] == password[i + unit] for i in range(len(password) - unit)]
+        span = max(MIN_LENGTH, 2 * unit)
+        if same.count(True) < span - unit:
+            continue
+        # A run of k True values covers k + unit characters
+        for start, end in _runs(same, span - unit + 1):
+            end += unit - 1
+            if unit == 1 or len(set(password[start:start + unit])) > 1:
+                matches.append(PatternMatch('repeat', start, end, password[start:end], f"unit {unit}"))
+    return matches
+
+
+def find_patterns(password: str) -> List[PatternMatch]:
+    """
+    All patterns in a password, ordered by position
+
+    Matches contained in a longer match of the same kind are dropped.
+    """
+    found = keyboard_walks(password) + sequences(password) + repeats(password)
+    found.sort(key=lambda m: (m.start, -(m.end - m.start)))
+    kept: List[PatternMatch] = []
+    for match in found:
+        if not any(k.kind == match.kind and k.start <= match.start and match.end <= k.end for k in kept):
+            kept.append(match)
+    return kept
+
+
+def pattern_penalty(password: str, matches: List[PatternMatch]) -> int:
+    """Score penalty proportional to the share of the password in patterns"""
+    if not matches or not password:
+        return 0
+    covered = set()
+    for match in matches:
+        covered.update(range(match.start, match.end))
+    return round(MAX_PENALTY * len(covered) / len(password))
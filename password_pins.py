@@ -0,0 +1,319 @@
+"""
+PIN Screening Module
+Denylist of guessable PINs (common, repeated, sequential, date-shaped)
+as a bitset over the whole 10^k PIN space
+
+For PINs of up to 8 digits each candidate is screened by one bit test.
+The bitset for k digits holds 10^k bits (12.5 MB for k = 8); lengths of
+7 and 8 digits are cached on disk and memory-mapped on later runs. Longer
+PINs are screened with the same rules evaluated directly.
+"""
+
+import mmap
+import os
+from array import array
+from functools import lru_cache
+from typing import List
+
+from password_random import secure_random
+
+# Longest PIN covered by a bitset
+MAX_BITSET_LENGTH = 8
+
+# Bitsets this long or longer are cached on disk
+_CACHE_MIN_LENGTH = 7
+
+# Bump when the rules change so stale caches are ignored
+_RULES_VERSION = 1
+
+# array typecode of an unsigned 32-bit integer (C unsigned int or long)
+_WORD_TYPECODE = next(code for code in 'IL' if array(code).itemsize == 4)
+
+# Widely reused PINs that no structural rule below catches, mostly
+# keypad shapes (columns, diagonals, crosses) and popular picks
+COMMON_PINS = frozenset((
+    '1004', '2580', '0852', '1470', '0741', '3690', '0963', '1478', '8741',
+    '2369', '9632', '1397', '7931', '1379', '3179', '7913', '1590', '6969',
+    '4200', '1998', '0007', '1984', '2468', '1357', '5683', '1212', '7777',
+    '1337', '0911', '0420', '2525', '0101', '8520', '0258', '4321', '9876',
+    '147258', '258369', '147852', '159357', '159753', '789456', '456123',
+    '741852', '963852', '123654', '321654', '102030', '112233', '123321',
+    '654321', '696969', '131313', '520520', '110110', '007007', '246810',
+    '12345678', '87654321', '14725836', '25802580', '13579246', '11223344',
+    '12341234', '43214321', '20202020', '19191919', '78963214', '74108520',
+))
+
+# Days per month (February allows the 29th)
+_MONTH_DAYS = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Year ranges considered date-like for four-digit years
+_YEARS = range(1900, 2100)
+
+
+def _default_cache_dir() -> str:
+    return os.environ.get('PASSWORD_PIN_CACHE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'password-generator')
+
+
+# Rules: each has a predicate (any length) and a generator of every
+# matching PIN of length k, used to build the bitset. They must agree.
+
+def is_repeated(pin: str) -> bool:
+    """Periodic PINs such as 0000, 1212, 123123"""
+    k = len(pin)
+    return any(pin == (pin[:p] * k)[:k] for p in range(1, k // 2 + 1))
+
+
+def _repeated(k: int):
+    for p in range(1, k // 2 + 1):
+        for n in range(10 ** p):
+            unit = f"{n:0{p}d}"
+            yield (unit * k)[:k]
+
+
+# Steps between consecutive digits (mod 10) that read as a sequence
+_STEPS = (1, 2, 8, 9)
+
+
+def _is_step_sequence(digits: str) -> bool:
+    steps = {(int(b) - int(a)) % 10 for a, b in zip(digits, digits[1:])}
+    return len(steps) == 1 and steps.pop() in _STEPS
+
+
+def is_sequential(pin: str) -> bool:
+    """Runs such as 1234, 9876, 7890, 2468, and doubled runs like 112233"""
+    if _is_step_sequence(pin):
+        return True
+    k = len(pin)
+    if k % 2 or any(pin[i] != pin[i + 1] for i in range(0, k, 2)):
+        return False
+    return _is_step_sequence(pin[::2])
+
+
+def _sequential(k: int):
+    for start in range(10):
+        for step in _STEPS:
+            yield ''.join(str((start + step * i) % 10) for i in range(k))
+            if k % 2 == 0:
+                half = [str((start + step * i) % 10) for i in range(k // 2)]
+                yield ''.join(d + d for d in half)
+
+
+def _valid_day(day: int, month: int) -> bool:
+    return 1 <= month <= 12 and 1 <= day <= _MONTH_DAYS[month - 1]
+
+
+def _date_layouts(k: int):
+    """(day, month, year) slices and year digits for each layout of length k"""
+    if k == 4:
+        return ((slice(2, 4), slice(0, 2), None, 0), (slice(0, 2), slice(2, 4), None, 0),
+                (None, None, slice(0, 4), 4))
+    if k == 6:
+        return ((slice(0, 2), slice(2, 4), slice(4, 6), 2), (slice(2, 4), slice(0, 2), slice(4, 6), 2),
+                (slice(4, 6), slice(2, 4), slice(0, 2), 2), (None, slice(0, 2), slice(2, 6), 4),
+                (None, slice(4, 6), slice(0, 4), 4))
+    if k == 8:
+        return ((slice(0, 2), slice(2, 4), slice(4, 8), 4), (slice(2, 4), slice(0, 2), slice(4, 8), 4),
+                (slice(6, 8), slice(4, 6), slice(0, 4), 4))
+    return ()
+
+
+def is_date(pin: str) -> bool:
+    """Dates: MMDD/DDMM/YYYY, DDMMYY-style, MMYYYY, DDMMYYYY-style"""
+    for day, month, year, year_digits in _date_layouts(len(pin)):
+        if year_digits == 4 and int(pin[year]) not in _YEARS:
+            continue
+        if month is None:
+            return True
+        if day is None and 1 <= int(pin[month]) <= 12:
+            return True
+        if day is not None and _valid_day(int(pin[day]), int(pin[month])):
+            return True
+    return False
+
+
+def _dates(k: int):
+    days = [(d, m) for m in range(1, 13) for d in range(1, _MONTH_DAYS[m - 1] + 1)]
+    for day, month, year, year_digits in _date_layouts(k):
+        if year_digits == 4:
+            years = [f"{y:04d}" for y in _YEARS]
+        elif year_digits == 2:
+            years = [f"{y:02d}" for y in range(100)]
+        else:
+            years = ['']
+        for y in years:
+            if month is None:
+                yield y
+                continue
+            for d, m in (days if day is not None else [(None, m) for m in range(1, 13)]):
+                pin = [''] * k
+                fields = ((month, f"{m:02d}"), (year, y)) + (((day, f"{d:02d}"),) if day is not None else ())
+                for where, text in fields:
+                    if where is not None:
+                        pin[where.start] = text
+                yield ''.join(pin)
+
+
+def is_common(pin: str) -> bool:
+    """Listed in COMMON_PINS"""
+    return pin in COMMON_PINS
+
+
+# name -> (predicate, generator)
+RULES = {
+    'common': (is_common, lambda k: (p for p in COMMON_PINS if len(p) == k)),
+    'repeated': (is_repeated, _repeated),
+    'sequential': (is_sequential, _sequential),
+    'date': (is_date, _dates),
+}
+
+
+def pin_weaknesses(pin: str) -> List[str]:
+    """Names of the rules a PIN breaks (empty if it is acceptable)"""
+    return [name for name, (predicate, _) in RULES.items() if predicate(pin)]
+
+
+class PinDenylist:
+    """
+    Bitset over all k-digit PINs; bit n set means PIN n is denied
+
+    Args:
+        length: PIN length (1-8)
+        bits: bytes-like bitset of ceil(10^k / 8) bytes, little-endian bit
+            order within each byte; built from RULES when None
+    """
+
+    def __init__(self, length: int, bits=None):
+        if not 1 <= length <= MAX_BITSET_LENGTH:
+            raise ValueError(f"Bitsets cover PINs of 1-{MAX_BITSET_LENGTH} digits")
+        self.length = length
+        self.size = 10 ** length
+        self.bits = bits if bits is not None else self._build(length)
+        self._allowed = None
+        self._mmap = None
+
+    @staticmethod
+    def _build(length: int) -> bytearray:
+        size = 10 ** length
+        bits = bytearray((size + 7) // 8)
+        for _, generate in RULES.values():
+            for pin in generate(length):
+                n = int(pin)
+                bits[n >> 3] |= 1 << (n & 7)
+        # Padding past 10^k counts as denied so the allowed count is exact
+        for n in range(size, len(bits) * 8):
+            bits[n >> 3] |= 1 << (n & 7)
+        return bits
+
+    @classmethod
+    def open(cls, length: int, cache_dir: str = None) -> 'PinDenylist':
+        """
+        Denylist for length, memory-mapped from the on-disk cache for long
+        PINs (built and written there on first use)
+        """
+        if length < _CACHE_MIN_LENGTH:
+            return cls(length)
+        cache_dir = cache_dir or _default_cache_dir()
+        path = os.path.join(cache_dir, f"pin-denylist-v{_RULES_VERSION}-{length}.bin")
+        expected = (10 ** length + 7) // 8
+        try:
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == expected:
+                    denylist = cls(length, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                    denylist._mmap = denylist.bits
+                    return denylist
+        except OSError:
+            pass
+
+        denylist = cls(length)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(denylist.bits)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+        return denylist
+
+    def close(self):
+        """Release the memory map, if any"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def denied_index(self, n: int) -> bool:
+        """True if PIN number n is denied"""
+        return bool(self.bits[n >> 3] >> (n & 7) & 1)
+
+    def __contains__(self, pin: str) -> bool:
+        """pin in denylist: True if the PIN is denied"""
+        return len(pin) == self.length and pin.isdigit() and self.denied_index(int(pin))
+
+    @property
+    def allowed(self) -> int:
+        """Number of allowed PINs"""
+        if self._allowed is None:
+            zeros = bytes(8 - bin(b).count('1') for b in range(256))
+            self._allowed = sum(bytes(self.bits).translate(zeros))
+        return self._allowed
+
+
+@lru_cache(maxsize=None)
+def denylist(length: int) -> PinDenylist:
+    """Shared denylist for PINs of length digits"""
+    return PinDenylist.open(length)
+
+
+def is_allowed(pin: str) -> bool:
+    """True if a PIN passes screening"""
+    if len(pin) <= MAX_BITSET_LENGTH:
+        return pin not in denylist(len(pin))
+    return not pin_weaknesses(pin)
+
+
+def generate_pin(length: int, rng=None) -> str:
+    """One screened PIN, uniform over the allowed PINs of length digits"""
+    rng = rng or secure_random
+    if length <= MAX_BITSET_LENGTH:
+        bits = denylist(length)
+        while True:
+            n = rng.randbelow(bits.size)
+            if not bits.denied_index(n):
+                return f"{n:0{length}d}"
+    while True:
+        pin = ''.join(rng.choice('0123456789') for _ in range(length))
+        if not pin_weaknesses(pin):
+            return pin
+
+
+def generate_pins(count: int, length: int, rng=None) -> List[str]:
+    """
+    count screened PINs, uniform over the allowed PINs
+
+    Up to 8 digits, candidates are cut from one bulk random buffer as
+    32-bit words; words past the largest multiple of 10^k and denied PINs
+    are dropped by a single comprehension, so rejections cost one bit
+    test each instead of a call per retry. A deterministic test RNG takes
+    the generate_pin() loop instead, so the PINs match the equivalent
+    sequence of single calls.
+    """
+    rng = rng or secure_random
+    if length > MAX_BITSET_LENGTH or rng.deterministic:
+        return [generate_pin(length, rng) for _ in range(count)]
+    bits = denylist(length)
+    size = bits.size
+    limit = (1 << 32) - (1 << 32) % size
+    keep = bits.bits
+    # Expected draws per accepted PIN, with a little headroom
+    ratio = (1 << 32) / limit * size / bits.allowed
+
+    pins: List[str] = []
+    while len(pins) < count:
+        need = count - len(pins)
+        words = array(_WORD_TYPECODE, rng.randbytes(4 * (int(need * ratio * 1.02) + 16)))
+        candidates = [w % size for w in words if w < limit]
+        pins.extend(f"{n:0{length}d}" for n in candidates
+                    if not keep[n >> 3] >> (n & 7) & 1)
+    del pins[count:]
+    return pins
@@ -0,0 +1,400 @@
+"""
+Password Policy Module
+Declarative password policies compiled into constraint-aware generators
+"""
+
+from functools import lru_cache
+from typing import List, Dict, Tuple
+
+from password_engine import PasswordGenerator
+from password_random import secure_random
+from password_sampling import AliasTable
+
+# Fresh starts allowed when sampling runs into a dead end before the
+# policy is declared unsatisfiable
+_MAX_RESTARTS = 100
+
+# Class name -> (singular, plural) noun used in violation messages
+_CLASS_NOUNS = {
+    'lowercase': ('lowercase letter', 'lowercase letters'),
+    'uppercase': ('uppercase letter', 'uppercase letters'),
+    'digits': ('digit', 'digits'),
+    'special': ('special character', 'special characters'),
+    'custom': ('custom character', 'custom characters'),
+}
+
+
+class PasswordPolicy:
+    """
+    Declarative password policy specification
+
+    Policies are immutable and hashable so their compiled generators can
+    be cached and shared.
+
+    Args:
+        length: Password length
+        use_lowercase/use_uppercase/use_digits/use_special: Character classes
+        min_lowercase/min_uppercase/min_digits/min_special: Minimum count per class
+        exclude_ambiguous: Exclude ambiguous characters (il1Lo0O)
+        custom_chars: Additional characters allowed anywhere
+        max_repeat: Longest allowed run of one character (0 = unlimited)
+        max_sequence: Longest allowed alphabetic/numeric sequence such as
+            'abc' or '321' (0 = unlimited)
+        forbidden: Substrings that must never appear (case-insensitive)
+        class_weights: Relative weight of each class ('lowercase', 'uppercase',
+            'digits', 'special', 'custom') for positions not taken by minimum
+            counts; classes left out weigh 1. Default: uniform over all characters
+        char_weights: Relative weight of individual characters within their
+            class; characters left out weigh 1
+    """
+
+    FIELDS = (
+        'length', 'use_lowercase', 'use_uppercase', 'use_digits', 'use_special',
+        'min_lowercase', 'min_uppercase', 'min_digits', 'min_special',
+        'exclude_ambiguous', 'custom_chars', 'max_repeat', 'max_sequence', 'forbidden',
+        'class_weights', 'char_weights',
+    )
+
+    __slots__ = FIELDS
+
+    def __init__(self, length: int = 12, use_lowercase: bool = True,
+                 use_uppercase: bool = True, use_digits: bool = True,
+                 use_special: bool = True, min_lowercase: int = 1,
+                 min_uppercase: int = 1, min_digits: int = 1, min_special: int = 1,
+                 exclude_ambiguous: bool = False, custom_chars: str = "",
+                 max_repeat: int = 0, max_sequence: int = 0,
+                 forbidden: Tuple[str, ...] = (), class_weights: Dict = None,
+                 char_weights: Dict = None):
+        object.__setattr__(self, 'length', length)
+        object.__setattr__(self, 'use_lowercase', use_lowercase)
+        object.__setattr__(self, 'use_uppercase', use_uppercase)
+        object.__setattr__(self, 'use_digits', use_digits)
+        object.__setattr__(self, 'use_special', use_special)
+        object.__setattr__(self, 'min_lowercase', min_lowercase if use_lowercase else 0)
+        object.__setattr__(self, 'min_uppercase', min_uppercase if use_uppercase else 0)
+        object.__setattr__(self, 'min_digits', min_digits if use_digits else 0)
+        object.__setattr__(self, 'min_special', min_special if use_special else 0)
+        object.__setattr__(self, 'exclude_ambiguous', exclude_ambiguous)
+        object.__setattr__(self, 'custom_chars', custom_chars)
+        object.__setattr__(self, 'max_repeat', max_repeat)
+        object.__setattr__(self, 'max_sequence', max_sequence)
+        object.__setattr__(self, 'forbidden', tuple(f.lower() for f in forbidden if f))
+        # Stored as sorted tuples so the policy stays hashable
+        object.__setattr__(self, 'class_weights', tuple(sorted((class_weights or {}).items())))
+        object.__setattr__(self, 'char_weights', tuple(sorted((char_weights or {}).items())))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PasswordPolicy is immutable")
+
+    def key(self) -> tuple:
+        """Normalised tuple identifying this policy"""
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __eq__(self, other):
+        return isinstance(other, PasswordPolicy) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"PasswordPolicy({fields})"
+
+    def to_dict(self) -> Dict:
+        """Plain-data form of the policy, accepted by PasswordPolicy(**data)"""
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data['forbidden'] = list(self.forbidden)
+        data['class_weights'] = dict(self.class_weights)
+        data['char_weights'] = dict(self.char_weights)
+        return data
+
+    def __reduce__(self):
+        # Slots plus the immutability guard defeat default pickling
+        return (_policy_from_dict, (self.to_dict(),))
+
+    def compile(self) -> 'CompiledPolicy':
+        """Return the (cached) compiled generator for this policy"""
+        return compile_policy(self)
+
+    def violations(self, password: str) -> List[str]:
+        """Check a password against this policy and describe every violation"""
+        return self.compile().violations(password)
+
+
+class CompiledPolicy:
+    """
+    Generator compiled from a PasswordPolicy
+
+    Meets every constraint by construction. Passwords are sampled left
+    to right: each position takes a class as a shuffled layout of the
+    required counts plus weighted filler would, restricted to classes
+    that still have a character that cannot break a repeat, sequence or
+    forbidden-substring rule there; once the remaining positions equal
+    the outstanding minimum counts, only those classes are eligible. The
+    character is then drawn from that class's allowed candidates. A rare
+    dead end (every eligible class fully banned) starts the password
+    again rather than failing.
+    """
+
+    def __init__(self, policy: PasswordPolicy):
+        self.policy = policy
+        self.classes = self._build_classes(policy)
+        if not self.classes:
+            raise ValueError("At least one character type must be selected")
+
+        self.pool = ''.join(chars for _, chars, _ in self.classes)
+        self.required = sum(minimum for _, _, minimum in self.classes)
+        if policy.length < 4:
+            raise ValueError("Password length must be at least 4 characters")
+        if self.required > policy.length:
+            raise ValueError(
+                f"Policy requires {self.required} characters but length is {policy.length}"
+            )
+
+        # Alias tables are built once here so every weighted draw is O(1).
+        # Characters only get a table when one of them carries a weight.
+        char_weights = dict(policy.char_weights)
+        self._char_tables = []
+        class_mass = []
+        for _, chars, _ in self.classes:
+            weights = [char_weights.get(c, 1) for c in chars]
+            self._char_tables.append(
+                AliasTable(chars, weights) if any(c in char_weights for c in chars) else None
+            )
+            class_mass.append(sum(weights))
+
+        # Filler positions pick a class by its total character weight, so
+        # unconstrained characters follow the per-character weights, unless
+        # the policy overrides the class weights explicitly
+        if policy.class_weights:
+            class_weights = dict(policy.class_weights)
+            names = [name for name, _, _ in self.classes]
+            unknown = set(class_weights) - set(names)
+            if unknown:
+                raise ValueError(f"Unknown character class(es): {', '.join(sorted(unknown))}")
+            class_mass = [class_weights.get(name, 1) for name in names]
+        self._class_table = AliasTable(range(len(self.classes)), class_mass)
+
+        # Forbidden substrings indexed by their last character for O(1) lookup
+        self._forbidden_by_last = {}
+        for word in policy.forbidden:
+            self._forbidden_by_last.setdefault(word[-1], []).append(word[:-1])
+
+    @staticmethod
+    def _build_classes(policy: PasswordPolicy) -> List[Tuple[str, str, int]]:
+        """Return (name, chars, minimum) for each enabled class, de-duplicated"""
+        specs = [
+            ('lowercase', policy.use_lowercase, PasswordGenerator.LOWERCASE, policy.min_lowercase),
+            ('uppercase', policy.use_uppercase, PasswordGenerator.UPPERCASE, policy.min_uppercase),
+            ('digits', policy.use_digits, PasswordGenerator.DIGITS, policy.min_digits),
+            ('special', policy.use_special, PasswordGenerator.SPECIAL, policy.min_special),
+        ]
+        classes = []
+        seen = set()
+        for name, enabled, chars, minimum in specs:
+            if not enabled:
+                continue
+            if policy.exclude_ambiguous:
+                chars = ''.join(c for c in chars if c not in PasswordGenerator.AMBIGUOUS)
+            seen.update(chars)
+            classes.append((name, chars, minimum))
+
+        custom = ''.join(dict.fromkeys(c for c in policy.custom_chars if c not in seen))
+        if custom:
+            classes.append(('custom', custom, 0))
+        return classes
+
+    def _banned(self, chars: List[str]) -> set:
+        """Characters that may not follow the already generated chars"""
+        policy = self.policy
+        banned = set()
+        if not chars:
+            return banned
+
+        last = chars[-1]
+        if policy.max_repeat and len(chars) >= policy.max_repeat:
+            if all(c == last for c in chars[-policy.max_repeat:]):
+                banned.add(last)
+
+        if policy.max_sequence and len(chars) >= policy.max_sequence and last.isalnum():
+            tail = chars[-policy.max_sequence:]
+            for step in (1, -1):
+                if all(ord(b) - ord(a) == step and _same_kind(a, b)
+                       for a, b in zip(tail, tail[1:])):
+                    nxt = chr(ord(last) + step)
+                    if nxt.isalnum() and _same_kind(last, nxt):
+                        banned.add(nxt)
+
+        if self._forbidden_by_last:
+            for final, prefixes in self._forbidden_by_last.items():
+                for prefix in prefixes:
+                    if len(prefix) > len(chars):
+                        continue
+                    if not prefix or ''.join(chars[-len(prefix):]).lower() == prefix:
+                        banned.add(final)
+                        banned.add(final.upper())
+        return banned
+
+    def generate(self, rng=None) -> str:
+        """Generate one password satisfying the policy"""
+        rng = rng or secure_random
+        for _ in range(_MAX_RESTARTS):
+            password = self._attempt(rng)
+            if password is not None:
+                return password
+        raise ValueError("Policy cannot be satisfied: every attempt ran out of usable characters")
+
+    def _attempt(self, rng):
+        """One left-to-right pass; None on a dead end"""
+        length = self.policy.length
+        missing = [minimum for _, _, minimum in self.classes]
+        outstanding = sum(missing)
+        filler = self._class_table.weights
+        chars = []
+        for position in range(length):
+            remaining = length - position
+            banned = self._banned(chars)
+            free = remaining > outstanding
+            eligible = [i for i in range(len(self.classes))
+                        if (missing[i] or (free and filler[i])) and self._usable(i, banned)]
+            if not eligible:
+                return None
+            index, required = self._pick_class(eligible, missing, outstanding, remaining, rng)
+            if required:
+                missing[index] -= 1
+                outstanding -= 1
+            chars.append(self._draw_char(index, banned, rng))
+        return ''.join(chars)
+
+    def _pick_class(self, eligible: List[int], missing: List[int], outstanding: int,
+                    remaining: int, rng) -> Tuple[int, bool]:
+        """
+        (class, is a minimum slot) for the next position: one of the
+        outstanding minimum slots with chance outstanding/remaining, else
+        a weighted filler class, redrawn until the class is eligible
+        """
+        allowed = set(eligible)
+        while True:
+            if rng.randbelow(remaining) < outstanding:
+                slot = rng.randbelow(outstanding)
+                for index, count in enumerate(missing):
+                    if slot < count:
+                        break
+                    slot -= count
+                required = True
+            else:
+                index = self._class_table.draw(rng)
+                required = False
+            if index in allowed:
+                return index, required
+
+    def _usable(self, index: int, banned: set) -> bool:
+        """True if class index has a character that is not banned"""
+        table = self._char_tables[index]
+        if table is not None:
+            return any(w > 0 and c not in banned for c, w in zip(table.items, table.weights))
+        chars = self.classes[index][1]
+        return len(chars) > len(banned) or any(c not in banned for c in chars)
+
+    def _draw_char(self, index: int, banned: set, rng) -> str:
+        """Draw one character of class index that is not banned"""
+        candidates = self.classes[index][1]
+        table = self._char_tables[index]
+
+        if table is not None:
+            # At most a handful of characters are banned, so a few alias
+            # draws almost always succeed before falling back
+            for _ in range(8):
+                c = table.draw(rng)
+                if c not in banned:
+                    return c
+            allowed = [(c, w) for c, w in zip(table.items, table.weights)
+                       if c not in banned and w > 0]
+            if allowed:
+                return AliasTable(*zip(*allowed)).draw(rng)
+        else:
+            if banned:
+                candidates = [c for c in candidates if c not in banned]
+            if candidates:
+                return rng.choice(candidates)
+
+        raise ValueError(
+            f"Policy cannot be satisfied: no usable {self.classes[index][0]} character"
+        )
+
+    def generate_many(self, count: int, rng=None) -> List[str]:
+        """Generate count passwords satisfying the policy"""
+        return [self.generate(rng) for _ in range(count)]
+
+    def violations(self, password: str) -> List[str]:
+        """Describe every way password breaks the policy (empty if compliant)"""
+        policy = self.policy
+        problems = []
+
+        if len(password) < policy.length:
+            problems.append(f"Use at least {policy.length} characters")
+
+        allowed = set(self.pool)
+        if any(c not in allowed for c in password):
+            problems.append("Contains characters outside the allowed set")
+
+        for name, chars, minimum in self.classes:
+            count = sum(1 for c in password if c in chars)
+            if count < minimum:
+                singular, plural = _CLASS_NOUNS[name]
+                problems.append(f"Needs at least {minimum} {singular if minimum == 1 else plural}")
+
+        if policy.max_repeat:
+            run = 1
+            for a, b in zip(password, password[1:]):
+                run = run + 1 if a == b else 1
+                if run > policy.max_repeat:
+                    problems.append(f"Repeats a character more than {policy.max_repeat} times")
+                    break
+
+        if policy.max_sequence:
+            limit = policy.max_sequence
+            for step in (1, -1):
+                run = 1
+                for a, b in zip(password, password[1:]):
+                    in_sequence = (ord(b) - ord(a) == step and a.isalnum()
+                                   and b.isalnum() and _same_kind(a, b))
+                    run = run + 1 if in_sequence else 1
+                    if run > limit:
+                        problems.append(f"Contains a sequence longer than {limit} characters")
+                        break
+                if run > limit:
+                    break
+
+        lowered = password.lower()
+        for word in policy.forbidden:
+            if word in lowered:
+                problems.append(f"Contains forbidden text '{word}'")
+
+        return problems
+
+    def describe(self) -> Dict:
+        """Summary of the compiled classes"""
+        return {
+            'length': self.policy.length,
+            'pool_size': len(self.pool),
+            'classes': {name: {'size': len(chars), 'min': minimum}
+                        for name, chars, minimum in self.classes},
+        }
+
+
+def _same_kind(a: str, b: str) -> bool:
+    """True when both characters are digits, lowercase or uppercase letters"""
+    return (a.isdigit() and b.isdigit()) or (a.islower() and b.islower()) or \
+        (a.isupper() and b.isupper())
+
+
+def _policy_from_dict(data: Dict) -> PasswordPolicy:
+    """Unpickling helper"""
+    return PasswordPolicy(**data)
+
+
+@lru_cache(maxsize=128)
+def compile_policy(policy: PasswordPolicy) -> CompiledPolicy:
+    """Compile a policy once and reuse the result"""
+    return CompiledPolicy(policy)
@@ -0,0 +1,263 @@
+"""
+Profiling Hooks Module
+Runs a window of PasswordGenerator calls under cProfile or a lightweight
+sampling profiler, without editing the code being measured
+
+A Profiler wraps the generator's public methods (plus _save_history) with
+instance attributes, so only that generator is affected and the class
+keeps its plain methods; once the window of calls is recorded, or on
+stop(), the wrappers are removed and the output is written:
+
+- 'cprofile': a pstats file (python -m pstats FILE, snakeviz, ...)
+- 'sample': collapsed stacks, one 'frame;frame;frame count' line per
+  stack, for flamegraph.pl, speedscope or inferno
+
+Nested profiled calls (generate_strong_password -> generate_password)
+count as one call of the outermost method. cProfile follows one thread
+at a time; calls made from other threads meanwhile run unprofiled. The
+sampler follows every thread inside a profiled call.
+
+Enable with PasswordGenerator.enable_profiling() or the environment:
+PASSWORD_PROFILE=cprofile|sample, plus optional PASSWORD_PROFILE_OUTPUT,
+PASSWORD_PROFILE_CALLS (window size), PASSWORD_PROFILE_METHODS (comma
+separated names) and PASSWORD_PROFILE_INTERVAL (sampling seconds).
+"""
+
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+import warnings
+from collections import Counter
+from typing import Dict, List, Optional
+
+ENV_MODE = 'PASSWORD_PROFILE'
+ENV_OUTPUT = 'PASSWORD_PROFILE_OUTPUT'
+ENV_CALLS = 'PASSWORD_PROFILE_CALLS'
+ENV_METHODS = 'PASSWORD_PROFILE_METHODS'
+ENV_INTERVAL = 'PASSWORD_PROFILE_INTERVAL'
+
+# mode -> default output file
+MODES = {
+    'cprofile': 'password-profile.pstats',
+    'sample': 'password-profile.folded',
+}
+
+# Seconds between samples
+DEFAULT_INTERVAL = 0.001
+
+# Private methods profiled by default besides the public ones
+PROFILED_PRIVATE = ('_save_history',)
+
+# Public methods never wrapped: profiling control and lifecycle
+_NOT_PROFILED = frozenset(('enable_profiling', 'disable_profiling', 'close'))
+
+
+def default_methods(generator) -> List[str]:
+    """Names of the methods a Profiler wraps when none are given"""
+    names = [name for name, value in vars(type(generator)).items()
+             if callable(value) and not name.startswith('_') and name not in _NOT_PROFILED]
+    return names + [name for name in PROFILED_PRIVATE if hasattr(generator, name)]
+
+
+class _Sampler:
+    """Background thread sampling the stacks of the threads it is told about"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._active: Dict[int, int] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self._thread.start()
+
+    def enter(self, ident: int):
+        with self._condition:
+            self._active[ident] = self._active.get(ident, 0) + 1
+            self._condition.notify()
+
+    def leave(self, ident: int):
+        with self._condition:
+            self._active[ident] -= 1
+            if not self._active[ident]:
+                del self._active[ident]
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        here = os.path.abspath(__file__)
+        while True:
+            with self._condition:
+                while not self._active and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                idents = list(self._active)
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                stack = []
+                wrapped = False
+                while frame is not None:
+                    code = frame.f_code
+                    if os.path.abspath(code.co_filename) == here:
+                        wrapped = True
+                    else:
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                # The thread may have left its profiled call since the snapshot
+                if wrapped:
+                    self.counts[';'.join(reversed(stack))] += 1
+                    self.samples += 1
+            del frames
+            time.sleep(self.interval)
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Profile a window of calls to a generator's methods
+
+    Args:
+        generator: PasswordGenerator to instrument
+        mode: 'cprofile' or 'sample'
+        output: File written when profiling stops (default per mode)
+        calls: Outermost calls to record before stopping (None = until stop())
+        methods: Method names to wrap (default: default_methods())
+        interval: Seconds between samples in 'sample' mode
+    """
+
+    def __init__(self, generator, mode: str = 'cprofile', output: str = None,
+                 calls: int = None, methods: List[str] = None,
+                 interval: float = DEFAULT_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}' (expected one of: {', '.join(MODES)})")
+        if calls is not None and calls < 1:
+            raise ValueError("Profiling window must be at least one call")
+        names = list(methods) if methods else default_methods(generator)
+        missing = [name for name in names if not callable(getattr(generator, name, None))]
+        if missing:
+            raise ValueError(f"Cannot profile unknown method(s): {', '.join(missing)}")
+
+        self.generator = generator
+        self.mode = mode
+        self.output = output or MODES[mode]
+        self.calls = calls
+        self.recorded = 0
+        self.stopped = False
+        self._names = names
+        self._local = threading.local()
+        self._stop_lock = threading.Lock()
+        if mode == 'cprofile':
+            import cProfile
+            self._profile = cProfile.Profile()
+            # cProfile follows one thread at a time
+            self._busy = threading.Lock()
+            self._sampler = None
+        else:
+            self._profile = None
+            self._sampler = _Sampler(interval)
+
+        for name in names:
+            setattr(generator, name, self._wrap(getattr(generator, name)))
+        atexit.register(self.stop)
+
+    def _wrap(self, method):
+        local = self._local
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            depth = getattr(local, 'depth', 0)
+            if depth or self.stopped:
+                # Nested call: already covered by the outermost one
+                local.depth = depth + 1
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    local.depth = depth
+            if not self._begin():
+                return method(*args, **kwargs)
+            local.depth = 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                local.depth = 0
+                self._end()
+        return wrapper
+
+    def _begin(self) -> bool:
+        if self._profile is not None:
+            if not self._busy.acquire(blocking=False):
+                return False
+            self._profile.enable()
+        else:
+            self._sampler.enter(threading.get_ident())
+        return True
+
+    def _end(self):
+        if self._profile is not None:
+            self._profile.disable()
+            self._busy.release()
+        else:
+            self._sampler.leave(threading.get_ident())
+        self.recorded += 1
+        if self.calls is not None and self.recorded >= self.calls:
+            self.stop()
+
+    def stop(self) -> Optional[str]:
+        """
+        Remove the wrappers and write the output (once)
+
+        Returns:
+            Path of the output file, or None if it could not be written
+        """
+        with self._stop_lock:
+            if self.stopped:
+                return self.output
+            self.stopped = True
+        for name in self._names:
+            self.generator.__dict__.pop(name, None)
+        atexit.unregister(self.stop)
+        try:
+            if self._profile is not None:
+                # Wait for a call still being profiled on another thread
+                with self._busy:
+                    self._profile.dump_stats(self.output)
+            else:
+                self._sampler.stop()
+                self._sampler.write(self.output)
+        except OSError as e:
+            warnings.warn(f"Could not write profile to {self.output}: {e}", RuntimeWarning)
+            return None
+        return self.output
+
+
+def profiler_from_env(generator) -> Optional[Profiler]:
+    """Profiler configured by PASSWORD_PROFILE*, or None when unset or invalid"""
+    mode = os.environ.get(ENV_MODE)
+    if not mode:
+        return None
+    try:
+        calls = os.environ.get(ENV_CALLS)
+        interval = os.environ.get(ENV_INTERVAL)
+        methods = os.environ.get(ENV_METHODS)
+        return Profiler(generator, mode.strip().lower(),
+                        output=os.environ.get(ENV_OUTPUT) or None,
+                        calls=int(calls) if calls else None,
+                        methods=[m.strip() for m in methods.split(',') if m.strip()] if methods else None,
+                        interval=float(interval) if interval else DEFAULT_INTERVAL)
+    except ValueError as e:
+        warnings.warn(f"Ignoring {ENV_MODE}: {e}", RuntimeWarning)
+        return None
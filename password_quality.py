@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Statistical Quality Harness
+Chi-square and serial-correlation checks on generator output
+
+Generates large samples through the multi/bulk paths and compares
+per-character, per-class and per-position frequencies with the exact
+distribution each generator is supposed to produce. Exits non-zero when
+any check fails, so it can gate CI.
+
+Usage: python password_quality.py [--samples N] [--alpha A] [--quick]
+"""
+
+import math
+import sys
+from collections import Counter
+from typing import Dict, List, Sequence
+
+from password_bulk import count_valid_passwords, generate_buffer
+from password_engine import PasswordGenerator
+
+# Per-check significance level. With ~20 checks a correct generator
+# fails a run with probability of roughly 20 * alpha.
+DEFAULT_ALPHA = 1e-4
+DEFAULT_SAMPLES = 100000
+
+PASSWORD_LENGTH = 16
+PIN_LENGTH = 6
+SCREENED_PIN_LENGTH = 4
+TEMPLATE = 'Ulll-dddd-ssss'
+
+
+class QualityResult:
+    """Outcome of one statistical check"""
+
+    def __init__(self, name: str, statistic: float, df: int, p_value: float, alpha: float):
+        self.name = name
+        self.statistic = statistic
+        self.df = df
+        self.p_value = p_value
+        self.passed = p_value >= alpha
+
+    def __repr__(self):
+        status = 'PASS' if self.passed else 'FAIL'
+        return f"{status}  {self.name:<42} stat={self.statistic:12.2f} df={self.df:5d} p={self.p_value:.4g}"
+
+
+def chi_square_sf(statistic: float, df: int) -> float:
+    """Upper tail probability of the chi-square distribution"""
+    if statistic <= 0:
+        return 1.0
+    return _gamma_q(df / 2.0, statistic / 2.0)
+
+
+def _gamma_q(a: float, x: float) -> float:
+    """Regularized upper incomplete gamma function Q(a, x)"""
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        # Series for P(a, x)
+        term = total = 1.0 / a
+        n = a
+        for _ in range(10000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def check_frequencies(name: str, counts: Counter, expected: Dict, alpha: float) -> QualityResult:
+    """Goodness of fit of observed counts against expected probabilities"""
+    total = sum(counts.values())
+    statistic = 0.0
+    for key, probability in expected.items():
+        e = total * probability
+        statistic += (counts.get(key, 0) - e) ** 2 / e
+    unexpected = set(counts) - set(expected)
+    if unexpected:
+        return QualityResult(f"{name} (unexpected symbols)", float('inf'), len(expected) - 1, 0.0, alpha)
+    df = len(expected) - 1
+    return QualityResult(name, statistic, df, chi_square_sf(statistic, df), alpha)
+
+
+def check_homogeneity(name: str, rows: Sequence[Counter], alpha: float) -> QualityResult:
+    """Chi-square test that every row (e.g. position) has the same distribution"""
+    keys = sorted(set().union(*rows))
+    row_totals = [sum(row.values()) for row in rows]
+    col_totals = {k: sum(row.get(k, 0) for row in rows) for k in keys}
+    grand = sum(row_totals)
+    statistic = 0.0
+    for row, row_total in zip(rows, row_totals):
+        for k in keys:
+            e = row_total * col_totals[k] / grand
+            statistic += (row.get(k, 0) - e) ** 2 / e
+    df = (len(rows) - 1) * (len(keys) - 1)
+    return QualityResult(name, statistic, df, chi_square_sf(statistic, df), alpha)
+
+
+def check_serial(name: str, values: Sequence[float], alpha: float) -> QualityResult:
+    """Lag-1 serial correlation test (z = r * sqrt(n) under independence)"""
+    n = len(values) - 1
+    mean = sum(values) / len(values)
+    centered = [v - mean for v in values]
+    variance = sum(c * c for c in centered)
+    r = sum(a * b for a, b in zip(centered, centered[1:])) / variance
+    z = r * math.sqrt(n)
+    return QualityResult(name, z * z, 1, math.erfc(abs(z) / math.sqrt(2)), alpha)
+
+
+def _position_rows(samples: Sequence[str], length: int, key=lambda c: c) -> List[Counter]:
+    rows = [Counter() for _ in range(length)]
+    for sample in samples:
+        for i, c in enumerate(sample):
+            rows[i][key(c)] += 1
+    return rows
+
+
+def check_generate_password(generator: PasswordGenerator, samples: int, alpha: float) -> List[QualityResult]:
+    """generate_password via generate_multiple: required chars plus shuffle"""
+    length = PASSWORD_LENGTH
+    classes = generator._character_classes(True, True, True, True, False)
+    pool = ''.join(classes)
+    class_of = {c: i for i, chars in enumerate(classes) for c in chars}
+    k = len(classes)
+
+    # One required character per class at a uniformly shuffled position,
+    # the remaining length - k uniform over the pool
+    char_p = {c: (1 / len(classes[class_of[c]])) / length + (length - k) / length / len(pool)
+              for c in pool}
+    class_p = {i: 1 / length + (length - k) / length * len(chars) / len(pool)
+               for i, chars in enumerate(classes)}
+
+    passwords = generator.generate_multiple(samples, length)
+    chars = Counter(''.join(passwords))
+    return [
+        check_frequencies("generate_password: characters", chars, char_p, alpha),
+        check_frequencies("generate_password: classes",
+                          Counter({i: sum(chars[c] for c in cls) for i, cls in enumerate(classes)}),
+                          class_p, alpha),
+        check_homogeneity("generate_password: class by position",
+                          _position_rows(passwords, length, class_of.get), alpha),
+    ]
+
+
+def check_bulk(generator: PasswordGenerator, samples: int, alpha: float) -> List[QualityResult]:
+    """generate_bulk: uniform over passwords containing every class"""
+    length = PASSWORD_LENGTH
+    classes = generator._character_classes(True, True, True, True, False)
+    pool = ''.join(classes)
+    sizes = [len(c) for c in classes]
+    total = count_valid_passwords(sizes, length)
+
+    # P(position holds c) = valid strings with c fixed there / all valid strings
+    char_p = {}
+    for i, chars in enumerate(classes):
+        rest = sizes[:i] + sizes[i + 1:]
+        with_char = count_valid_passwords(rest, length - 1, extra=sizes[i])
+        for c in chars:
+            char_p[c] = with_char / total
+
+    passwords = generator.generate_bulk(samples, length).passwords()
+    chars = Counter(''.join(passwords))
+
+    # Without required classes the stream must be i.i.d. uniform
+    plain = generate_buffer(samples, length, pool, separator=b'')
+    index = {ord(c): i for i, c in enumerate(pool)}
+    stream = [index[b] for b in plain.view[:min(plain.view.nbytes, 2000000)]]
+
+    return [
+        check_frequencies("generate_bulk: characters", chars, char_p, alpha),
+        check_homogeneity("generate_bulk: characters by position",
+                          _position_rows(passwords, length), alpha),
+        check_frequencies("bulk stream: characters", Counter(stream),
+                          {i: 1 / len(pool) for i in range(len(pool))}, alpha),
+        check_serial("bulk stream: serial correlation", stream, alpha),
+    ]
+
+
+def check_pin(generator: PasswordGenerator, samples: int, alpha: float) -> List[QualityResult]:
+    """generate_pin: independent uniform digits unscreened, uniform over allowed PINs screened"""
+    pins = [generator.generate_pin(PIN_LENGTH, screen=False) for _ in range(samples)]
+    digits = [int(d) for pin in pins for d in pin]
+
+    # Screened 4-digit PINs: every allowed PIN equally likely, no denied PIN
+    from password_pins import denylist
+    denied = denylist(SCREENED_PIN_LENGTH)
+    allowed = [f"{n:04d}" for n in range(denied.size) if not denied.denied_index(n)]
+    expected = {pin: 1 / len(allowed) for pin in allowed}
+    single = [generator.generate_pin(SCREENED_PIN_LENGTH) for _ in range(samples)]
+    bulk = generator.generate_pins(samples, SCREENED_PIN_LENGTH)
+    return [
+        check_frequencies("generate_pin: digits", Counter(digits),
+                          {d: 0.1 for d in range(10)}, alpha),
+        check_homogeneity("generate_pin: digits by position",
+                          _position_rows(pins, PIN_LENGTH), alpha),
+        check_serial("generate_pin: serial correlation", digits, alpha),
+        check_frequencies("generate_pin (screened): allowed PINs", Counter(single), expected, alpha),
+        check_frequencies("generate_pins (screened): allowed PINs", Counter(bulk), expected, alpha),
+    ]
+
+
+def check_passphrase(generator: PasswordGenerator, samples: int, alpha: float) -> List[QualityResult]:
+    """generate_passphrase: uniform words and numeric suffix"""
+    words = [w.capitalize() for w in generator.WORDS]
+    index = {w: i for i, w in enumerate(words)}
+    num_words = 4
+    phrases = [generator.generate_passphrase(num_words).split('-') for _ in range(samples)]
+
+    picked = [index[w] for phrase in phrases for w in phrase[:num_words]]
+    rows = [Counter(phrase[i] for phrase in phrases) for i in range(num_words)]
+    return [
+        check_frequencies("generate_passphrase: words", Counter(picked),
+                          {i: 1 / len(words) for i in range(len(words))}, alpha),
+        check_frequencies("generate_passphrase: number suffix",
+                          Counter(int(phrase[-1]) for phrase in phrases),
+                          {n: 0.01 for n in range(100)}, alpha),
+        check_homogeneity("generate_passphrase: words by position", rows, alpha),
+        check_serial("generate_passphrase: serial correlation", picked, alpha),
+    ]
+
+
+def check_template(generator: PasswordGenerator, samples: int, alpha: float) -> List[QualityResult]:
+    """Template path: every position uniform over its own pool"""
+    from password_template import compile_template
+    compiled = compile_template(TEMPLATE)
+    passwords = generator.generate_many_from_template(TEMPLATE, samples)
+    rows = _position_rows(passwords, compiled.length)
+
+    # Positions are independent, so their statistics add up
+    statistic, df = 0.0, 0
+    for row, pool in zip(rows, compiled.positions):
+        if len(pool) > 1:
+            result = check_frequencies("", row, {c: 1 / len(pool) for c in pool}, alpha)
+            statistic += result.statistic
+            df += result.df
+    return [QualityResult(f"template {TEMPLATE}: per position", statistic, df,
+                          chi_square_sf(statistic, df), alpha)]
+
+
+CHECKS = (check_generate_password, check_bulk, check_pin, check_passphrase, check_template)
+
+
+def run_suite(samples: int = DEFAULT_SAMPLES, alpha: float = DEFAULT_ALPHA) -> List[QualityResult]:
+    """Run every check and return the results"""
+    generator = PasswordGenerator()
+    results = []
+    for check in CHECKS:
+        results.extend(check(generator, samples, alpha))
+    return results
+
+
+def main(argv=None) -> int:
+    """Entry point: exit code 0 when every check passes"""
+    argv = sys.argv[1:] if argv is None else argv
+    samples, alpha = DEFAULT_SAMPLES, DEFAULT_ALPHA
+    args = iter(argv)
+    for arg in args:
+        if arg == '--samples':
+            samples = int(next(args))
+        elif arg == '--alpha':
+            alpha = float(next(args))
+        elif arg == '--quick':
+            samples = 20000
+        else:
+            print(f"Unknown argument: {arg}", file=sys.stderr)
+            return 2
+
+    results = run_suite(samples, alpha)
+    for result in results:
+        print(result)
+    failed = [r for r in results if not r.passed]
+    print(f"\n{len(results) - len(failed)}/{len(results)} checks passed "
+          f"({samples} samples per generator, alpha={alpha})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Random Source Module
+Cryptographically secure randomness built directly on os.urandom, plus a
+clearly labelled deterministic generator for reproducible testing
+"""
+
+import os
+
+
+class SecureRandom:
+    """
+    Secure random source backed by the operating system CSPRNG
+
+    Mirrors the parts of the ``secrets`` / ``random.SystemRandom`` API the
+    engine needs without importing them (``secrets`` pulls in hashlib,
+    hmac and base64, which dominates cold start of the CLI).
+    """
+
+    # True only for reproducible test generators
+    deterministic = False
+
+    def randbytes(self, n: int) -> bytes:
+        """Return n random bytes"""
+        return os.urandom(n)
+
+    def getrandbits(self, k: int) -> int:
+        """Return a non-negative integer with k random bits"""
+        if k <= 0:
+            return 0
+        numbytes = (k + 7) // 8
+        value = int.from_bytes(self.randbytes(numbytes), 'big')
+        return value >> (numbytes * 8 - k)
+
+    def randbelow(self, n: int) -> int:
+        """Return a uniform random integer in [0, n)"""
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        k = n.bit_length()
+        r = self.getrandbits(k)
+        while r >= n:
+            r = self.getrandbits(k)
+        return r
+
+    def choice(self, seq):
+        """Return a uniformly chosen element from a non-empty sequence"""
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randbelow(len(seq))]
+
+    def shuffle(self, items: list):
+        """Shuffle a list in place (Fisher-Yates)"""
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+
+# DeterministicRandom output block size in bytes
+_BLOCK = 256
+
+
+class DeterministicRandom(SecureRandom):
+    """
+    INSECURE deterministic random source for load and regression tests
+
+    HMAC-DRBG (SHA-256, NIST SP 800-90A) seeded only from the given seed:
+    the same seed always yields the same byte stream, on every platform
+    and run. Never use it for real passwords.
+
+    Bulk and parallel paths derive an independent child stream for each
+    record index with substream(index). Record i is therefore the same
+    whether it is produced one at a time, in one bulk call, or by a
+    worker handling only a slice of the indices. Bulk calls that do not
+    name their first index take the next unused ones from claim(), so
+    successive calls never repeat records.
+
+    Args:
+        seed: int, str or bytes seed
+        personalization: Optional extra input separating streams
+    """
+
+    deterministic = True
+
+    def __init__(self, seed, personalization: bytes = b''):
+        import hashlib
+        import hmac
+        self._hmac = hmac
+        self._hash = hashlib.sha256
+        self.seed = _seed_bytes(seed)
+        self.personalization = personalization
+        self._key = b'\x00' * 32
+        self._value = b'\x01' * 32
+        self._update(self.seed + personalization)
+        self._buffer = b''
+        self._offset = 0
+        self._next_record = 0
+
+    def __repr__(self):
+        return f"DeterministicRandom(seed={self.seed!r}) [INSECURE, testing only]"
+
+    def _mac(self, key: bytes, data: bytes) -> bytes:
+        return self._hmac.new(key, data, self._hash).digest()
+
+    def _update(self, data: bytes = b''):
+        """HMAC-DRBG update step"""
+        self._key = self._mac(self._key, self._value + b'\x00' + data)
+        self._value = self._mac(self._key, self._value)
+        if data:
+            self._key = self._mac(self._key, self._value + b'\x01' + data)
+            self._value = self._mac(self._key, self._value)
+
+    def _generate(self, n: int) -> bytes:
+        """HMAC-DRBG generate step"""
+        out = []
+        produced = 0
+        while produced < n:
+            self._value = self._mac(self._key, self._value)
+            out.append(self._value)
+            produced += len(self._value)
+        self._update()
+        return b''.join(out)[:n]
+
+    def randbytes(self, n: int) -> bytes:
+        """Return the next n bytes of the deterministic stream"""
+        # Served from fixed-size generate blocks, so the stream does not
+        # depend on how callers split their requests
+        available = len(self._buffer) - self._offset
+        if available < n:
+            blocks = (n - available + _BLOCK - 1) // _BLOCK
+            self._buffer = self._buffer[self._offset:] + b''.join(
+                self._generate(_BLOCK) for _ in range(blocks))
+            self._offset = 0
+        data = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        return data
+
+    def claim(self, count: int, start: int = None) -> int:
+        """
+        First record index for a bulk call of count records
+
+        With start None the next unused indices are taken; an explicit
+        start (a slice of a parallel run) is used as given. Either way
+        later unnamed calls continue after the highest index handed out.
+        """
+        if start is None:
+            start = self._next_record
+        self._next_record = max(self._next_record, start + count)
+        return start
+
+    def substream(self, index: int) -> 'DeterministicRandom':
+        """Independent child stream for record index"""
+        return DeterministicRandom(
+            self.seed, self.personalization + b'/' + str(index).encode('ascii'))
+
+
+def _seed_bytes(seed) -> bytes:
+    """Normalise a seed to bytes"""
+    if isinstance(seed, bytes):
+        return seed
+    if isinstance(seed, str):
+        return seed.encode('utf-8')
+    if isinstance(seed, int):
+        return seed.to_bytes((seed.bit_length() + 8) // 8, 'big', signed=True)
+    raise TypeError("Seed must be int, str or bytes")
+
+
+# Shared default random source
+secure_random = SecureRandom()
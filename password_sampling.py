@@ -0,0 +1,112 @@
+"""
+Weighted Sampling Module
+Walker/Vose alias tables for O(1) weighted draws from a secure RNG
+"""
+
+from fractions import Fraction
+from math import gcd
+from typing import List, Sequence
+
+from password_random import secure_random
+
+
+class AliasTable:
+    """
+    Exact Walker alias table over a fixed set of items
+
+    Weights are converted to integers (floats via their exact binary
+    fraction) so every draw is exact: one call to rng.randbelow(n * W)
+    selects a column and the accept/alias threshold at once.
+
+    Args:
+        items: Items to sample from
+        weights: Non-negative weight per item (at least one positive)
+    """
+
+    __slots__ = ('items', 'weights', 'total', '_n', '_threshold', '_alias')
+
+    def __init__(self, items: Sequence, weights: Sequence):
+        if len(items) != len(weights):
+            raise ValueError("Items and weights must have the same length")
+        if not items:
+            raise ValueError("Cannot build an alias table over no items")
+
+        self.items = tuple(items)
+        self.weights = _integer_weights(weights)
+        self.total = sum(self.weights)
+        if self.total <= 0:
+            raise ValueError("At least one weight must be positive")
+
+        n = len(self.items)
+        self._n = n
+        self._threshold, self._alias = self._build(self.weights, self.total)
+
+    @staticmethod
+    def _build(weights: List[int], total: int):
+        """Vose's construction using integer arithmetic"""
+        n = len(weights)
+        scaled = [w * n for w in weights]
+        threshold = [total] * n
+        alias = list(range(n))
+        small = [i for i, s in enumerate(scaled) if s < total]
+        large = [i for i, s in enumerate(scaled) if s >= total]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            threshold[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= total - scaled[s]
+            if scaled[l] < total:
+                small.append(l)
+            else:
+                large.append(l)
+        # Leftover columns are (numerically exactly) full
+        return threshold, alias
+
+    def draw_index(self, rng=None) -> int:
+        """Draw an item index"""
+        column, u = divmod((rng or secure_random).randbelow(self._n * self.total), self.total)
+        return column if u < self._threshold[column] else self._alias[column]
+
+    def draw(self, rng=None):
+        """Draw one item"""
+        return self.items[self.draw_index(rng)]
+
+    def draw_many(self, count: int, rng=None) -> list:
+        """Draw count items"""
+        rng = rng or secure_random
+        randbelow = rng.randbelow
+        span, total = self._n * self.total, self.total
+        threshold, alias, items = self._threshold, self._alias, self.items
+        result = []
+        for _ in range(count):
+            column, u = divmod(randbelow(span), total)
+            result.append(items[column if u < threshold[column] else alias[column]])
+        return result
+
+    def probability(self, index: int) -> Fraction:
+        """Exact probability of drawing the item at index"""
+        return Fraction(self.weights[index], self.total)
+
+    def __len__(self):
+        return self._n
+
+
+def _integer_weights(weights: Sequence) -> List[int]:
+    """Scale weights to the smallest equivalent list of integers"""
+    fractions = []
+    for w in weights:
+        if w < 0:
+            raise ValueError("Weights must be non-negative")
+        fractions.append(Fraction(w))
+
+    denominator = 1
+    for f in fractions:
+        denominator = denominator * f.denominator // gcd(denominator, f.denominator)
+    ints = [int(f * denominator) for f in fractions]
+
+    common = 0
+    for value in ints:
+        common = gcd(common, value)
+    return [value // common for value in ints] if common > 1 else ints
@@ -0,0 +1,233 @@
+"""
+History Search Module
+Trigram inverted index over history descriptions for substring and
+word-prefix search
+"""
+
+import json
+import os
+import sys
+import zlib
+from array import array
+from typing import Dict, List
+
+# Queries whose normalised form is shorter than this are answered by scan
+_MIN_GRAM = 3
+
+# Dropped entries tolerated in the postings before sync() rebuilds
+_MIN_DEAD = 1024
+
+_FORMAT_VERSION = 2
+
+
+def index_path(history_path: str) -> str:
+    """Index file stored beside a history file"""
+    return history_path + '.idx'
+
+
+def normalize(text: str) -> str:
+    """Lower-case text with every non-alphanumeric character as a space"""
+    return ''.join(ch if ch.isalnum() else ' ' for ch in text.lower())
+
+
+def fingerprint(entry: Dict) -> int:
+    """Checksum identifying one history entry (timestamp and description)"""
+    text = f"{entry.get('created_at')}\0{entry.get('description')}"
+    return zlib.crc32(text.encode('utf-8', 'replace'))
+
+
+def trigrams(text: str) -> set:
+    """Distinct trigrams of normalised, space-padded text"""
+    padded = ' ' + normalize(text) + ' '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Incrementally maintained trigram index over history descriptions
+
+    Maps each trigram of the normalised, space-padded description to the
+    ascending ids of the entries containing it. Entries are added with
+    sync(), which indexes only ids newer than the last one seen, so the
+    index never needs a full rebuild while history grows. Ids of entries
+    later dropped from the log stay in the postings and are skipped at
+    query time; rebuild() purges them.
+
+    Ids restart when a history file is deleted or replaced, so the index
+    also keeps the fingerprint of its newest entry: if the log holds a
+    different entry under that id, the index belongs to another history
+    and is rebuilt.
+
+    Candidates come from the shortest posting list among the query's
+    trigrams and are verified against the description, so results are
+    exact. The space padding makes word starts their own trigrams, which
+    is what keeps word-prefix queries selective.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        self.last_id = -1
+        self.indexed = 0
+        # fingerprint() of the entry with id last_id
+        self.anchor = None
+        self.dirty = False
+
+    def __len__(self):
+        return self.indexed
+
+    def add(self, entry_id: int, description: str):
+        """Index one entry; ids must be added in ascending order"""
+        if entry_id <= self.last_id:
+            raise ValueError("Entries must be added in ascending id order")
+        postings = self.postings
+        for gram in trigrams(description):
+            ids = postings.get(gram)
+            if ids is None:
+                ids = postings[gram] = array('q')
+            ids.append(entry_id)
+        self.last_id = entry_id
+        self.indexed += 1
+        self.dirty = True
+
+    def sync(self, log) -> int:
+        """
+        Index every entry of a HistoryLog newer than the last indexed id
+
+        Rebuilds instead when the log no longer matches the index (it was
+        cleared or replaced) or when most indexed ids have been dropped.
+
+        Returns:
+            Number of entries indexed
+        """
+        live = len(log) - log.count_after(self.last_id)
+        if (not self._same_history(log)
+                or self.indexed - live > max(live, _MIN_DEAD)):
+            return self.rebuild(log)
+        added = 0
+        for entry_id, description in log.descriptions_after(self.last_id):
+            self.add(entry_id, description)
+            added += 1
+        if added:
+            self.anchor = fingerprint(log.get(self.last_id))
+        return added
+
+    def _same_history(self, log) -> bool:
+        """True if log is (a later state of) the history this index was built from"""
+        if self.last_id < 0:
+            return True
+        if log.last_id < self.last_id:
+            return False
+        entry = log.get(self.last_id)
+        if entry is None:
+            # Dropped by retention, unless older ids are still present
+            return log[0]['id'] > self.last_id
+        return fingerprint(entry) == self.anchor
+
+    def rebuild(self, log) -> int:
+        """Index a log from scratch"""
+        self.postings = {}
+        self.last_id = -1
+        self.indexed = 0
+        self.anchor = None
+        for entry_id, description in log.descriptions_after(-1):
+            self.add(entry_id, description)
+        if self.indexed:
+            self.anchor = fingerprint(log.get(self.last_id))
+        self.dirty = True
+        return self.indexed
+
+    def search(self, log, query: str, prefix: bool = False, limit: int = None) -> List[Dict]:
+        """
+        Find history entries by description
+
+        Args:
+            log: HistoryLog the index was synced with
+            query: Text to look for (case-insensitive)
+            prefix: Match only at the start of a word of the description
+            limit: Maximum number of results
+
+        Returns:
+            Matching entry dicts, newest first
+        """
+        needle = normalize(query).strip()
+        if not needle:
+            return []
+        if prefix:
+            needle = ' ' + needle
+            matches = lambda d: needle in ' ' + normalize(d)
+        else:
+            lowered = query.lower()
+            matches = lambda d: lowered in d.lower()
+
+        grams = {needle[i:i + 3] for i in range(len(needle) - 2)} if len(needle) >= _MIN_GRAM else None
+        if grams:
+            lists = [self.postings.get(gram) for gram in grams]
+            if any(ids is None for ids in lists):
+                return []
+            rows = (log.get(entry_id) for entry_id in reversed(min(lists, key=len)))
+        else:
+            # Too short for trigrams: scan the description column
+            found = [entry_id for entry_id, description in log.descriptions_after(-1)
+                     if matches(description)]
+            rows = (log.get(entry_id) for entry_id in reversed(found))
+
+        results = []
+        for row in rows:
+            if row is not None and matches(row.get('description') or ''):
+                results.append(row)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def save(self, path: str):
+        """
+        Write the index: a JSON header line, then every posting list as
+        raw int64 values in header key order
+        """
+        keys = sorted(self.postings)
+        header = {
+            'version': _FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'last_id': self.last_id,
+            'indexed': self.indexed,
+            'anchor': self.anchor,
+            'keys': keys,
+            'counts': [len(self.postings[k]) for k in keys],
+        }
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n')
+                for key in keys:
+                    self.postings[key].tofile(f)
+            os.replace(tmp_path, path)
+        except IOError:
+            return
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchIndex':
+        """Read an index written by save(); an empty index if unusable"""
+        index = cls()
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('version') != _FORMAT_VERSION:
+                    return index
+                data = array('q')
+                data.frombytes(f.read())
+        except (OSError, ValueError):
+            return index
+        if header['byteorder'] != sys.byteorder:
+            data.byteswap()
+        if sum(header['counts']) != len(data):
+            return index
+
+        offset = 0
+        for key, count in zip(header['keys'], header['counts']):
+            index.postings[key] = data[offset:offset + count]
+            offset += count
+        index.last_id = header['last_id']
+        index.indexed = header['indexed']
+        index.anchor = header.get('anchor')
+        return index
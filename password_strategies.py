@@ -0,0 +1,170 @@
+"""
+Generator Strategy Registry
+Generation styles registered by name, with the options the CLI and GUI
+ask for; a strategy's code is imported only when it is first used
+
+A strategy's target is a 'module:attribute' path to a callable taking
+the PasswordGenerator and the strategy's options and returning one
+password. Engine methods qualify as 'password_engine:PasswordGenerator.
+method'. Targets are resolved on first generate(), so registering a
+strategy backed by a heavy module (a Markov model, a large wordlist)
+costs nothing at startup.
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+# Menu groups: 'basic' (CLI only), 'preset' (GUI preset buttons using the
+# length slider, raised to the length option's minimum), 'tool' (GUI tool
+# buttons asking for their options)
+GROUPS = ('basic', 'preset', 'tool')
+
+
+class Option:
+    """
+    One strategy option
+
+    Args:
+        name: Keyword argument passed to the target
+        prompt: Text shown when asking for it
+        default: Default value; its type (int or str) is the option's type
+        minimum, maximum: Bounds for int options
+        ask_gui: Ask for it in the GUI (otherwise the default is used there)
+        clamp: Raise values below minimum to it instead of rejecting them
+    """
+
+    def __init__(self, name: str, prompt: str, default, minimum: int = None,
+                 maximum: int = None, ask_gui: bool = True, clamp: bool = False):
+        self.name = name
+        self.prompt = prompt
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.ask_gui = ask_gui
+        self.clamp = clamp
+
+    def parse(self, text: str):
+        """Value for user input text (the default when blank)"""
+        text = text.strip()
+        if not text:
+            return self.default
+        if not isinstance(self.default, int):
+            return text
+        value = int(text)
+        name = self.prompt[:1].upper() + self.prompt[1:]
+        if self.minimum is not None and value < self.minimum:
+            if self.clamp:
+                return self.minimum
+            raise ValueError(f"{name} must be at least {self.minimum}")
+        if self.maximum is not None and value > self.maximum:
+            raise ValueError(f"{name} must be at most {self.maximum}")
+        return value
+
+
+class Strategy:
+    """A named generation style and the callable producing it"""
+
+    def __init__(self, name: str, label: str, target: str, options: Tuple[Option, ...] = (),
+                 group: str = 'tool', button: str = None, description: str = ''):
+        if group not in GROUPS:
+            raise ValueError(f"Unknown group '{group}' (expected one of: {', '.join(GROUPS)})")
+        if ':' not in target:
+            raise ValueError(f"Target must be 'module:attribute', got '{target}'")
+        self.name = name
+        self.label = label
+        self.target = target
+        self.options = tuple(options)
+        self.group = group
+        self.button = button or label
+        self.description = description
+        self._func = None
+
+    def __repr__(self):
+        return f"Strategy({self.name!r}, {self.target!r})"
+
+    @property
+    def loaded(self) -> bool:
+        """True once the target has been imported"""
+        return self._func is not None
+
+    def load(self) -> Callable:
+        """Import and cache the target"""
+        if self._func is None:
+            module_name, _, path = self.target.partition(':')
+            func = importlib.import_module(module_name)
+            for attribute in path.split('.'):
+                func = getattr(func, attribute)
+            self._func = func
+        return self._func
+
+    def defaults(self) -> Dict:
+        return {option.name: option.default for option in self.options}
+
+    def generate(self, generator, **options) -> str:
+        """One password; options not given take their defaults"""
+        unknown = set(options) - {option.name for option in self.options}
+        if unknown:
+            raise ValueError(f"Unexpected option(s) for '{self.name}': {', '.join(sorted(unknown))}")
+        return self.load()(generator, **{**self.defaults(), **options})
+
+
+# name -> Strategy, in menu order
+REGISTRY: Dict[str, Strategy] = {}
+
+
+def register(strategy: Strategy, replace: bool = False) -> Strategy:
+    """Add a strategy to the registry (at the end of the menus)"""
+    if strategy.name in REGISTRY and not replace:
+        raise ValueError(f"Strategy '{strategy.name}' is already registered")
+    REGISTRY[strategy.name] = strategy
+    return strategy
+
+
+def get(name: str) -> Strategy:
+    """Registered strategy by name"""
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy '{name}' (expected one of: {', '.join(REGISTRY)})") from None
+
+
+def strategies(group: str = None) -> List[Strategy]:
+    """Registered strategies in menu order, optionally of one group"""
+    return [s for s in REGISTRY.values() if group is None or s.group == group]
+
+
+def _length(default: int, prompt: str = 'password length', minimum: int = 4,
+            maximum: int = None, clamp: bool = False) -> Option:
+    return Option('length', prompt, default, minimum, maximum, clamp=clamp)
+
+
+_ENGINE = 'password_engine:PasswordGenerator.'
+
+for _strategy in (
+    Strategy('password', 'Quick Generate (Default Settings)', _ENGINE + 'generate_password',
+             (_length(12),), group='basic'),
+    Strategy('easy', 'Generate Easy Password (Easy to type)', _ENGINE + 'generate_easy_password',
+             (_length(12),), group='preset', button='Easy',
+             description='Lowercase letters + digits only'),
+    Strategy('medium', 'Generate Medium Password', _ENGINE + 'generate_medium_password',
+             (_length(12),), group='preset', button='Medium', description='Letters + digits'),
+    Strategy('strong', 'Generate Strong Password', _ENGINE + 'generate_strong_password',
+             (_length(16, minimum=16, clamp=True),), group='preset', button='Strong',
+             description='All character types'),
+    Strategy('pin', 'Generate PIN (Numeric only)', _ENGINE + 'generate_pin',
+             (_length(4, 'PIN length', 4, 16),), button='🔢 Generate PIN'),
+    Strategy('passphrase', 'Generate Passphrase (Memorable)', _ENGINE + 'generate_passphrase',
+             (Option('num_words', 'number of words', 4, 1, 20),
+              Option('separator', 'separator character', '-', ask_gui=False)),
+             button='📝 Passphrase', description='Passphrases are easier to remember!'),
+    Strategy('pronounceable', 'Generate Pronounceable Password', _ENGINE + 'generate_pronounceable',
+             (_length(16, maximum=64),), button='🗣️ Pronounceable',
+             description='Letters from a Markov model trained on a dictionary'),
+    Strategy('template', 'Generate from Template (e.g. Ulll-dddd-ssss)',
+             _ENGINE + 'generate_from_template',
+             (Option('template', 'template', 'Ulll-dddd-ssss'),), button='🧩 Template',
+             description='Codes: l=lower U=upper L=letter d=digit s=special a=alnum\n'
+                         '       h/H=hex *=any [abc]=set {n}=repeat \\=escape'),
+):
+    register(_strategy)
+del _strategy
@@ -0,0 +1,154 @@
+"""
+Password Template Module
+Mask language for fixed-shape passwords, compiled into per-position samplers
+
+Template syntax:
+    l   lowercase letter        U   uppercase letter
+    L   any letter              d   digit
+    s   special character       a   letter or digit
+    h   hex digit (0-9a-f)      H   hex digit (0-9A-F)
+    *   any character class
+    [abc] / [a-f0-3]   one character from a custom set
+    {n}                repeat the previous element n times
+    \\c                 literal c (escape a code character)
+    anything else is copied literally
+
+Example: 'Ul{3}-d{4}-s{4}' or 'Ulll-dddd-ssss'
+"""
+
+import math
+from functools import lru_cache
+from typing import List, Tuple
+
+from password_engine import PasswordGenerator
+from password_random import secure_random
+
+_LETTERS = PasswordGenerator.LOWERCASE + PasswordGenerator.UPPERCASE
+
+# Mask code -> character set
+CODES = {
+    'l': PasswordGenerator.LOWERCASE,
+    'U': PasswordGenerator.UPPERCASE,
+    'L': _LETTERS,
+    'd': PasswordGenerator.DIGITS,
+    's': PasswordGenerator.SPECIAL,
+    'a': _LETTERS + PasswordGenerator.DIGITS,
+    'h': PasswordGenerator.DIGITS + 'abcdef',
+    'H': PasswordGenerator.DIGITS + 'ABCDEF',
+    '*': _LETTERS + PasswordGenerator.DIGITS + PasswordGenerator.SPECIAL,
+}
+
+
+class CompiledTemplate:
+    """Per-position sampler table built from a template string"""
+
+    def __init__(self, template: str, positions: Tuple[str, ...]):
+        self.template = template
+        # Each position is the string of characters it may hold; literals
+        # are single-character pools and consume no randomness
+        self.positions = positions
+        self._samplers = tuple((pool, len(pool)) for pool in positions)
+        self.length = len(positions)
+        self.entropy = sum(math.log2(n) for _, n in self._samplers)
+
+    def generate(self, rng=None) -> str:
+        """Generate one password following the template"""
+        rng = rng or secure_random
+        return ''.join(pool if n == 1 else pool[rng.randbelow(n)]
+                       for pool, n in self._samplers)
+
+    def generate_many(self, count: int, rng=None) -> List[str]:
+        """Generate count passwords following the template"""
+        rng = rng or secure_random
+        randbelow = rng.randbelow
+        samplers = self._samplers
+        return [''.join(pool if n == 1 else pool[randbelow(n)] for pool, n in samplers)
+                for _ in range(count)]
+
+    def matches(self, password: str) -> bool:
+        """True if password could have been produced by this template"""
+        return len(password) == self.length and all(
+            c in pool for c, pool in zip(password, self.positions))
+
+
+def parse_template(template: str, exclude_ambiguous: bool = False) -> Tuple[str, ...]:
+    """
+    Parse a template into one character pool per position
+
+    Raises:
+        ValueError: If the template is malformed or empty, or a position
+            has only ambiguous characters and exclude_ambiguous is set
+    """
+    positions = []
+    i = 0
+    while i < len(template):
+        c = template[i]
+        if c == '\\':
+            if i + 1 >= len(template):
+                raise ValueError("Template ends with an unfinished escape")
+            positions.append(template[i + 1])
+            i += 2
+        elif c == '[':
+            end = template.find(']', i + 1)
+            if end == -1:
+                raise ValueError(f"Unclosed '[' at position {i}")
+            positions.append(_expand_set(template[i + 1:end]))
+            i = end + 1
+        elif c == '{':
+            end = template.find('}', i + 1)
+            if end == -1:
+                raise ValueError(f"Unclosed '{{' at position {i}")
+            if not positions:
+                raise ValueError("Repeat count must follow an element")
+            try:
+                count = int(template[i + 1:end])
+            except ValueError:
+                raise ValueError(f"Invalid repeat count '{template[i + 1:end]}'") from None
+            if count < 1:
+                raise ValueError("Repeat count must be at least 1")
+            positions.extend([positions[-1]] * (count - 1))
+            i = end + 1
+        else:
+            positions.append(CODES.get(c, c))
+            i += 1
+
+    if not positions:
+        raise ValueError("Template must contain at least one element")
+
+    if exclude_ambiguous:
+        stripped = []
+        for number, pool in enumerate(positions, 1):
+            if len(pool) > 1:
+                pool = ''.join(ch for ch in pool if ch not in PasswordGenerator.AMBIGUOUS)
+                if not pool:
+                    raise ValueError(f"Position {number} has no characters left "
+                                     f"after excluding ambiguous ones")
+            stripped.append(pool)
+        positions = stripped
+    return tuple(positions)
+
+
+def _expand_set(spec: str) -> str:
+    """Expand a custom set such as 'a-f0-3_' into its characters"""
+    chars = []
+    i = 0
+    while i < len(spec):
+        if i + 2 < len(spec) and spec[i + 1] == '-':
+            start, stop = ord(spec[i]), ord(spec[i + 2])
+            if start > stop:
+                raise ValueError(f"Invalid range '{spec[i:i + 3]}'")
+            chars.extend(chr(o) for o in range(start, stop + 1))
+            i += 3
+        else:
+            chars.append(spec[i])
+            i += 1
+    if not chars:
+        raise ValueError("Custom set '[]' must not be empty")
+    # Duplicates would skew the distribution, keep first occurrence only
+    return ''.join(dict.fromkeys(chars))
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str, exclude_ambiguous: bool = False) -> CompiledTemplate:
+    """Compile a template once and reuse the sampler table"""
+    return CompiledTemplate(template, parse_template(template, exclude_ambiguous))
@@ -0,0 +1,138 @@
+"""
+History Import/Export Module
+Streams history records to and from CSV and NDJSON files, optionally
+gzip-compressed, one record at a time
+"""
+
+import gzip
+import json
+from typing import Dict, Iterable, Iterator, Tuple
+
+# Columns written by the CSV exporter, in order
+FIELDS = ('password', 'description', 'created_at', 'strength')
+
+# format name -> (base format, gzip compressed)
+FORMATS = {
+    'csv': ('csv', False),
+    'csv.gz': ('csv', True),
+    'ndjson': ('ndjson', False),
+    'ndjson.gz': ('ndjson', True),
+}
+
+_SUFFIXES = (('.csv.gz', 'csv.gz'), ('.ndjson.gz', 'ndjson.gz'), ('.jsonl.gz', 'ndjson.gz'),
+             ('.csv', 'csv'), ('.ndjson', 'ndjson'), ('.jsonl', 'ndjson'))
+
+
+def detect_format(path: str, fmt: str = None) -> Tuple[str, bool]:
+    """(base format, compressed) for an explicit format name or a file name"""
+    if fmt is None:
+        for suffix, name in _SUFFIXES:
+            if path.lower().endswith(suffix):
+                fmt = name
+                break
+        else:
+            raise ValueError(f"Cannot tell the format of '{path}'; "
+                             f"use one of: {', '.join(FORMATS)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}' (expected one of: {', '.join(FORMATS)})")
+    return FORMATS[fmt]
+
+
+def _open(path: str, mode: str, compressed: bool):
+    if compressed:
+        # Level 6 writes about twice as fast as the default 9 for ~2% more bytes
+        return gzip.open(path, mode + 't', compresslevel=6, encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def write_entries(entries: Iterable[Dict], path: str, fmt: str = None) -> int:
+    """
+    Stream history entries to a file
+
+    Returns:
+        Number of entries written
+    """
+    base, compressed = detect_format(path, fmt)
+    count = 0
+    with _open(path, 'w', compressed) as f:
+        if base == 'csv':
+            import csv
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for entry in entries:
+                writer.writerow([entry.get(field, '') for field in FIELDS])
+                count += 1
+        else:
+            encode = json.JSONEncoder().encode
+            write = f.write
+            for entry in entries:
+                write(encode({field: entry.get(field, '') for field in FIELDS}) + '\n')
+                count += 1
+    return count
+
+
+def read_entries(path: str, fmt: str = None) -> Iterator[Dict]:
+    """
+    Stream history entries from a file
+
+    Yields dicts with the FIELDS keys. Records without a password are
+    skipped; missing fields are returned as empty strings.
+    """
+    base, compressed = detect_format(path, fmt)
+    with _open(path, 'r', compressed) as f:
+        if base == 'csv':
+            import csv
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+        for record in records:
+            if not isinstance(record, dict) or not record.get('password'):
+                continue
+            yield {field: str(record.get(field) or '') for field in FIELDS}
+
+
+def merge_entries(history, entries: Iterable[Dict], complete) -> Dict[str, int]:
+    """
+    Append entries to a HistoryLog, skipping duplicates
+
+    An entry is a duplicate when the history, or an earlier imported
+    entry, already holds the same password saved at the same time, so
+    merging the same export twice, or exports from several workstations
+    that share records, adds each record once. An entry without a
+    timestamp is a duplicate when the password is held at all, since
+    complete() would stamp it with a new time on every merge. Duplicates
+    are found before complete() runs. Imported entries are appended
+    after the existing ones and get new ids.
+
+    Args:
+        history: password_history.HistoryLog to append to
+        entries: Imported entries
+        complete: Callable filling in missing created_at/strength fields
+
+    Returns:
+        {'read': n, 'added': n, 'duplicates': n}
+    """
+    from password_history import UNDATED, parse_timestamp
+    seen = history.dedupe_keys()
+    # Passwords held, built on the first entry without a timestamp
+    passwords = None
+    read = added = 0
+    for entry in entries:
+        read += 1
+        if entry['created_at']:
+            created = parse_timestamp(entry['created_at'])
+            if (entry['password'], UNDATED if created is None else created) in seen:
+                continue
+        else:
+            if passwords is None:
+                passwords = {password for password, _ in seen}
+            if entry['password'] in passwords:
+                continue
+        entry = complete(entry)
+        created = parse_timestamp(entry['created_at'])
+        seen.add((entry['password'], UNDATED if created is None else created))
+        if passwords is not None:
+            passwords.add(entry['password'])
+        history.append(entry)
+        added += 1
+    return {'read': read, 'added': added, 'duplicates': read - added}